@@ -0,0 +1,72 @@
+"""
+Measurement of the tokens sent per swe-bench item with and without code protection.
+The issue texts of the samples directory (swe_bench*.txt) are each treated as one
+item and prepared for translation three ways: as is (what the LLM stage received
+before), with math preservation only (what the machine translator received before)
+and with CodePreserver. A stand-in translation then rewrites all prose outside the
+placeholders, and every protected span must come back unchanged.
+
+Usage:
+    python benchmarks/code_protection_benchmark.py [--samples samples]
+"""
+
+import os
+import sys
+import glob
+import logging
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import rate_limiter
+from utils.logger import logger
+from utils.code_preserver import CodePreserver, DATASET_CODE_PROTECTION
+from utils.math_preserver import SimpleMathPreserver
+
+
+def stand_in_translation(text: str) -> str:
+    """Rewrite the prose of a text (uppercase it), leaving the placeholders alone."""
+    pieces = SimpleMathPreserver.PLACEHOLDER_PATTERN.split(text)
+    placeholders = SimpleMathPreserver.PLACEHOLDER_PATTERN.findall(text) + [""]
+    return "".join(piece.upper() + placeholder for piece, placeholder in zip(pieces, placeholders))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure tokens sent per swe-bench item with code protection")
+    parser.add_argument("--samples", default="samples", help="Directory of sample texts")
+    args = parser.parse_args()
+    
+    logger.setLevel(logging.ERROR)
+    
+    math_preserver = SimpleMathPreserver()
+    code_preserver = CodePreserver(DATASET_CODE_PROTECTION["swe-bench"])
+    tokenizer = "cl100k_base" if rate_limiter._ENCODING is not None else "estimate (4 characters per token)"
+    print(f"Tokenizer: {tokenizer}\n")
+    print(f"{'item':<24} {'as is':>7} {'math only':>10} {'code protection':>16} {'spans':>6} {'unchanged':>10}")
+    
+    totals = [0, 0, 0]
+    for path in sorted(glob.glob(os.path.join(args.samples, "swe_bench*.txt"))):
+        with open(path, 'r', encoding='utf-8') as f:
+            item = f.read()
+        
+        math_text, _ = math_preserver.extract_math(item)
+        code_text, replacements = code_preserver.extract_math(item)
+        counts = [rate_limiter.estimate_tokens(text) for text in (item, math_text, code_text)]
+        
+        # Every protected span must survive translation and restoration verbatim
+        restored = code_preserver.restore_math(stand_in_translation(code_text), replacements)
+        unchanged = sum(1 for span in replacements.values() if span in restored)
+        
+        print(f"{os.path.basename(path):<24} {counts[0]:>7} {counts[1]:>10} {counts[2]:>16} "
+              f"{len(replacements):>6} {unchanged:>10}")
+        for i, count in enumerate(counts):
+            totals[i] += count
+    
+    if totals[0]:
+        raw, math_only, protected = totals
+        print(f"\nTokens sent: {raw} as is, {math_only} with math only, {protected} with code protection "
+              f"({1 - protected / raw:.1%} fewer than as is, {1 - protected / math_only:.1%} fewer than math only)")
+
+
+if __name__ == "__main__":
+    main()
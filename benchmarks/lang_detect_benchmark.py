@@ -0,0 +1,151 @@
+"""
+Benchmark of the script-based LanguageVerifier against plain langdetect.
+Measures verification throughput and how often both agree on the texts of
+samples/ (plus any translated outputs given with --dir) and a set of built-in
+multilingual sentences, since samples/ only holds English sources.
+
+Usage:
+    python benchmarks/lang_detect_benchmark.py [--dir translated_outputs] [--repeat 5] [--threads 8]
+"""
+
+import os
+import sys
+import glob
+import time
+import argparse
+import concurrent.futures
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.lang_detect import LanguageVerifier, LangDetectException, detect_language, LANGDETECT_AVAILABLE
+
+# (language code, text) pairs covering script-distinctive and Latin-script targets
+BUILTIN_TEXTS = [
+    ("ja", "三角形の面積は底辺と高さの積の半分です。この問題を解いてください。"),
+    ("ja", "関数 f(x) の最小値を求め、その理由を説明しなさい。"),
+    ("zh-cn", "三角形的面积等于底乘以高的一半。请解决这个问题。"),
+    ("ko", "삼각형의 넓이는 밑변과 높이를 곱한 값의 절반입니다. 이 문제를 풀어 보세요."),
+    ("ru", "Площадь треугольника равна половине произведения основания на высоту."),
+    ("he", "שטח המשולש שווה למחצית מכפלת הבסיס בגובה. פתור את הבעיה הזו."),
+    ("ar", "مساحة المثلث تساوي نصف حاصل ضرب القاعدة في الارتفاع. حل هذه المسألة."),
+    ("hi", "त्रिभुज का क्षेत्रफल आधार और ऊंचाई के गुणनफल का आधा होता है।"),
+    ("bn", "ত্রিভুজের ক্ষেত্রফল ভূমি ও উচ্চতার গুণফলের অর্ধেক।"),
+    ("el", "Το εμβαδόν του τριγώνου ισούται με το μισό του γινομένου βάσης και ύψους."),
+    ("th", "พื้นที่ของสามเหลี่ยมเท่ากับครึ่งหนึ่งของผลคูณของฐานและความสูง"),
+    ("es", "El área de un triángulo es la mitad del producto de la base por la altura."),
+    ("fr", "L'aire d'un triangle est égale à la moitié du produit de la base par la hauteur."),
+    ("de", "Der Flächeninhalt eines Dreiecks ist die Hälfte des Produkts aus Grundseite und Höhe."),
+    ("ro", "Aria unui triunghi este jumătate din produsul dintre bază și înălțime."),
+    ("it", "L'area di un triangolo è la metà del prodotto della base per l'altezza."),
+    ("pt", "A área de um triângulo é metade do produto da base pela altura.")
+]
+
+
+def load_texts(directories: List[str]) -> List[str]:
+    """
+    Load the non-empty paragraphs of the text files in the given directories.
+    
+    Args:
+        directories: Directories to read *.txt files from
+    
+    Returns:
+        List[str]: Paragraphs
+    """
+    texts = []
+    for directory in directories:
+        for path in sorted(glob.glob(os.path.join(directory, "*.txt"))):
+            with open(path, 'r', encoding='utf-8') as f:
+                texts.extend(p.strip() for p in f.read().split("\n\n") if len(p.strip()) >= 10)
+    return texts
+
+
+def langdetect_verify(text: str, language_code: str) -> bool:
+    """Verify a text the way LLMTranslator did before, with langdetect alone."""
+    try:
+        return detect_language(text).split("-")[0] == language_code.split("-")[0]
+    except LangDetectException:
+        return True
+
+
+def time_run(fn, cases: List[Tuple[str, str]], repeat: int, threads: int) -> float:
+    """Run fn over all cases `repeat` times and return the throughput in texts per second."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        if threads > 1:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+                list(executor.map(lambda case: fn(case[1], case[0]), cases))
+        else:
+            for language_code, text in cases:
+                fn(text, language_code)
+    elapsed = time.perf_counter() - start
+    return len(cases) * repeat / elapsed if elapsed else float("inf")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LanguageVerifier against langdetect")
+    parser.add_argument("--samples", default="samples", help="Directory of source texts")
+    parser.add_argument("--dir", action="append", default=[],
+                        help="Directory of translated *.txt outputs, named <name>.<lang>.txt (repeatable)")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of passes over the texts")
+    parser.add_argument("--threads", type=int, default=1, help="Number of threads verifying concurrently")
+    args = parser.parse_args()
+    
+    # Sources are English; translated outputs carry their language in the file name
+    cases = [("en", text) for text in load_texts([args.samples])]
+    for directory in args.dir:
+        for path in sorted(glob.glob(os.path.join(directory, "*.txt"))):
+            parts = os.path.basename(path).split(".")
+            language_code = parts[-2] if len(parts) >= 3 else "en"
+            with open(path, 'r', encoding='utf-8') as f:
+                cases.extend((language_code, p.strip()) for p in f.read().split("\n\n") if len(p.strip()) >= 10)
+    cases.extend(BUILTIN_TEXTS)
+    
+    # Check each text against its own language and a mismatching one, as verification does after a bad translation
+    checks = cases + [("ja" if language_code != "ja" else "ko", text) for language_code, text in cases]
+    print(f"Texts: {len(cases)}, checks per pass: {len(checks)}, passes: {args.repeat}, threads: {args.threads}")
+    
+    if LANGDETECT_AVAILABLE:
+        # Load the langdetect profiles before timing anything
+        langdetect_verify(BUILTIN_TEXTS[-1][1], BUILTIN_TEXTS[-1][0])
+    
+    verifier = LanguageVerifier()
+    verifier_rate = time_run(verifier.verify, checks, args.repeat, args.threads)
+    print(f"LanguageVerifier: {verifier_rate:,.0f} checks/s")
+    print(f"  Tiers: {verifier.get_stats()}")
+    
+    # Checks settled by the script histogram alone
+    before = verifier.get_stats()["script_checks"]
+    scripted = []
+    for case in checks:
+        verifier.verify(case[1], case[0])
+        if verifier.get_stats()["script_checks"] > before:
+            scripted.append(case)
+            before += 1
+    fast_rate = time_run(verifier.verify, scripted, args.repeat, args.threads)
+    print(f"  Script fast path only: {fast_rate:,.0f} checks/s ({len(scripted)} checks)")
+    
+    if not LANGDETECT_AVAILABLE:
+        print("langdetect not installed: skipping the comparison")
+        return
+    
+    langdetect_rate = time_run(langdetect_verify, checks, args.repeat, args.threads)
+    print(f"langdetect: {langdetect_rate:,.0f} checks/s")
+    langdetect_fast_rate = time_run(langdetect_verify, scripted, args.repeat, args.threads)
+    print(f"  On the fast-path checks: {langdetect_fast_rate:,.0f} checks/s")
+    print(f"Speed-up: {verifier_rate / langdetect_rate:.1f}x overall, "
+          f"{fast_rate / langdetect_fast_rate:.1f}x on the fast-path checks")
+    
+    disagreements = []
+    for language_code, text in checks:
+        verified = verifier.verify(text, language_code)
+        if verified is not None and verified != langdetect_verify(text, language_code):
+            disagreements.append((language_code, text))
+    agreement = 1 - len(disagreements) / len(checks)
+    print(f"Agreement with langdetect: {agreement:.1%} ({len(disagreements)} of {len(checks)} checks differ)")
+    for language_code, text in disagreements:
+        print(f"  [{language_code}] {text[:70]}")
+
+
+if __name__ == "__main__":
+    main()
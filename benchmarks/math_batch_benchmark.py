@@ -0,0 +1,89 @@
+"""
+Throughput of SimpleMathPreserver.extract_batch()/restore_batch() against the
+per-string extract_math()/restore_math() loop on many short fields, like the
+strings batch_translate() receives. Fields are sentences of the sample corpora
+mixed with short answer-like values, most of them without math. Both paths
+must give the same texts, placeholder tables and restored output.
+
+Usage:
+    python benchmarks/math_batch_benchmark.py [--fields 100000] [--repeat 3]
+"""
+
+import os
+import re
+import sys
+import time
+import random
+import logging
+import argparse
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logger import logger
+from utils.math_preserver import SimpleMathPreserver
+
+# Short values of the kind dataset answer and option fields hold
+SHORT_FIELDS = ["42", "True", "None of the above", "$x = 3$", "B", "2/3", "see above", "y^2", "Paris"]
+
+
+def make_fields(samples: str, count: int, seed: int = 0) -> List[str]:
+    """Build short fields from the sentences of the sample texts and SHORT_FIELDS."""
+    sentences = []
+    for name in sorted(os.listdir(samples)):
+        with open(os.path.join(samples, name), 'r', encoding='utf-8') as f:
+            sentences.extend(s.strip() for s in re.split(r'(?<=[.?!:])\s+', f.read()) if s.strip())
+    pool = sentences + SHORT_FIELDS * (len(sentences) // len(SHORT_FIELDS))
+    rng = random.Random(seed)
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def best_time(function, repeat: int):
+    """Best time of several runs and the last result."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch math extraction")
+    parser.add_argument("--fields", type=int, default=100000, help="Number of short fields")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    parser.add_argument("--samples", default="samples", help="Directory of sample texts")
+    args = parser.parse_args()
+    
+    # The per-string loop logs a line per call; leave logging out of both measurements
+    logger.setLevel(logging.ERROR)
+    
+    preserver = SimpleMathPreserver()
+    fields = make_fields(args.samples, args.fields)
+    
+    def per_string():
+        extracted = [preserver.extract_math(field) for field in fields]
+        restored = [preserver.restore_math(text, table) for text, table in extracted]
+        return extracted, restored
+    
+    def batched():
+        texts, tables, has_math = preserver.extract_batch(fields)
+        return texts, tables, has_math, preserver.restore_batch(texts, tables)
+    
+    loop_time, (extracted, loop_restored) = best_time(per_string, args.repeat)
+    batch_time, (texts, tables, has_math, batch_restored) = best_time(batched, args.repeat)
+    
+    same = (
+        texts == [text for text, _ in extracted]
+        and tables == [table for _, table in extracted]
+        and batch_restored == loop_restored == fields
+    )
+    
+    print(f"Fields: {len(fields)} ({sum(len(f) for f in fields)} characters), with math: {sum(has_math)}")
+    print(f"Per-string loop: {loop_time:.3f}s ({len(fields) / loop_time:,.0f} fields/s)")
+    print(f"Batch API:       {batch_time:.3f}s ({len(fields) / batch_time:,.0f} fields/s)")
+    print(f"Speedup: {loop_time / batch_time:.2f}x; identical results: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Measurement of the tokens math placeholders cost in the text sent for translation.
+Each paragraph of the sample corpora is extracted with SimpleMathPreserver; the
+text with the current placeholders ([[M0]], [[M1]], ...) is compared with the same
+text carrying the previous ones (__MATH_ and 32 hex digits). Tokens are counted
+with the cl100k_base tokenizer when tiktoken can load it, otherwise with the
+four-characters-per-token estimate the rate limiter falls back to.
+
+Usage:
+    python benchmarks/placeholder_tokens_benchmark.py [--samples samples]
+"""
+
+import os
+import sys
+import uuid
+import logging
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import rate_limiter
+from utils.logger import logger
+from utils.math_preserver import SimpleMathPreserver
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the token cost of math placeholders")
+    parser.add_argument("--samples", default="samples", help="Directory of sample texts")
+    args = parser.parse_args()
+    
+    logger.setLevel(logging.ERROR)
+    
+    preserver = SimpleMathPreserver()
+    tokenizer = "cl100k_base" if rate_limiter._ENCODING is not None else "estimate (4 characters per token)"
+    print(f"Tokenizer: {tokenizer}\n")
+    print(f"{'corpus':<20} {'placeholders':>12} {'previous tokens':>16} {'current tokens':>15} {'saved':>7}")
+    
+    totals = [0, 0, 0]
+    for name in sorted(os.listdir(args.samples)):
+        with open(os.path.join(args.samples, name), 'r', encoding='utf-8') as f:
+            paragraphs = [p for p in f.read().split("\n\n") if p.strip()]
+        
+        placeholders = previous_tokens = current_tokens = 0
+        for paragraph in paragraphs:
+            modified_text, replacements = preserver.extract_math(paragraph)
+            legacy_text = SimpleMathPreserver.PLACEHOLDER_PATTERN.sub(
+                lambda m: f"__MATH_{uuid.uuid4().hex}__", modified_text
+            )
+            placeholders += len(replacements)
+            previous_tokens += rate_limiter.estimate_tokens(legacy_text)
+            current_tokens += rate_limiter.estimate_tokens(modified_text)
+        
+        saved = 1 - current_tokens / previous_tokens if previous_tokens else 0.0
+        print(f"{name:<20} {placeholders:>12} {previous_tokens:>16} {current_tokens:>15} {saved:>6.1%}")
+        for i, value in enumerate((placeholders, previous_tokens, current_tokens)):
+            totals[i] += value
+    
+    placeholders, previous_tokens, current_tokens = totals
+    if placeholders:
+        print(f"\nTokens saved per placeholder: {(previous_tokens - current_tokens) / placeholders:.1f}")
+    if previous_tokens:
+        print(f"Total: {previous_tokens} -> {current_tokens} tokens ({1 - current_tokens / previous_tokens:.1%} fewer)")
+
+
+if __name__ == "__main__":
+    main()
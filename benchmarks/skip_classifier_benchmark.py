@@ -0,0 +1,133 @@
+"""
+Share of string leaves the skip classifier keeps out of translation, and the cost
+of the check. Synthetic agentic items (tool calls, trajectories and task metadata,
+like those of the gaia, swe-bench and asb datasets) are flattened into their string
+leaves; each leaf is checked with the shared SkipClassifier and with the previous
+numeric-answer check of HybridTranslator (four regexes compiled on every call).
+
+Usage:
+    python benchmarks/skip_classifier_benchmark.py [--items 2000] [--repeat 3]
+"""
+
+import os
+import re
+import sys
+import time
+import uuid
+import random
+import logging
+import argparse
+from typing import Any, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.logger import logger
+from utils.skip_classifier import SkipClassifier
+
+PROSE = [
+    "Find the population of the largest city mentioned in the attached spreadsheet.",
+    "The tests fail when the input list is empty.",
+    "Search the web for the release date of the album.",
+    "Summarize the findings of the report in two sentences.",
+    "The agent should not delete files outside the workspace.",
+    "Yes.",
+    "None of the above",
+]
+TOOLS = ["web_search", "read_file", "run_tests", "python_interpreter", "send_email", "list_directory"]
+STATUSES = ["IN_PROGRESS", "DONE", "FAILED", "PENDING"]
+
+
+def legacy_is_numeric_answer(text: str) -> bool:
+    """The check HybridTranslator used before the skip classifier."""
+    text = text.strip()
+    if re.match(r'^\d+(\.\d+)?$', text):
+        return True
+    if re.match(r'^\$?\d+(\.\d+)?\s*[a-zA-Z]*$', text):
+        return True
+    if re.match(r'^=\s*\d+(\.\d+)?$', text):
+        return True
+    if len(text) < 5 and sum(c.isdigit() for c in text) / len(text) > 0.5:
+        return True
+    return False
+
+
+def make_item(rng: random.Random, index: int) -> dict:
+    """Build one synthetic agentic item."""
+    tool = rng.choice(TOOLS)
+    return {
+        "task_id": str(uuid.UUID(int=rng.getrandbits(128))),
+        "instance_id": f"django__django-{rng.randint(10000, 16000)}",
+        "level": str(rng.randint(1, 3)),
+        "question": rng.choice(PROSE),
+        "file_name": f"data/attachments/{index}.{rng.choice(['xlsx', 'pdf', 'py'])}",
+        "status": rng.choice(STATUSES),
+        "trajectory": [
+            {
+                "thought": rng.choice(PROSE),
+                "tool": tool,
+                "call": f"{tool}(query='{rng.choice(PROSE)[:20]}')",
+                "url": f"https://example.com/docs/{rng.randint(1, 999)}",
+                "observation": rng.choice(PROSE + ["42", "True", "3.14", "src/app/models.py"]),
+                "success": rng.choice(["true", "false"]),
+            }
+            for _ in range(rng.randint(2, 5))
+        ],
+        "final_answer": rng.choice(["42", "Paris", "17 km", "$1,250", "FALSE"]),
+    }
+
+
+def leaves(value: Any) -> List[str]:
+    """String leaves of a JSON value."""
+    if isinstance(value, str):
+        return [value] if value.strip() else []
+    if isinstance(value, dict):
+        return [leaf for v in value.values() for leaf in leaves(v)]
+    if isinstance(value, list):
+        return [leaf for v in value for leaf in leaves(v)]
+    return []
+
+
+def best_time(function, repeat: int):
+    """Best time of several runs and the last result."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the skip classifier on agentic items")
+    parser.add_argument("--items", type=int, default=2000, help="Number of synthetic items")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement (best is reported)")
+    args = parser.parse_args()
+    
+    logger.setLevel(logging.ERROR)
+    
+    rng = random.Random(0)
+    texts = [leaf for index in range(args.items) for leaf in leaves(make_item(rng, index))]
+    classifier = SkipClassifier()
+    
+    legacy_time, legacy = best_time(lambda: [legacy_is_numeric_answer(text) for text in texts], args.repeat)
+    classifier_time, categories = best_time(lambda: [classifier.classify(text) for text in texts], args.repeat)
+    
+    skipped = sum(1 for category in categories if category is not None)
+    print(f"String leaves: {len(texts)} in {args.items} items")
+    print(f"Numeric-answer check: {sum(legacy)} skipped ({sum(legacy) / len(texts):.1%}), "
+          f"{legacy_time / len(texts) * 1e6:.2f} us per leaf")
+    print(f"Skip classifier:      {skipped} skipped ({skipped / len(texts):.1%}), "
+          f"{classifier_time / len(texts) * 1e6:.2f} us per leaf")
+    
+    for category in classifier.categories:
+        count = categories.count(category)
+        if count:
+            print(f"  {category:<8} {count:>7}")
+    
+    # Leaves the old check skipped must still be skipped
+    missed = [text for text, old, new in zip(texts, legacy, categories) if old and new is None]
+    print(f"Leaves skipped before but translated now: {len(missed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -16,7 +16,8 @@ from translator import (
     HybridTranslator, 
     DeepLTranslator, 
     GoogleTranslator, 
-    LLMTranslator
+    LLMTranslator,
+    HedgePolicy
 )
 
 # Configure logging
@@ -61,6 +62,7 @@ def create_translator():
     AZURE_OPENAI_ENDPOINT = os.getenv("AZURE_OPENAI_ENDPOINT", "https://llm-sec.openai.azure.com/")
     AZURE_OPENAI_API_VERSION = os.getenv("AZURE_OPENAI_API_VERSION", "2024-08-01-preview")
     AZURE_OPENAI_MODEL = os.getenv("AZURE_OPENAI_MODEL", "azure/attack-gpt4o")
+    LLM_HEDGING = os.getenv("LLM_HEDGING", "").lower() in ("1", "true", "yes")
     
     # Initialize translators based on available credentials
     llm_translator = None
@@ -74,7 +76,8 @@ def create_translator():
             api_key=AZURE_OPENAI_API_KEY,
             api_base=AZURE_OPENAI_ENDPOINT,
             api_version=AZURE_OPENAI_API_VERSION,
-            dataset_type="math"  # Default dataset type
+            dataset_type="math",  # Default dataset type
+            hedge_policy=HedgePolicy() if LLM_HEDGING else None
         )
         logger.info("LLM Translator initialized successfully")
         
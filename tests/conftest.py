@@ -0,0 +1,51 @@
+"""
+Shared pytest configuration: make the repository root importable and provide
+a stand-in for the LiteLLM client.
+"""
+
+import os
+import sys
+import types
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+# Prompt templates shipped with the repository
+PROMPTS_DIR = os.path.join(REPO_ROOT, "prompts")
+
+
+class StubLiteLLM(types.ModuleType):
+    """
+    Stands in for the litellm module. Completion calls are answered by `responder`,
+    a function of the system and user prompts, and recorded in `calls`.
+    """
+    
+    def __init__(self):
+        super().__init__("litellm")
+        self.responder = lambda system_prompt, user_prompt: user_prompt
+        self.calls = []
+    
+    def _respond(self, params):
+        system_prompt, user_prompt = (message["content"] for message in params["messages"])
+        self.calls.append((system_prompt, user_prompt))
+        message = types.SimpleNamespace(content=self.responder(system_prompt, user_prompt))
+        return types.SimpleNamespace(choices=[types.SimpleNamespace(message=message, finish_reason="stop")])
+    
+    def completion(self, **params):
+        return self._respond(params)
+    
+    async def acompletion(self, **params):
+        return self._respond(params)
+
+
+@pytest.fixture
+def stub_litellm(monkeypatch):
+    """Install a StubLiteLLM in place of litellm, without deployment or rate limit settings from the environment."""
+    stub = StubLiteLLM()
+    monkeypatch.setitem(sys.modules, "litellm", stub)
+    for name in ("LLM_DEPLOYMENTS", "LLM_DEPLOYMENTS_FILE", "LLM_REQUESTS_PER_MINUTE", "LLM_TOKENS_PER_MINUTE"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    return stub
@@ -0,0 +1,357 @@
+"""
+Tests for translator/batch_processor.py, with the hybrid translator replaced by a stub.
+"""
+
+import json
+import time
+import types
+import asyncio
+
+import pytest
+
+from translator.batch_processor import BatchProcessor
+from utils.fallback_text import FallbackText
+from utils.run_journal import RunJournal
+
+
+class StubTranslator:
+    """
+    Stands in for HybridTranslator. A text is translated to "<text>" and recorded in `calls`;
+    texts in `unchanged` come back as they are (like proper nouns) and texts in `failing`
+    come back as a FallbackText, as the translators return them when they fail; texts in
+    `raising` raise. A text in `delays` takes that many seconds.
+    """
+    
+    def __init__(self):
+        self.calls = []
+        self.unchanged = set()
+        self.failing = set()
+        self.raising = set()
+        self.delays = {}
+        self.llm_translator = types.SimpleNamespace(
+            cache=None, deployment_pool=types.SimpleNamespace(deployments=[]), hedge_policy=None, rate_limiter=None
+        )
+        self.difficulty_scorer = None
+    
+    def _translation(self, text):
+        self.calls.append(text)
+        if text in self.raising:
+            raise RuntimeError("service unavailable")
+        if text in self.failing:
+            return FallbackText(text)
+        return text if text in self.unchanged else f"<{text}>"
+    
+    def translate(self, text, target_language):
+        time.sleep(self.delays.get(text, 0))
+        return self._translation(text)
+    
+    async def atranslate(self, text, target_language):
+        await asyncio.sleep(self.delays.get(text, 0))
+        return self._translation(text)
+    
+    def translate_many(self, text, target_languages):
+        return {language: self.translate(text, language) for language in target_languages}
+    
+    async def atranslate_many(self, text, target_languages):
+        return {language: await self.atranslate(text, language) for language in target_languages}
+
+
+@pytest.fixture
+def stub_translator(monkeypatch):
+    stub = StubTranslator()
+    monkeypatch.setattr(BatchProcessor, "_setup_translator", lambda self: stub)
+    return stub
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_deduplicated_strings_are_translated_once_and_fanned_out(stub_translator, use_async):
+    processor = BatchProcessor(deduplicate=True, use_async=use_async)
+    data = [
+        {"problem": "Find the area.", "type": "Geometry"},
+        {"problem": "Find the perimeter.", "type": "Geometry"},
+        {"problem": "Find the area.", "type": "Algebra", "level": 3},
+    ]
+    
+    result = processor.process_batch(data)
+    
+    assert result == [
+        {"problem": "<Find the area.>", "type": "<Geometry>"},
+        {"problem": "<Find the perimeter.>", "type": "<Geometry>"},
+        {"problem": "<Find the area.>", "type": "<Algebra>", "level": 3},
+    ]
+    assert sorted(stub_translator.calls) == ["Algebra", "Find the area.", "Find the perimeter.", "Geometry"]
+    assert processor.stats["leaves"] == 6
+    assert processor.stats["unique_leaves"] == 4
+
+
+def test_deduplicated_leaves_keep_their_own_whitespace(stub_translator):
+    processor = BatchProcessor(deduplicate=True)
+    data = [
+        {"problem": "First line.\n\nSecond line.", "hint": "First line. Second line."},
+        {"problem": "  First line. Second line.\n"},
+    ]
+    
+    result = processor.process_batch(data)
+    
+    assert result == [
+        {"problem": "<First line.\n\nSecond line.>", "hint": "<First line. Second line.>"},
+        {"problem": "  <First line. Second line.>\n"},
+    ]
+    assert sorted(stub_translator.calls) == ["First line.\n\nSecond line.", "First line. Second line."]
+
+
+def test_only_reported_fallbacks_count_as_failures(stub_translator):
+    stub_translator.unchanged.add("Paris")
+    stub_translator.failing.add("Find the perimeter.")
+    processor = BatchProcessor(deduplicate=True)
+    data = [
+        {"problem": "Find the area.", "city": "Paris", "id": "task_042"},
+        {"problem": "Find the perimeter.", "city": "Paris"},
+    ]
+    
+    result = processor.process_batch(data)
+    
+    assert result == [
+        {"problem": "<Find the area.>", "city": "Paris", "id": "task_042"},
+        {"problem": "Find the perimeter.", "city": "Paris"},
+    ]
+    assert isinstance(result[1]["problem"], FallbackText)
+    assert processor.stats["failed_leaves"] == 1
+    assert processor.stats["failed"] == 1
+    assert processor.stats["successful"] == 1
+
+
+def test_journal_status_follows_reported_fallbacks(stub_translator, tmp_path):
+    stub_translator.unchanged.add("Paris")
+    stub_translator.failing.add("Find the perimeter.")
+    path = str(tmp_path / "run.journal.jsonl")
+    data = [{"problem": "Find the area.", "city": "Paris"}, {"problem": "Find the perimeter."}]
+    
+    with RunJournal(path) as journal:
+        BatchProcessor(journal=journal, field_scheduling=True).process_batch(data)
+    
+    with RunJournal(path, resume=True) as journal:
+        assert journal.indices("done") == [0]
+        assert journal.indices("fallback") == [1]
+
+
+def write_jsonl(path, items):
+    path.write_text("".join(json.dumps(item) + "\n" for item in items))
+
+
+def read_jsonl(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_jsonl_file_is_streamed_to_jsonl(stub_translator, tmp_path, use_async):
+    input_file, output_file = tmp_path / "input.jsonl", tmp_path / "output.jsonl"
+    write_jsonl(input_file, [{"problem": f"Problem {i}.", "level": i} for i in range(10)])
+    
+    BatchProcessor(use_async=use_async, stream_window=3).process_file(str(input_file), str(output_file))
+    
+    assert read_jsonl(output_file) == [{"problem": f"<Problem {i}.>", "level": i} for i in range(10)]
+
+
+def test_json_array_file_is_streamed_to_a_json_array(stub_translator, tmp_path):
+    input_file, output_file = tmp_path / "input.json", tmp_path / "output.json"
+    input_file.write_text(json.dumps([{"problem": "First."}, {"problem": "Second."}]))
+    
+    BatchProcessor().process_file(str(input_file), str(output_file), stream=True)
+    
+    assert json.loads(output_file.read_text()) == [{"problem": "<First.>"}, {"problem": "<Second.>"}]
+
+
+def test_streamed_file_gets_one_output_per_language(stub_translator, tmp_path):
+    input_file, output_file = tmp_path / "input.jsonl", tmp_path / "output.jsonl"
+    write_jsonl(input_file, [{"problem": "First."}])
+    
+    BatchProcessor(target_languages=["French", "German"]).process_file(str(input_file), str(output_file))
+    
+    assert read_jsonl(tmp_path / "output.french.jsonl") == [{"problem": "<First.>"}]
+    assert read_jsonl(tmp_path / "output.german.jsonl") == [{"problem": "<First.>"}]
+
+
+def test_streaming_reads_at_most_a_window_ahead(stub_translator):
+    processor = BatchProcessor(max_workers=2, stream_window=4)
+    read = []
+    emitted = []
+    
+    def items():
+        for i in range(20):
+            read.append(i)
+            yield {"problem": f"Problem {i}."}
+    
+    def emit(translated_item):
+        # Items read but not yet written never exceed the window
+        assert len(read) - len(emitted) <= 4
+        emitted.append(translated_item)
+    
+    processor._stream_items(items(), processor._translate_item, lambda item: item, emit)
+    
+    assert emitted == [{"problem": f"<Problem {i}.>"} for i in range(20)]
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_resumed_batch_translates_only_unfinished_items(stub_translator, tmp_path, use_async):
+    path = str(tmp_path / "run.journal.jsonl")
+    data = [{"problem": "First."}, {"problem": "Second."}, {"problem": "Third."}]
+    stub_translator.failing.add("Second.")
+    with RunJournal(path) as journal:
+        BatchProcessor(journal=journal, use_async=use_async).process_batch(data)
+    
+    # The item that fell back is kept unless fallbacks are retried
+    stub_translator.failing.clear()
+    stub_translator.calls.clear()
+    with RunJournal(path, resume=True) as journal:
+        result = BatchProcessor(journal=journal, use_async=use_async).process_batch(data)
+    assert result == [{"problem": "<First.>"}, {"problem": "Second."}, {"problem": "<Third.>"}]
+    assert stub_translator.calls == []
+    
+    with RunJournal(path, resume=True, retry_fallbacks=True) as journal:
+        processor = BatchProcessor(journal=journal, use_async=use_async)
+        result = processor.process_batch(data)
+    assert result == [{"problem": "<First.>"}, {"problem": "<Second.>"}, {"problem": "<Third.>"}]
+    assert stub_translator.calls == ["Second."]
+    assert processor.stats["resumed"] == 2
+
+
+def test_resumed_batch_translates_changed_items_again(stub_translator, tmp_path):
+    path = str(tmp_path / "run.journal.jsonl")
+    with RunJournal(path) as journal:
+        BatchProcessor(journal=journal).process_batch([{"problem": "First."}, {"problem": "Second."}])
+    
+    stub_translator.calls.clear()
+    with RunJournal(path, resume=True) as journal:
+        result = BatchProcessor(journal=journal).process_batch([{"problem": "First."}, {"problem": "Changed."}])
+    
+    assert result == [{"problem": "<First.>"}, {"problem": "<Changed.>"}]
+    assert stub_translator.calls == ["Changed."]
+
+
+def test_resumed_stream_writes_journaled_items_in_place(stub_translator, tmp_path):
+    input_file, output_file = tmp_path / "input.jsonl", tmp_path / "output.jsonl"
+    path = str(tmp_path / "run.journal.jsonl")
+    write_jsonl(input_file, [{"problem": f"Problem {i}."} for i in range(6)])
+    with RunJournal(path) as journal:
+        journal.record(1, RunJournal.content_hash({"problem": "Problem 1."}, ["Japanese"]), "done", {"problem": "kept 1"})
+        journal.record(4, RunJournal.content_hash({"problem": "Problem 4."}, ["Japanese"]), "done", {"problem": "kept 4"})
+    
+    with RunJournal(path, resume=True) as journal:
+        processor = BatchProcessor(journal=journal)
+        processor.process_file(str(input_file), str(output_file))
+    
+    assert read_jsonl(output_file) == [
+        {"problem": "<Problem 0.>"}, {"problem": "kept 1"}, {"problem": "<Problem 2.>"},
+        {"problem": "<Problem 3.>"}, {"problem": "kept 4"}, {"problem": "<Problem 5.>"},
+    ]
+    assert sorted(stub_translator.calls) == ["Problem 0.", "Problem 2.", "Problem 3.", "Problem 5."]
+    assert processor.stats["resumed"] == 2
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_batch_results_keep_input_order(stub_translator, use_async):
+    # The first item finishes last
+    stub_translator.delays["Problem 0."] = 0.2
+    data = [{"problem": f"Problem {i}."} for i in range(6)]
+    
+    result = BatchProcessor(max_workers=3, use_async=use_async).process_batch(data)
+    
+    assert result == [{"problem": f"<Problem {i}.>"} for i in range(6)]
+    assert stub_translator.calls[-1] == "Problem 0."
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_stream_preserves_input_order(stub_translator, tmp_path, use_async):
+    stub_translator.delays["Problem 0."] = 0.2
+    input_file, output_file = tmp_path / "input.jsonl", tmp_path / "output.jsonl"
+    write_jsonl(input_file, [{"problem": f"Problem {i}."} for i in range(6)])
+    
+    BatchProcessor(max_workers=3, use_async=use_async, stream_window=6).process_file(str(input_file), str(output_file))
+    
+    assert read_jsonl(output_file) == [{"problem": f"<Problem {i}.>"} for i in range(6)]
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_stream_without_order_writes_results_as_they_finish(stub_translator, tmp_path, use_async):
+    stub_translator.delays["Problem 0."] = 0.2
+    input_file, output_file = tmp_path / "input.jsonl", tmp_path / "output.jsonl"
+    write_jsonl(input_file, [{"problem": f"Problem {i}."} for i in range(6)])
+    
+    processor = BatchProcessor(max_workers=3, use_async=use_async, stream_window=6, preserve_order=False)
+    processor.process_file(str(input_file), str(output_file))
+    
+    output = read_jsonl(output_file)
+    assert output[-1] == {"problem": "<Problem 0.>"}
+    assert sorted(item["problem"] for item in output) == [f"<Problem {i}.>" for i in range(6)]
+
+
+NESTED_ITEM = {
+    "problem": "Find the area.",
+    "meta": {"level": 3, "tags": ["geometry", "task_042"]},
+    "options": ["Yes", {"text": "No", "correct": False}],
+    "answer": 42,
+    "empty": "",
+}
+
+TRANSLATED_NESTED_ITEM = {
+    "problem": "<Find the area.>",
+    "meta": {"level": 3, "tags": ["<geometry>", "task_042"]},
+    "options": ["<Yes>", {"text": "<No>", "correct": False}],
+    "answer": 42,
+    "empty": "",
+}
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_field_scheduling_reassembles_nested_items(stub_translator, use_async):
+    data = [NESTED_ITEM, {"answer": 7}, {"problem": "Compute the sum."}]
+    
+    processor = BatchProcessor(field_scheduling=True, use_async=use_async)
+    result = processor.process_batch(data)
+    
+    assert result == [TRANSLATED_NESTED_ITEM, {"answer": 7}, {"problem": "<Compute the sum.>"}]
+    assert processor.stats["fields"] == 5
+    assert processor.stats["successful"] == 3
+
+
+def test_field_scheduling_starts_the_longest_fields_first(stub_translator):
+    data = [{"a": "Short."}, {"a": "The longest field of all.", "b": "Medium field."}]
+    
+    BatchProcessor(field_scheduling=True, max_workers=1).process_batch(data)
+    
+    assert stub_translator.calls == ["The longest field of all.", "Medium field.", "Short."]
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_field_scheduling_reassembles_every_language(stub_translator, use_async):
+    processor = BatchProcessor(field_scheduling=True, use_async=use_async, target_languages=["French", "German"])
+    
+    result = processor.process_batch_many([NESTED_ITEM])
+    
+    assert result == {"French": [TRANSLATED_NESTED_ITEM], "German": [TRANSLATED_NESTED_ITEM]}
+
+
+@pytest.mark.parametrize("use_async", [False, True])
+def test_field_scheduling_counts_items_with_failed_fields(stub_translator, tmp_path, use_async):
+    stub_translator.raising.add("Compute the sum.")
+    stub_translator.failing.add("Name the shape.")
+    data = [{"problem": "Find the area.", "hint": "Compute the sum."}, {"problem": "Name the shape."}, {"problem": "Why?"}]
+    path = str(tmp_path / "run.journal.jsonl")
+    
+    with RunJournal(path) as journal:
+        processor = BatchProcessor(field_scheduling=True, use_async=use_async, journal=journal)
+        result = processor.process_batch(data)
+    
+    assert result == [
+        {"problem": "<Find the area.>", "hint": "Compute the sum."},
+        {"problem": "Name the shape."},
+        {"problem": "<Why?>"},
+    ]
+    assert processor.stats["failed_fields"] == 2
+    assert processor.stats["failed"] == 2
+    assert processor.stats["successful"] == 1
+    with RunJournal(path, resume=True) as journal:
+        assert journal.indices("failed") == [0]
+        assert journal.indices("fallback") == [1]
+        assert journal.indices("done") == [2]
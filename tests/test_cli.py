@@ -0,0 +1,64 @@
+"""
+Tests for translator/cli.py, with a stub translator.
+"""
+
+import json
+
+from translator.cli import translate_file
+from utils.run_journal import RunJournal
+
+
+class StubTranslator:
+    """Translates a text to "<text>"; texts in `unchanged` come back as they are, texts in `failing` raise."""
+    
+    def __init__(self, unchanged=(), failing=()):
+        self.unchanged = set(unchanged)
+        self.failing = set(failing)
+    
+    def translate(self, text, target_language):
+        if text in self.failing:
+            raise RuntimeError("service unavailable")
+        return text if text in self.unchanged else f"<{text}>"
+
+
+def test_translate_file_journals_the_status_reported_by_the_translator(tmp_path):
+    input_file = tmp_path / "input.json"
+    output_file = tmp_path / "output.json"
+    journal_path = str(tmp_path / "run.journal.jsonl")
+    input_file.write_text(json.dumps([
+        {"problem": "Find the area.", "city": "Paris"},
+        {"problem": "Find the perimeter."},
+    ]))
+    translator = StubTranslator(unchanged={"Paris"}, failing={"Find the perimeter."})
+    
+    with RunJournal(journal_path) as journal:
+        translate_file(str(input_file), translator, "French", str(output_file), journal=journal)
+    
+    assert json.loads(output_file.read_text()) == [
+        {"problem": "<Find the area.>", "city": "Paris"},
+        {"problem": "[Translation Error: service unavailable]"},
+    ]
+    with RunJournal(journal_path, resume=True) as journal:
+        assert journal.indices("done") == [0]
+        assert journal.indices("fallback") == [1]
+
+
+def test_translate_file_resumes_from_the_journal(tmp_path):
+    input_file = tmp_path / "input.json"
+    output_file = tmp_path / "output.json"
+    journal_path = str(tmp_path / "run.journal.jsonl")
+    input_file.write_text(json.dumps([{"problem": "Find the area."}, {"problem": "Find the perimeter."}]))
+    
+    with RunJournal(journal_path) as journal:
+        translate_file(str(input_file), StubTranslator(failing={"Find the perimeter."}), "French",
+                       str(output_file), journal=journal)
+    
+    # The finished item is reused; the fallback item is translated again
+    translator = StubTranslator(failing={"Find the area."})
+    with RunJournal(journal_path, resume=True, retry_fallbacks=True) as journal:
+        translate_file(str(input_file), translator, "French", str(output_file), journal=journal)
+    
+    assert json.loads(output_file.read_text()) == [
+        {"problem": "<Find the area.>"},
+        {"problem": "<Find the perimeter.>"},
+    ]
@@ -0,0 +1,74 @@
+"""
+Tests for utils/code_preserver.py.
+"""
+
+import pytest
+
+from utils.code_preserver import CodePreserver
+
+
+@pytest.fixture
+def preserver():
+    return CodePreserver()
+
+
+def protected(preserver, text):
+    """Spans of a text that the preserver replaces with placeholders."""
+    return list(preserver.extract_math(text)[1].values())
+
+
+@pytest.mark.parametrize("text, spans", [
+    ("Run `pytest -q` first.", ["`pytest -q`"]),
+    ("See https://example.com/docs/1.", ["https://example.com/docs/1"]),
+    ("Edit src/app/models.py now.", ["src/app/models.py"]),
+    ("Open setup.py and pyproject.toml.", ["setup.py", "pyproject.toml"]),
+    ("Call parse_args() twice.", ["parse_args()"]),
+    ("Use np.array here.", ["np.array"]),
+    ("Set MAX_SIZE and call __init__.", ["MAX_SIZE", "__init__"]),
+    ('It fails at File "app.py", line 3, in main', ['File "app.py", line 3, in main']),
+])
+def test_protected_spans(preserver, text, spans):
+    assert protected(preserver, text) == spans
+
+
+def test_fenced_blocks_are_kept_whole(preserver):
+    text = "Apply this:\n```python\nx = a_b + 1\n```\nThen rerun."
+    assert protected(preserver, text) == ["```python\nx = a_b + 1\n```"]
+
+
+def test_tracebacks_are_kept_up_to_the_exception_line(preserver):
+    traceback = 'Traceback (most recent call last):\n  File "a.py", line 1, in <module>\nValueError: bad value'
+    assert protected(preserver, f"The run ended with\n{traceback}\nafter the upgrade.") == [traceback]
+
+
+def test_math_subscripts_are_not_split_as_identifiers(preserver):
+    assert protected(preserver, "Let a_{min} be the bound.") == ["a_{min}"]
+
+
+def test_plain_prose_is_untouched(preserver):
+    text = "The tests fail when the input list is empty."
+    assert preserver.extract_math(text) == (text, {})
+
+
+def test_round_trip(preserver):
+    text = "Fix `foo()` in src/utils/io.py so read_file handles https://example.com/a.txt."
+    modified, replacements = preserver.extract_math(text)
+    
+    assert "read_file" not in modified and "src/utils/io.py" not in modified
+    assert preserver.restore_math(modified, replacements) == text
+
+
+def test_extract_batch_matches_extract_math(preserver):
+    texts = ["Call run_tests() now.", "Nothing here.", "See docs/index.md and `x`.", "Solve $x$."]
+    modified, tables, _ = preserver.extract_batch(texts)
+    assert list(zip(modified, tables)) == [preserver.extract_math(text) for text in texts]
+
+
+def test_kinds_can_be_restricted():
+    preserver = CodePreserver(kinds=("urls",), include_math=False)
+    assert protected(preserver, "Read https://example.com and call run() with $x$.") == ["https://example.com"]
+
+
+def test_unknown_kinds_are_rejected():
+    with pytest.raises(ValueError):
+        CodePreserver(kinds=("code", "sql"))
@@ -0,0 +1,102 @@
+"""
+Tests for utils/completion_cache.py.
+"""
+
+import os
+
+import pytest
+
+from utils.completion_cache import CompletionCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = CompletionCache(str(tmp_path / "completions.sqlite"))
+    yield cache
+    cache.close()
+
+
+def test_key_depends_on_every_part_of_the_request():
+    key = CompletionCache.make_key("gpt-4o", "system", "user", {"temperature": 0})
+    
+    assert key == CompletionCache.make_key("gpt-4o", "system", "user", {"temperature": 0})
+    assert key != CompletionCache.make_key("gpt-4o-mini", "system", "user", {"temperature": 0})
+    assert key != CompletionCache.make_key("gpt-4o", "other system", "user", {"temperature": 0})
+    assert key != CompletionCache.make_key("gpt-4o", "system", "other user", {"temperature": 0})
+    assert key != CompletionCache.make_key("gpt-4o", "system", "user", {"temperature": 1})
+
+
+def test_missing_params_match_empty_params():
+    assert CompletionCache.make_key("m", "s", "u") == CompletionCache.make_key("m", "s", "u", {})
+
+
+def test_set_then_get(cache):
+    key = CompletionCache.make_key("m", "s", "u")
+    
+    assert cache.get(key) is None
+    cache.set(key, "Bonjour", model_name="m")
+    assert cache.get(key) == "Bonjour"
+    
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["writes"]) == (1, 1, 1)
+    assert stats["hit_rate"] == pytest.approx(0.5)
+
+
+def test_entries_survive_reopening(tmp_path):
+    path = str(tmp_path / "completions.sqlite")
+    key = CompletionCache.make_key("m", "s", "u")
+    
+    first = CompletionCache(path)
+    first.set(key, "こんにちは")
+    first.close()
+    
+    second = CompletionCache(path)
+    assert second.get(key) == "こんにちは"
+    second.close()
+
+
+def test_disabled_cache_neither_reads_nor_writes(tmp_path):
+    cache = CompletionCache(str(tmp_path / "completions.sqlite"), enabled=False)
+    key = CompletionCache.make_key("m", "s", "u")
+    
+    cache.set(key, "Hola")
+    assert cache.get(key) is None
+    assert cache.get_stats()["writes"] == 0
+    cache.close()
+
+
+def test_none_responses_are_not_stored(cache):
+    key = CompletionCache.make_key("m", "s", "u")
+    cache.set(key, None)
+    assert cache.get(key) is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, monkeypatch):
+    monkeypatch.setattr(CompletionCache, "EVICTION_CHECK_INTERVAL", 1)
+    cache = CompletionCache(str(tmp_path / "completions.sqlite"), max_entries=2)
+    keys = [CompletionCache.make_key("m", "s", str(i)) for i in range(3)]
+    
+    cache.set(keys[0], "zero")
+    cache.set(keys[1], "one")
+    # Touch the first entry so the second one is the least recently used
+    assert cache.get(keys[0]) == "zero"
+    cache.set(keys[2], "two")
+    
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == "zero"
+    assert cache.get(keys[2]) == "two"
+    assert cache.get_stats()["evictions"] == 1
+    cache.close()
+
+
+def test_clear(cache):
+    key = CompletionCache.make_key("m", "s", "u")
+    cache.set(key, "Hallo")
+    cache.clear()
+    assert cache.get(key) is None
+
+
+def test_parent_directory_is_created(tmp_path):
+    path = tmp_path / "nested" / "completions.sqlite"
+    CompletionCache(str(path)).close()
+    assert os.path.exists(path)
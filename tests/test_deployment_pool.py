@@ -0,0 +1,119 @@
+"""
+Tests for translator/deployment_pool.py.
+"""
+
+import json
+import time
+
+import pytest
+
+from translator.deployment_pool import Deployment, DeploymentPool
+from utils.rate_limiter import RateLimiter
+
+
+def make_pool(*deployments, **kwargs):
+    return DeploymentPool(list(deployments), **kwargs)
+
+
+def test_calls_are_spread_by_weight():
+    heavy, light = Deployment("gpt-4o", name="heavy", weight=3), Deployment("gpt-4o", name="light")
+    pool = make_pool(heavy, light)
+    
+    for _ in range(8):
+        pool.release(pool.acquire(), success=True)
+    
+    stats = pool.get_stats()
+    assert (stats["heavy"]["calls"], stats["light"]["calls"]) == (6, 2)
+
+
+def test_least_outstanding_deployment_is_preferred():
+    first, second = Deployment("gpt-4o", name="first"), Deployment("gpt-4o", name="second")
+    pool = make_pool(first, second)
+    
+    busy = pool.acquire()
+    assert pool.acquire() is not busy
+
+
+def test_repeated_failures_eject_a_deployment():
+    first, second = Deployment("gpt-4o", name="first"), Deployment("gpt-4o", name="second")
+    pool = make_pool(first, second, failure_threshold=2, ejection_seconds=60)
+    
+    for _ in range(2):
+        pool.acquire(exclude=[second])
+        pool.release(first, success=False)
+    
+    assert not first.is_available(time.time())
+    assert all(pool.acquire() is second for _ in range(3))
+    assert pool.get_stats()["first"]["ejections"] == 1
+
+
+def test_fatal_outcomes_do_not_count_as_failures():
+    first, second = Deployment("gpt-4o", name="first"), Deployment("gpt-4o", name="second")
+    pool = make_pool(first, second, failure_threshold=1)
+    
+    pool.release(pool.acquire(exclude=[second]), success=None)
+    
+    assert first.outstanding == 0
+    assert first.consecutive_failures == 0
+    assert first.ejected_until == 0
+
+
+def test_excluded_deployments_are_used_when_nothing_else_is_left():
+    only = Deployment("gpt-4o", name="only")
+    pool = make_pool(only)
+    
+    assert pool.acquire(exclude=[only]) is only
+
+
+def test_single_deployments_are_never_ejected():
+    only = Deployment("gpt-4o", name="only")
+    pool = make_pool(only, failure_threshold=1)
+    
+    pool.release(pool.acquire(), success=False)
+    assert only.ejected_until == 0
+
+
+def test_deployments_with_less_quota_get_less_traffic():
+    limiter = RateLimiter(":memory:")
+    drained = Deployment("gpt-4o", name="drained", requests_per_minute=100)
+    fresh = Deployment("gpt-4o", name="fresh", requests_per_minute=100)
+    pool = make_pool(drained, fresh, rate_limiter=limiter)
+    limiter.acquire({drained.requests_bucket: 99})
+    
+    # Both have one call outstanding; the one with more quota left wins the next call
+    pool.acquire(exclude=[fresh])
+    pool.acquire(exclude=[drained])
+    assert pool.acquire() is fresh
+
+
+def test_api_params():
+    azure = Deployment("azure/gpt-4o", api_key="k", api_base="https://a.example.com", api_version="2024-02-01")
+    openai = Deployment("gpt-4o", api_key="k")
+    
+    assert azure.api_params() == {
+        "model": "azure/gpt-4o", "api_key": "k", "api_base": "https://a.example.com", "api_version": "2024-02-01"
+    }
+    assert openai.api_params() == {"model": "gpt-4o", "api_key": "k"}
+    assert azure.name == "azure/gpt-4o@https://a.example.com"
+
+
+def test_from_env_reads_keys_from_named_variables(monkeypatch):
+    monkeypatch.setenv("EAST_KEY", "secret")
+    monkeypatch.setenv("LLM_DEPLOYMENTS", json.dumps([
+        {"model": "azure/gpt-4o", "api_base": "https://east.example.com", "api_key_env": "EAST_KEY"},
+        {"model": "azure/gpt-4o", "api_base": "https://west.example.com", "api_key": "inline"}
+    ]))
+    
+    pool = DeploymentPool.from_env()
+    assert [d.api_key for d in pool.deployments] == ["secret", "inline"]
+
+
+def test_from_env_without_configuration(monkeypatch):
+    monkeypatch.delenv("LLM_DEPLOYMENTS", raising=False)
+    monkeypatch.delenv("LLM_DEPLOYMENTS_FILE", raising=False)
+    assert DeploymentPool.from_env() is None
+
+
+def test_empty_pools_are_rejected():
+    with pytest.raises(ValueError):
+        DeploymentPool([])
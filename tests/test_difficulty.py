@@ -0,0 +1,50 @@
+"""
+Tests for translator/difficulty.py.
+"""
+
+import pytest
+
+from translator.difficulty import DifficultyScorer
+
+
+@pytest.fixture
+def scorer():
+    return DifficultyScorer("gaia")
+
+
+def test_short_declarative_sentences_keep_the_machine_translation(scorer):
+    # HybridTranslator documents this routing: no LLM step for such segments when routing is enabled
+    source = "Open the attached file and read the first line."
+    machine_translation = "添付ファイルを開いて最初の行を読んでください。"
+    
+    assert scorer.score(source, machine_translation) < 0.05
+    assert scorer.tier(source, machine_translation) == "mt_only"
+
+
+def test_questions_are_enhanced(scorer):
+    assert scorer.tier("What is the capital of France?", "フランスの首都はどこですか？") == "mt_enhance"
+
+
+def test_untranslated_machine_output_takes_the_full_pipeline(scorer):
+    source = "Explain why the function returns None when the list is empty?"
+    assert scorer.tier(source, source) == "full"
+
+
+def test_math_density_counts_placeholders(scorer):
+    features = scorer.features("Solve [[M0]] for [[M1]]")
+    assert features["math_density"] == pytest.approx(1.0)
+    assert "mt_similarity" not in features
+
+
+def test_tiers_are_counted(scorer):
+    scorer.tier("Open the file.", "ファイルを開いてください。")
+    scorer.tier("Why?", "なぜ？")
+    
+    stats = scorer.get_stats()
+    assert stats["total"] == 2
+    assert sum(stats[tier] for tier in DifficultyScorer.TIERS) == 2
+
+
+def test_dataset_thresholds(scorer):
+    assert (scorer.mt_only_below, scorer.full_above) == DifficultyScorer.DEFAULT_THRESHOLDS["gaia"]
+    assert DifficultyScorer("unknown").mt_only_below == DifficultyScorer.DEFAULT_THRESHOLDS["general"][0]
@@ -0,0 +1,90 @@
+"""
+Tests for translator/hedging.py.
+"""
+
+import time
+import asyncio
+
+import pytest
+
+from translator.hedging import HedgePolicy
+
+
+def warmed_policy(latency=0.01, **kwargs):
+    """A policy that has observed enough latencies to start hedging."""
+    policy = HedgePolicy(min_samples=5, max_hedge_ratio=1.0, **kwargs)
+    for _ in range(5):
+        policy.record_latency(latency)
+    return policy
+
+
+def test_no_hedging_before_enough_samples():
+    policy = HedgePolicy(min_samples=5)
+    for _ in range(4):
+        policy.record_latency(0.1)
+    
+    assert policy.hedge_delay() is None
+    assert policy.call(lambda: "ok") == "ok"
+    assert policy.get_stats()["hedged"] == 0
+
+
+def test_hedge_delay_is_the_latency_percentile():
+    policy = HedgePolicy(percentile=90, min_samples=10)
+    for latency in range(1, 11):
+        policy.record_latency(latency / 10)
+    
+    assert policy.hedge_delay() == pytest.approx(1.0)
+
+
+def test_slow_calls_are_hedged_and_the_faster_answer_wins():
+    policy = warmed_policy()
+    calls = []
+    
+    def make_call():
+        calls.append(1)
+        if len(calls) == 1:
+            time.sleep(0.3)
+            return "slow"
+        return "fast"
+    
+    assert policy.call(make_call) == "fast"
+    stats = policy.get_stats()
+    assert (stats["hedged"], stats["hedge_wins"]) == (1, 1)
+
+
+def test_hedges_stay_within_the_budget():
+    policy = warmed_policy()
+    policy.max_hedge_ratio = 0.0
+    
+    assert policy.call(lambda: time.sleep(0.05) or "primary") == "primary"
+    assert policy.get_stats()["hedged"] == 0
+
+
+def test_failed_primary_falls_back_to_the_hedge():
+    policy = warmed_policy()
+    calls = []
+    
+    def make_call():
+        calls.append(1)
+        if len(calls) == 1:
+            time.sleep(0.05)
+            raise TimeoutError("primary failed")
+        time.sleep(0.1)
+        return "hedge"
+    
+    assert policy.call(make_call) == "hedge"
+
+
+def test_async_slow_calls_are_hedged():
+    policy = warmed_policy()
+    calls = []
+    
+    async def make_call():
+        calls.append(1)
+        if len(calls) == 1:
+            await asyncio.sleep(0.3)
+            return "slow"
+        return "fast"
+    
+    assert asyncio.run(policy.acall(make_call)) == "fast"
+    assert policy.get_stats()["hedge_wins"] == 1
@@ -0,0 +1,89 @@
+"""
+Tests for translator/hybrid_translator.py, with LiteLLM and the machine translator replaced by stubs.
+"""
+
+import json
+
+import pytest
+
+from translator.hybrid_translator import HybridTranslator
+from translator.llm_translator import LLMTranslator
+from translator.retry import RetryPolicy
+from utils.completion_cache import CompletionCache
+from utils.translation_memory import TranslationMemory
+from tests.conftest import PROMPTS_DIR
+
+
+class StubMachineTranslator:
+    """Stands in for the DeepL and Google translators: a text is translated to "MT <text>"."""
+    
+    def translate(self, text, target_language):
+        return f"MT {text}"
+    
+    def batch_translate(self, texts, target_language):
+        return [self.translate(text, target_language) for text in texts]
+
+
+def packed_originals(calls):
+    """Original texts of each packed request (a JSON array of objects) among the recorded LLM calls."""
+    return [[item["original"] for item in json.loads(user)] for _, user in calls if user.startswith("[")]
+
+
+@pytest.fixture
+def memory():
+    return TranslationMemory(":memory:")
+
+
+@pytest.fixture
+def translator(stub_litellm, tmp_path, memory):
+    def responder(system, user):
+        if user.startswith("["):
+            return json.dumps([f"packed {item['original']}" for item in json.loads(user)])
+        if "Earlier text:" in user:
+            return "adapted"
+        return "single"
+    
+    stub_litellm.responder = responder
+    cache = CompletionCache(str(tmp_path / "completions.sqlite"))
+    llm_translator = LLMTranslator(
+        model_name="gpt-4o", dataset_type="math", prompts_dir=PROMPTS_DIR, cache=cache,
+        retry_policy=RetryPolicy(max_attempts=1), packing=True
+    )
+    yield HybridTranslator(
+        google_translator=StubMachineTranslator(), llm_translator=llm_translator, dataset_type="math",
+        prompts_dir=PROMPTS_DIR, translation_memory=memory
+    )
+    cache.close()
+
+
+def test_packed_batch_reuses_exact_memory_matches(translator, memory, stub_litellm):
+    memory.add("Find the area.", "Trouvez l'aire.", "French")
+    texts = ["Find the area.", "Compute the sum.", "Name the shape."]
+    
+    results = translator.batch_translate(texts, "French")
+    
+    assert results == ["Trouvez l'aire.", "packed Compute the sum.", "packed Name the shape."]
+    assert packed_originals(stub_litellm.calls) == [["Compute the sum.", "Name the shape."]]
+
+
+def test_packed_batch_stores_its_translations(translator, memory, stub_litellm):
+    translator.batch_translate(["Compute the sum.", "Name the shape."], "French")
+    
+    assert memory.lookup_exact("Compute the sum.", "French") == "packed Compute the sum."
+    assert memory.lookup_exact("Name the shape.", "French") == "packed Name the shape."
+    
+    # A second run is served from the memory without any LLM call
+    calls = len(stub_litellm.calls)
+    results = translator.batch_translate(["Compute the sum.", "Name the shape."], "French")
+    assert results == ["packed Compute the sum.", "packed Name the shape."]
+    assert len(stub_litellm.calls) == calls
+
+
+def test_packed_batch_enhances_fuzzy_memory_matches_one_by_one(translator, memory, stub_litellm):
+    memory.add("Find the area of the square.", "Trouvez l'aire du carré.", "French")
+    texts = ["Find the area of the squares.", "Compute the sum.", "Name the shape."]
+    
+    results = translator.batch_translate(texts, "French")
+    
+    assert results == ["adapted", "packed Compute the sum.", "packed Name the shape."]
+    assert packed_originals(stub_litellm.calls) == [["Compute the sum.", "Name the shape."]]
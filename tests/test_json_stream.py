@@ -0,0 +1,69 @@
+"""
+Tests for utils/json_stream.py.
+"""
+
+import json
+
+import pytest
+
+from utils import json_stream
+from utils.json_stream import JsonItemWriter, iter_json_array, iter_json_items, iter_jsonl
+
+ITEMS = [{"question": "Why?", "answer": 42}, [1, 2.5, None], "text with ] and , inside", 123456789, True, {}]
+
+
+def test_jsonl_round_trip(tmp_path):
+    path = str(tmp_path / "items.jsonl")
+    with JsonItemWriter(path) as writer:
+        for item in ITEMS:
+            writer.write(item)
+    
+    assert writer.count == len(ITEMS)
+    assert list(iter_json_items(path)) == ITEMS
+
+
+def test_json_array_round_trip(tmp_path):
+    path = str(tmp_path / "items.json")
+    with JsonItemWriter(path) as writer:
+        for item in ITEMS:
+            writer.write(item)
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        assert json.load(f) == ITEMS
+    assert list(iter_json_items(path)) == ITEMS
+
+
+def test_empty_array(tmp_path):
+    path = str(tmp_path / "items.json")
+    JsonItemWriter(path).close()
+    
+    assert list(iter_json_array(path)) == []
+
+
+def test_elements_spanning_read_blocks(tmp_path, monkeypatch):
+    # Tiny blocks cut numbers, strings and separators at every possible position
+    monkeypatch.setattr(json_stream, "READ_BLOCK_SIZE", 3)
+    path = tmp_path / "items.json"
+    path.write_text(json.dumps(ITEMS, indent=2), encoding="utf-8")
+    
+    assert list(iter_json_array(str(path))) == ITEMS
+
+
+def test_jsonl_skips_blank_lines_and_reports_bad_ones(tmp_path):
+    path = tmp_path / "items.jsonl"
+    path.write_text('{"a": 1}\n\n{"a": 2}\n{"a": \n', encoding="utf-8")
+    
+    items = iter_jsonl(str(path))
+    assert next(items) == {"a": 1}
+    assert next(items) == {"a": 2}
+    with pytest.raises(ValueError, match=":4:"):
+        next(items)
+
+
+@pytest.mark.parametrize("content", ['{"a": 1}', '[1, 2', '[1 2]', '[1, }'])
+def test_malformed_arrays_are_rejected(tmp_path, content):
+    path = tmp_path / "items.json"
+    path.write_text(content, encoding="utf-8")
+    
+    with pytest.raises(ValueError):
+        list(iter_json_array(str(path)))
@@ -0,0 +1,109 @@
+"""
+Tests for translator/llm_translator.py, with LiteLLM replaced by a stub.
+"""
+
+import re
+import json
+
+import pytest
+
+from translator.llm_translator import LLMTranslator
+from translator.retry import RetryPolicy
+from utils.completion_cache import CompletionCache
+from utils.fallback_text import FallbackText
+from tests.conftest import PROMPTS_DIR
+
+
+@pytest.fixture
+def translator(stub_litellm, tmp_path):
+    cache = CompletionCache(str(tmp_path / "completions.sqlite"))
+    yield LLMTranslator(
+        model_name="gpt-4o", dataset_type="math", prompts_dir=PROMPTS_DIR, cache=cache,
+        retry_policy=RetryPolicy(max_attempts=1), packing=True
+    )
+    cache.close()
+
+
+def packed_items(user_prompt):
+    return json.loads(user_prompt)
+
+
+def test_packed_items_that_all_lose_placeholders_go_to_the_single_text_path(translator, stub_litellm):
+    # Every packed answer drops the placeholders; the cache would replay the same answer forever
+    stub_litellm.responder = lambda system, user: json.dumps(["traduit"] * len(packed_items(user)))
+    payloads = ["Solve [[M0]].", "Compute [[M0]] and [[M1]]."]
+    
+    outputs = translator.translate_packed(payloads, [["[[M0]]"], ["[[M0]]", "[[M1]]"]], "Translate.", "texts")
+    
+    assert outputs == [None, None]
+    assert len(stub_litellm.calls) == 1
+
+
+def test_placeholder_retries_bypass_the_cache(translator, stub_litellm):
+    payloads = ["Solve [[M0]].", "Find [[M0]].", "Plain text."]
+    stub_litellm.responder = lambda system, user: json.dumps(
+        ["perdu" if len(stub_litellm.calls) == 1 and "[[M0]]" in item else f"{item} fr" for item in packed_items(user)]
+    )
+    
+    # An earlier run cached a bad answer for the retried items
+    retry_prompt = "Translate." + LLMTranslator.PACKED_PROMPT_SUFFIX.format(count=2, item_description="texts")
+    cache_key, _ = translator._lookup_cache(retry_prompt, json.dumps(payloads[:2], ensure_ascii=False))
+    translator.cache.set(cache_key, json.dumps(["perdu", "perdu"]))
+    
+    outputs = translator.translate_packed(payloads, [["[[M0]]"], ["[[M0]]"], []], "Translate.", "texts")
+    
+    assert outputs == ["Solve [[M0]]. fr", "Find [[M0]]. fr", "Plain text. fr"]
+    assert json.loads(stub_litellm.calls[1][1]) == payloads[:2]
+    # The fresh answer replaces the cached one
+    assert translator.cache.get(cache_key) == stub_litellm.responder(retry_prompt, json.dumps(payloads[:2]))
+
+
+def test_placeholder_retries_are_bounded(translator, stub_litellm):
+    # Only the first item with a placeholder keeps it, so every retry has one invalid item less
+    def responder(system, user):
+        items = packed_items(user)
+        first = next(i for i, item in enumerate(items) if "[[M0]]" in item)
+        return json.dumps([item if i == first or "[[M0]]" not in item else "perdu" for i, item in enumerate(items)])
+    
+    stub_litellm.responder = responder
+    payloads = ["P1 [[M0]]", "P2 [[M0]]", "P3 [[M0]]", "P4 [[M0]]", "Plain"]
+    required = [["[[M0]]"]] * 4 + [[]]
+    
+    outputs = translator.translate_packed(payloads, required, "Translate.", "texts")
+    
+    assert outputs == ["P1 [[M0]]", "P2 [[M0]]", "P3 [[M0]]", None, "Plain"]
+    assert len(stub_litellm.calls) == 1 + LLMTranslator.PACK_MAX_RETRIES
+
+
+def test_batch_translate_finishes_when_packed_answers_never_keep_placeholders(translator, stub_litellm):
+    def responder(system, user):
+        if user.startswith("["):
+            return json.dumps(["sans espace réservé"] * len(packed_items(user)))
+        # Single-text steps keep the placeholders of the text
+        return "traduit " + " ".join(sorted(set(re.findall(r"\[\[M\d+\]\]", user))))
+    
+    stub_litellm.responder = responder
+    texts = ["Solve $x$.", "Compute $y + 1$.", "Find $z$."]
+    
+    assert translator.batch_translate(texts, "French") == ["traduit $x$", "traduit $y + 1$", "traduit $z$"]
+
+
+def test_failed_translation_is_reported_as_a_fallback(translator, stub_litellm):
+    def responder(system, user):
+        raise RuntimeError("service unavailable")
+    
+    stub_litellm.responder = responder
+    
+    translation = translator.translate("Solve $x + 1 = 2$.", "French")
+    
+    assert translation == "Solve $x + 1 = 2$."
+    assert isinstance(translation, FallbackText)
+
+
+def test_text_that_stays_the_same_is_not_a_fallback(translator, stub_litellm):
+    stub_litellm.responder = lambda system, user: "Paris"
+    
+    translation = translator.translate("Paris", "French")
+    
+    assert translation == "Paris"
+    assert not isinstance(translation, FallbackText)
@@ -0,0 +1,167 @@
+"""
+Tests for utils/math_preserver.py.
+"""
+
+import re
+import random
+
+import pytest
+
+from utils.math_preserver import SimpleMathPreserver
+
+# Fragments combined into the differential corpus: inline, display, \( \), \[ \] and
+# environment math, commands, equations and a few unbalanced delimiters
+FRAGMENTS = [
+    "$x$", "$$y+1$$", "\\(a\\)", "\\[b^2\\]", "\\begin{align}x&=1\\end{align}", "(x+1)", "^2", " = ", "4",
+    "a_1", "\\frac{1}{2}", "\\alpha", " text ", "y", "+", "2*3", "(a+b=c)", "{", "}", "$", "a_{i}", "\n",
+    "-", "z^3", "[[M0]]",
+]
+
+CORPUS = [
+    "Solve $x^2 + 1 = 0$ for x.",
+    "Display math: $$\\int_0^1 f(x)\\,dx$$ and \\frac{a}{b} inline.",
+    "Inline \\(x+1\\) and display \\[y = 2\\].",
+    "\\begin{align} a &= $b$ \\end{align}",
+    "Expand (x+1)^2 = 4 and z^3+2*3.",
+    "\\frac{$a$}{b} with a_{min} < b",
+    "A lone $ sign, then $$x$$ and $y$.",
+    "$x$$x$$",
+]
+
+TEXTS = [
+    "Solve $x^2 + 1 = 0$ for x.",
+    "No math in this sentence.",
+    "",
+    "Display math: $$\\int_0^1 f(x)\\,dx$$ and \\frac{a}{b} inline.",
+    "Already has [[M0]] and adds $y$.",
+    "The sum 2+3=5 and the variable a_1.",
+    "A lone $ sign runs into the next text",
+    "which has $z$ in it.",
+    "\\begin{align} a &= b \\end{align}",
+    "Price is 5 dollars.",
+]
+
+
+def sequential_extract(patterns, text):
+    """
+    The sequential extraction of the original implementation: each pattern in priority
+    order rescans the text rebuilt by the ones before, and every match is replaced by a
+    placeholder (nesting the placeholders of earlier matches it encloses).
+    """
+    replacements = {}
+    modified_text = text
+    for pattern in patterns:
+        match_data = [(m.group(0), m.start(), m.end()) for m in re.finditer(pattern, modified_text)]
+        for match_text, start_pos, end_pos in sorted(match_data, key=lambda x: x[1], reverse=True):
+            placeholder = f"[[P{len(replacements)}]]"
+            replacements[placeholder] = match_text
+            modified_text = modified_text[:start_pos] + placeholder + modified_text[end_pos:]
+    return modified_text, replacements
+
+
+def protected_spans(modified_text, replacements, pattern):
+    """Spans of the original text hidden behind the top-level placeholders of an extraction."""
+    def expand(value):
+        return pattern.sub(lambda m: expand(replacements.get(m.group(0), "")) or m.group(0), value)
+    
+    spans = []
+    position = 0
+    for piece in re.split(f"({pattern.pattern})", modified_text):
+        length = len(expand(piece))
+        if piece in replacements:
+            spans.append((position, position + length))
+        position += length
+    return spans
+
+
+def differential_corpus():
+    rng = random.Random(0)
+    generated = ["".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 6))) for _ in range(3000)]
+    return CORPUS + generated
+
+
+@pytest.fixture
+def preserver():
+    return SimpleMathPreserver()
+
+
+def test_same_spans_as_sequential_extraction(preserver):
+    reference_pattern = re.compile(r'\[\[P\d+\]\]')
+    mismatches = []
+    for text in differential_corpus():
+        expected = protected_spans(*sequential_extract(preserver.patterns, text), reference_pattern)
+        actual = protected_spans(*preserver.extract_math(text), SimpleMathPreserver.PLACEHOLDER_PATTERN)
+        if actual != expected:
+            mismatches.append((text, [text[s:e] for s, e in expected], [text[s:e] for s, e in actual]))
+    
+    assert mismatches == []
+
+
+def test_display_math_is_extracted_whole(preserver):
+    # The one intended difference from the original order: $$...$$ is tried before $...$
+    assert list(preserver.extract_math("See $$x$$ here.")[1].values()) == ["$$x$$"]
+
+
+def test_placeholder_format():
+    assert SimpleMathPreserver.placeholder(3) == "[[M3]]"
+    assert SimpleMathPreserver.find_placeholders("a [[ m2 ]] b [[M10]] [[M2]]") == ["[[M2]]", "[[M10]]", "[[M2]]"]
+
+
+def test_extract_and_restore_round_trip(preserver):
+    text = "Solve $x^2 + 1 = 0$ where \\alpha is real."
+    modified, replacements = preserver.extract_math(text)
+    
+    assert modified == "Solve [[M0]] where [[M1]] is real."
+    assert replacements == {"[[M0]]": "$x^2 + 1 = 0$", "[[M1]]": "\\alpha"}
+    assert preserver.restore_math(modified, replacements) == text
+
+
+def test_numbering_continues_after_existing_placeholders(preserver):
+    modified, replacements = preserver.extract_math("Keep [[M4]] and replace $x$.")
+    assert modified == "Keep [[M4]] and replace [[M5]]."
+    assert list(replacements) == ["[[M5]]"]
+
+
+def test_restore_tolerates_spacing_and_case_changes(preserver):
+    replacements = {"[[M0]]": "$x$"}
+    assert preserver.restore_math("Résoudre [[ m0 ]].", replacements) == "Résoudre $x$."
+
+
+def test_missing_and_duplicated_placeholders_are_reported(preserver):
+    replacements = {"[[M0]]": "$x$", "[[M1]]": "$y$"}
+    
+    assert preserver.check_placeholders("[[M0]] [[M0]]", replacements) == {
+        "missing": ["[[M1]]"], "duplicated": ["[[M0]]"]
+    }
+    preserver.restore_math("[[M0]] [[M0]]", replacements)
+    stats = preserver.get_stats()
+    assert (stats["missing"], stats["duplicated"]) == (1, 1)
+
+
+def test_extract_batch_matches_extract_math(preserver):
+    modified, tables, has_math = preserver.extract_batch(TEXTS)
+    
+    for text, batch_text, table, flag in zip(TEXTS, modified, tables, has_math):
+        assert (batch_text, table) == preserver.extract_math(text)
+        assert flag == bool(table)
+
+
+def test_extract_batch_matches_extract_math_on_the_differential_corpus(preserver):
+    texts = differential_corpus()
+    modified, tables, _ = preserver.extract_batch(texts)
+    assert list(zip(modified, tables)) == [preserver.extract_math(text) for text in texts]
+
+
+def test_restore_batch_matches_restore_math(preserver):
+    modified, tables, _ = preserver.extract_batch(TEXTS)
+    # Simulate a translator that changes the spacing inside one placeholder
+    translated = [text.replace("[[M0]]", "[[ M0 ]]", 1) if k == 0 else text for k, text in enumerate(modified)]
+    
+    assert preserver.restore_batch(translated, tables) == [
+        preserver.restore_math(text, table) if table else text for text, table in zip(translated, tables)
+    ]
+    assert preserver.restore_batch(modified, tables) == [text or "" for text in TEXTS]
+
+
+def test_extract_batch_of_nothing(preserver):
+    assert preserver.extract_batch([]) == ([], [], [])
@@ -0,0 +1,153 @@
+"""
+Tests for utils/rate_limiter.py.
+"""
+
+import asyncio
+import sqlite3
+import threading
+
+import pytest
+
+from utils import rate_limiter
+from utils.rate_limiter import RateLimiter, estimate_tokens, env_limit, get_rate_limiter
+
+
+@pytest.fixture
+def limiter():
+    return RateLimiter(":memory:")
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("Translate this sentence into French.") > 0
+    assert estimate_tokens("word " * 200) > estimate_tokens("word " * 20)
+
+
+def test_unconfigured_buckets_do_not_limit(limiter):
+    assert limiter.acquire({"unknown": 1000}) == 0
+    assert limiter.remaining_fraction("unknown") is None
+
+
+def test_acquire_takes_from_the_bucket(limiter):
+    limiter.configure("requests", 60)
+    
+    assert limiter.acquire({"requests": 30}) == 0
+    assert limiter.remaining_fraction("requests") == pytest.approx(0.5, abs=0.01)
+    assert limiter.get_stats()["acquired"] == 1
+
+
+def test_empty_bucket_reports_the_refill_wait(limiter):
+    # 6000/min refills 100 units per second
+    limiter.configure("tokens", 6000)
+    assert limiter._try_acquire({"tokens": 6000}) == 0
+    
+    wait = limiter._try_acquire({"tokens": 50})
+    assert 0 < wait <= 0.5
+
+
+def test_acquire_waits_for_the_refill(limiter):
+    limiter.configure("tokens", 6000)
+    limiter.acquire({"tokens": 6000})
+    
+    waited = limiter.acquire({"tokens": 10})
+    assert waited > 0
+    
+    stats = limiter.get_stats()
+    assert (stats["acquired"], stats["throttled"]) == (2, 1)
+    assert stats["wait_seconds"] == pytest.approx(waited)
+
+
+def test_aacquire_waits_for_the_refill(limiter):
+    limiter.configure("tokens", 6000)
+    limiter.acquire({"tokens": 6000})
+    
+    assert asyncio.run(limiter.aacquire({"tokens": 10})) > 0
+
+
+def test_aacquire_does_not_block_the_event_loop_on_a_locked_database(tmp_path):
+    path = str(tmp_path / "rate_limits.sqlite")
+    limiter = RateLimiter(path)
+    limiter.configure("tokens", 6000)
+    
+    # Another process holds the database lock for a moment
+    other = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+    other.execute("BEGIN IMMEDIATE")
+    release = threading.Timer(0.3, other.execute, ("COMMIT",))
+    release.start()
+    
+    async def count_ticks_until_acquired():
+        ticks = 0
+        task = asyncio.ensure_future(limiter.aacquire({"tokens": 10}))
+        while not task.done():
+            ticks += 1
+            await asyncio.sleep(0.01)
+        return ticks
+    
+    try:
+        assert asyncio.run(count_ticks_until_acquired()) > 5
+    finally:
+        release.join()
+        other.close()
+
+
+def test_all_buckets_must_cover_the_request(limiter):
+    limiter.configure("requests", 60)
+    limiter.configure("tokens", 60)
+    limiter.acquire({"tokens": 60})
+    
+    # The request bucket is full but the token bucket is not, so nothing is taken
+    assert limiter._try_acquire({"requests": 1, "tokens": 30}) > 0
+    assert limiter.remaining_fraction("requests") == pytest.approx(1.0)
+
+
+def test_requests_larger_than_the_bucket_only_need_a_full_bucket(limiter):
+    limiter.configure("tokens", 60)
+    
+    assert limiter._try_acquire({"tokens": 600}) == 0
+    assert limiter.remaining_fraction("tokens") < 0
+
+
+def test_reconcile_gives_back_over_estimates(limiter):
+    limiter.configure("tokens", 1000)
+    limiter.acquire({"tokens": 500})
+    
+    limiter.reconcile("tokens", 500, 100)
+    assert limiter.remaining_fraction("tokens") == pytest.approx(0.9, abs=0.01)
+    
+    limiter.reconcile("tokens", 100, 400)
+    assert limiter.remaining_fraction("tokens") == pytest.approx(0.6, abs=0.01)
+
+
+def test_configure_updates_the_capacity(limiter):
+    limiter.configure("requests", 60)
+    limiter.configure("requests", 120)
+    
+    # The stored level is kept; only the capacity and refill rate change
+    assert limiter.remaining_fraction("requests") == pytest.approx(0.5, abs=0.01)
+
+
+def test_buckets_are_shared_through_the_database_file(tmp_path):
+    path = str(tmp_path / "rate_limits.sqlite")
+    first, second = RateLimiter(path), RateLimiter(path)
+    first.configure("requests", 60)
+    
+    first.acquire({"requests": 60})
+    assert second._try_acquire({"requests": 1}) > 0
+
+
+def test_get_rate_limiter_is_shared_per_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(rate_limiter, "_limiters", {})
+    path = str(tmp_path / "rate_limits.sqlite")
+    
+    assert get_rate_limiter(path) is get_rate_limiter(path)
+    assert get_rate_limiter(path) is not get_rate_limiter(str(tmp_path / "other.sqlite"))
+
+
+def test_env_limit(monkeypatch):
+    monkeypatch.setenv("TEST_RPM", "120")
+    monkeypatch.setenv("TEST_TPM", "many")
+    monkeypatch.delenv("TEST_UNSET", raising=False)
+    
+    assert env_limit("TEST_RPM") == 120.0
+    assert env_limit("TEST_TPM") is None
+    assert env_limit("TEST_UNSET") is None
@@ -0,0 +1,57 @@
+"""
+Tests for utils/reorder_buffer.py.
+"""
+
+import random
+
+import pytest
+
+from utils.reorder_buffer import ReorderBuffer
+
+
+def test_in_order_results_are_released_immediately():
+    buffer = ReorderBuffer()
+    
+    assert buffer.put(0, "a") == ["a"]
+    assert buffer.put(1, "b") == ["b"]
+    assert len(buffer) == 0
+
+
+def test_results_are_held_until_the_gap_is_filled():
+    buffer = ReorderBuffer()
+    
+    assert buffer.put(2, "c") == []
+    assert buffer.put(1, "b") == []
+    assert len(buffer) == 2
+    assert buffer.put(0, "a") == ["a", "b", "c"]
+    assert buffer.next_index == 3
+    assert buffer.peak == 3
+
+
+def test_any_completion_order_yields_input_order():
+    order = list(range(50))
+    random.Random(0).shuffle(order)
+    buffer = ReorderBuffer()
+    
+    released = []
+    for index in order:
+        released.extend(buffer.put(index, index))
+    assert released == list(range(50))
+
+
+def test_start_index():
+    buffer = ReorderBuffer(start=10)
+    
+    assert buffer.put(11, "b") == []
+    assert buffer.put(10, "a") == ["a", "b"]
+
+
+def test_duplicate_results_are_rejected():
+    buffer = ReorderBuffer()
+    buffer.put(0, "a")
+    buffer.put(2, "c")
+    
+    with pytest.raises(ValueError):
+        buffer.put(0, "again")
+    with pytest.raises(ValueError):
+        buffer.put(2, "again")
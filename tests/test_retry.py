@@ -0,0 +1,137 @@
+"""
+Tests for translator/retry.py.
+"""
+
+import time
+import asyncio
+from email.utils import formatdate
+
+import pytest
+
+from translator.retry import (
+    RetryPolicy, RetryableCompletionError, FatalCompletionError, classify_error, _parse_retry_after
+)
+
+
+class ProviderError(Exception):
+    """Exception shaped like the errors raised by provider clients."""
+    
+    def __init__(self, message, status_code=None, headers=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class RateLimitError(Exception):
+    pass
+
+
+@pytest.fixture
+def policy():
+    return RetryPolicy(max_attempts=3, base_delay=0.001, max_delay=0.01)
+
+
+def test_parse_retry_after_seconds():
+    assert _parse_retry_after("3") == 3.0
+    assert _parse_retry_after(1.5) == 1.5
+    assert _parse_retry_after("-2") == 0.0
+    assert _parse_retry_after(None) is None
+    assert _parse_retry_after("soon") is None
+
+
+def test_parse_retry_after_http_date():
+    delay = _parse_retry_after(formatdate(time.time() + 30, usegmt=True))
+    assert 25 <= delay <= 31
+
+
+@pytest.mark.parametrize("status_code", [408, 409, 429, 500, 503])
+def test_transient_status_codes_are_retryable(status_code):
+    assert isinstance(classify_error(ProviderError("failed", status_code)), RetryableCompletionError)
+
+
+@pytest.mark.parametrize("status_code", [400, 401, 403, 404, 422, None])
+def test_other_status_codes_are_fatal(status_code):
+    assert isinstance(classify_error(ProviderError("failed", status_code)), FatalCompletionError)
+
+
+def test_errors_are_classified_by_type():
+    assert isinstance(classify_error(TimeoutError()), RetryableCompletionError)
+    assert isinstance(classify_error(ConnectionResetError()), RetryableCompletionError)
+    assert isinstance(classify_error(RateLimitError("slow down")), RetryableCompletionError)
+    assert isinstance(classify_error(ValueError("bad prompt")), FatalCompletionError)
+
+
+def test_classified_errors_keep_status_and_retry_after():
+    error = classify_error(ProviderError("limited", 429, {"retry-after": "7"}))
+    
+    assert error.status_code == 429
+    assert error.retry_after == 7.0
+    assert "ProviderError" in str(error)
+
+
+def test_completion_errors_pass_through():
+    error = FatalCompletionError("already classified")
+    assert classify_error(error) is error
+
+
+def test_delay_honours_retry_after_up_to_the_cap():
+    policy = RetryPolicy(base_delay=0.1, max_delay=5)
+    
+    assert policy.compute_delay(1, RetryableCompletionError("x", retry_after=2)) >= 2
+    assert policy.compute_delay(1, RetryableCompletionError("x", retry_after=60)) == 5
+
+
+def test_backoff_stays_within_bounds():
+    policy = RetryPolicy(base_delay=1, max_delay=4)
+    error = RetryableCompletionError("x")
+    
+    for attempt in range(1, 8):
+        assert 0 <= policy.compute_delay(attempt, error) <= min(4, 2 ** (attempt - 1))
+
+
+def test_call_retries_transient_failures(policy):
+    attempts = []
+    
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise TimeoutError("timed out")
+        return "ok"
+    
+    assert policy.call(flaky) == "ok"
+    assert len(attempts) == 3
+
+
+def test_call_gives_up_after_max_attempts(policy):
+    def failing():
+        raise ProviderError("unavailable", 503)
+    
+    with pytest.raises(RetryableCompletionError) as info:
+        policy.call(failing)
+    assert info.value.attempts == 3
+
+
+def test_call_does_not_retry_fatal_failures(policy):
+    attempts = []
+    
+    def invalid():
+        attempts.append(1)
+        raise ProviderError("invalid request", 400)
+    
+    with pytest.raises(FatalCompletionError) as info:
+        policy.call(invalid)
+    assert len(attempts) == 1
+    assert info.value.status_code == 400
+
+
+def test_acall_retries_transient_failures(policy):
+    attempts = []
+    
+    async def flaky():
+        attempts.append(1)
+        if len(attempts) < 2:
+            raise ProviderError("rate limited", 429)
+        return "ok"
+    
+    assert asyncio.run(policy.acall(flaky)) == "ok"
+    assert len(attempts) == 2
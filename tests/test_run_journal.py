@@ -0,0 +1,95 @@
+"""
+Tests for utils/run_journal.py.
+"""
+
+import json
+
+import pytest
+
+from utils.run_journal import RunJournal
+from utils.fallback_text import FallbackText
+
+
+def test_item_status():
+    assert RunJournal.item_status({"question": "Combien font 2 + 2 ?", "answer": "4", "tags": ["maths"]}) == "done"
+    assert RunJournal.item_status({"question": FallbackText("What is 2 + 2?"), "answer": "4"}) == "fallback"
+    assert RunJournal.item_status({"question": "Combien font 2 + 2 ?", "tags": [FallbackText("math")]}) == "fallback"
+
+
+def test_item_status_accepts_text_that_legitimately_stays_the_same():
+    # Proper nouns, IDs and URLs come back unchanged from a successful translation
+    assert RunJournal.item_status({"name": "Alice", "id": "task_042", "url": "https://example.com/a"}) == "done"
+
+
+def test_content_hash_includes_the_context():
+    item = {"question": "Why?"}
+    
+    assert RunJournal.content_hash(item, ["French"]) == RunJournal.content_hash({"question": "Why?"}, ["French"])
+    assert RunJournal.content_hash(item, ["French"]) != RunJournal.content_hash(item, ["German"])
+
+
+def test_resume_reuses_finished_items(tmp_path):
+    path = str(tmp_path / "run.journal.jsonl")
+    with RunJournal(path) as journal:
+        journal.record(0, "h0", "done", {"text": "Bonjour"})
+        journal.record(1, "h1", "fallback", {"text": "Hello"})
+        journal.record(2, "h2", "failed", {"text": "Hi"}, error="timeout")
+    
+    journal = RunJournal(path, resume=True)
+    assert journal.completed(0, "h0")["output"] == {"text": "Bonjour"}
+    assert journal.completed(1, "h1") is not None
+    assert journal.completed(2, "h2") is None
+    # A changed item is translated again
+    assert journal.completed(0, "changed") is None
+    assert journal.indices("failed") == [2]
+    
+    stats = journal.get_stats()
+    assert (stats["loaded"], stats["resumed"], stats["done"], stats["fallback"], stats["failed"]) == (3, 2, 1, 1, 1)
+    journal.close()
+
+
+def test_fallbacks_can_be_retried(tmp_path):
+    path = str(tmp_path / "run.journal.jsonl")
+    with RunJournal(path) as journal:
+        journal.record(0, "h0", "fallback", "Hello")
+    
+    with RunJournal(path, resume=True, retry_fallbacks=True) as journal:
+        assert journal.completed(0, "h0") is None
+
+
+def test_later_entries_override_earlier_ones(tmp_path):
+    path = str(tmp_path / "run.journal.jsonl")
+    with RunJournal(path) as journal:
+        journal.record(0, "h0", "failed", None, error="timeout")
+    with RunJournal(path, resume=True) as journal:
+        journal.record(0, "h0", "done", "Bonjour")
+    
+    with RunJournal(path, resume=True) as journal:
+        assert journal.completed(0, "h0")["output"] == "Bonjour"
+
+
+def test_torn_lines_are_skipped(tmp_path):
+    path = tmp_path / "run.journal.jsonl"
+    entry = {"index": 0, "hash": "h0", "status": "done", "output": "Bonjour"}
+    path.write_text(json.dumps(entry) + "\n" + '{"index": 1, "ha', encoding="utf-8")
+    
+    with RunJournal(str(path), resume=True) as journal:
+        assert journal.completed(0, "h0") is not None
+        assert journal.get_stats()["corrupt_lines"] == 1
+
+
+def test_records_are_buffered_until_flushed(tmp_path):
+    path = tmp_path / "run.journal.jsonl"
+    journal = RunJournal(str(path), flush_interval=10, flush_seconds=3600)
+    
+    journal.record(0, "h0", "done", "Bonjour")
+    assert path.read_text(encoding="utf-8") == ""
+    journal.flush()
+    assert json.loads(path.read_text(encoding="utf-8"))["output"] == "Bonjour"
+    journal.close()
+
+
+def test_unknown_status_is_rejected(tmp_path):
+    with RunJournal(str(tmp_path / "run.journal.jsonl")) as journal:
+        with pytest.raises(ValueError):
+            journal.record(0, "h0", "skipped", None)
@@ -0,0 +1,50 @@
+"""
+Tests for utils/segmenter.py.
+"""
+
+import pytest
+
+from utils.segmenter import DocumentSegmenter
+
+DOCUMENT = (
+    "# Title\n\n"
+    "First paragraph. It has two sentences.\n\n"
+    "```python\nx = 1\n\ny = 2\n```\n\n"
+    "$$\na^2 + b^2 = c^2\n$$\n\n"
+    "Last paragraph with $x. y$ inline math.\n"
+)
+
+
+@pytest.mark.parametrize("max_chunk_chars", [10, 40, 1500])
+def test_pieces_concatenate_to_the_original(max_chunk_chars):
+    pieces = DocumentSegmenter(max_chunk_chars).segment(DOCUMENT)
+    assert "".join(piece for piece, _ in pieces) == DOCUMENT
+
+
+def test_code_and_display_math_are_not_translated():
+    pieces = DocumentSegmenter().segment(DOCUMENT)
+    translatable = [piece for piece, translate in pieces if translate]
+    
+    assert translatable == [
+        "# Title", "First paragraph. It has two sentences.", "Last paragraph with $x. y$ inline math."
+    ]
+
+
+def test_long_paragraphs_are_split_between_sentences():
+    paragraph = "One sentence here. Another sentence here. A third sentence here."
+    pieces = DocumentSegmenter(max_chunk_chars=25).segment(paragraph)
+    
+    assert [piece for piece, translate in pieces if translate] == [
+        "One sentence here.", "Another sentence here.", "A third sentence here."
+    ]
+
+
+def test_inline_math_is_never_split():
+    paragraph = "Consider $a. b$ carefully. Then stop."
+    pieces = DocumentSegmenter(max_chunk_chars=10).segment(paragraph)
+    
+    assert "Consider $a. b$ carefully." in [piece for piece, _ in pieces]
+
+
+def test_empty_document():
+    assert DocumentSegmenter().segment("") == []
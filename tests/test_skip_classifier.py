@@ -0,0 +1,130 @@
+"""
+Tests for utils/skip_classifier.py.
+"""
+
+import time
+
+import pytest
+
+from utils.skip_classifier import SkipClassifier, get_skip_classifier
+
+
+@pytest.fixture
+def classifier():
+    return SkipClassifier()
+
+
+@pytest.mark.parametrize("text, category", [
+    ("42", "number"),
+    ("-3.5", "number"),
+    ("1,000", "number"),
+    ("$50", "number"),
+    ("42 meters", "number"),
+    ("= 42", "number"),
+    ("true", "boolean"),
+    ("null", "boolean"),
+    ("123e4567-e89b-12d3-a456-426614174000", "uuid"),
+    ("https://example.com/a?b=1", "url"),
+    ("user@example.com", "email"),
+    ("src/app/models.py", "path"),
+    ("~/data/", "path"),
+    ("./run.sh", "path"),
+    ("C:\\Users\\me", "path"),
+    ("setup.py", "path"),
+    ("$x^2$", "latex"),
+    ("\\frac{1}{2}", "latex"),
+    ("\\frac{a}{b} \\partial", "latex"),
+    ("\\sqrt{x}", "latex"),
+    ("2 + 3 = 5", "latex"),
+    ("[[M0]] [[M1]].", "latex"),
+    ("IN_PROGRESS", "enum"),
+    ("snake_case", "enum"),
+    ("getUserName", "enum"),
+    ("```py\nx = 1\n```", "code"),
+    ("`x`", "code"),
+    ("np.array", "code"),
+    ("parse_args()", "code"),
+    ("__init__", "code"),
+    ("django__django-11099", "id"),
+    ("ABC-1234", "id"),
+    ("v1.2.3", "id"),
+    ("a3f9c2e", "id"),
+])
+def test_untranslatable_segments_are_classified(classifier, text, category):
+    assert classifier.classify(text) == category
+
+
+@pytest.mark.parametrize("text", [
+    # Prose, answer options and short labels must still be translated
+    "Hello world",
+    "Yes.",
+    "The answer is 42.",
+    "What is 2 + 3?",
+    "Yes/No/Maybe",
+    "input/output/error",
+    "and/or",
+    "None",
+    "True",
+    "OK",
+    "NASA",
+    "DNA",
+    "H2O",
+    "iPhone",
+    "Q1",
+    "camelCase",
+    "e.g",
+    "e.g.",
+    # Commands that wrap prose
+    "\\textbf{Find the area of the triangle}",
+    "\\text{apples}",
+    "\\section{Introduction}",
+    "\\emph{Note}",
+    "\\mbox{for all } \\item",
+    "",
+    "   ",
+])
+def test_prose_is_not_classified(classifier, text):
+    assert classifier.classify(text) is None
+
+
+def test_non_strings_are_not_classified(classifier):
+    assert classifier.classify(None) is None
+    assert classifier.classify(42) is None
+
+
+@pytest.mark.parametrize("text", [
+    "1 " * 8000 + "x y",
+    "a/" * 8000 + "x y",
+    "a." * 8000 + " x",
+    "a-1" * 5000 + " x",
+    "a1" * 8000 + " x",
+])
+def test_long_near_misses_are_linear(classifier, text):
+    start = time.perf_counter()
+    assert classifier.classify(text) is None
+    assert time.perf_counter() - start < 0.2
+
+
+def test_should_skip_counts_per_category(classifier):
+    assert classifier.should_skip("42")
+    assert classifier.should_skip("https://example.com")
+    assert classifier.should_skip("7")
+    assert not classifier.should_skip("Hello world")
+    
+    stats = classifier.get_stats()
+    assert stats["number"] == 2
+    assert stats["url"] == 1
+    assert stats["total"] == 3
+
+
+def test_categories_can_be_restricted():
+    classifier = SkipClassifier(["url"])
+    assert classifier.classify("https://example.com") == "url"
+    assert classifier.classify("IN_PROGRESS") is None
+    
+    with pytest.raises(ValueError):
+        SkipClassifier(["unknown"])
+
+
+def test_shared_classifier_is_a_singleton():
+    assert get_skip_classifier() is get_skip_classifier()
@@ -0,0 +1,97 @@
+"""
+Tests for utils/translation_memory.py.
+"""
+
+import json
+
+import pytest
+
+from utils.translation_memory import TranslationMemory
+
+
+@pytest.fixture
+def memory():
+    return TranslationMemory(":memory:")
+
+
+def test_exact_lookup_ignores_whitespace_and_language_case(memory):
+    memory.add("Open the  attached file.", "添付ファイルを開いてください。", "Japanese")
+    
+    assert memory.lookup_exact("Open the attached file.\n", "japanese") == "添付ファイルを開いてください。"
+    assert memory.lookup_exact("Open the attached file.", "French") is None
+
+
+def test_fuzzy_lookup_finds_near_duplicates(memory):
+    memory.add("Find the population of the largest city in the spreadsheet.", "Trouvez la population.", "French")
+    
+    match = memory.lookup_fuzzy("Find the population of the largest city in this spreadsheet.", "French")
+    assert match is not None
+    source, translation, similarity = match
+    assert source == "Find the population of the largest city in the spreadsheet."
+    assert translation == "Trouvez la population."
+    assert 0.8 <= similarity < 1.0
+
+
+def test_fuzzy_lookup_rejects_unrelated_segments(memory):
+    memory.add("Find the population of the largest city in the spreadsheet.", "Trouvez la population.", "French")
+    assert memory.lookup_fuzzy("Summarize the findings of the report in two sentences.", "French") is None
+
+
+def test_fuzzy_lookup_can_be_disabled():
+    memory = TranslationMemory(":memory:", fuzzy_threshold=1.1)
+    memory.add("Find the population of the largest city.", "Trouvez la population.", "French")
+    
+    assert memory.lookup_fuzzy("Find the population of the largest town.", "French") is None
+    assert memory.lookup_exact("Find the population of the largest city.", "French") == "Trouvez la population."
+
+
+def test_segments_added_after_the_index_was_built_are_found(memory):
+    assert memory.lookup_fuzzy("Search the web for the release date of the album.", "German") is None
+    memory.add("Search the web for the release date of the album.", "Suche im Web.", "German")
+    
+    assert memory.lookup_fuzzy("Search the web for the release date of this album.", "German") is not None
+
+
+def test_lookup_counts_each_outcome(memory):
+    memory.add("Read the first line of the file.", "Lisez la première ligne du fichier.", "French")
+    
+    assert memory.lookup("Read the first line of the file.", "French")[2] == 1.0
+    assert memory.lookup("Read the first line of this file.", "French") is not None
+    assert memory.lookup("Delete nothing.", "French") is None
+    
+    stats = memory.get_stats()
+    assert (stats["exact_hits"], stats["fuzzy_hits"], stats["misses"], stats["stored"]) == (1, 1, 1, 1)
+    assert stats["exact_hit_rate"] == pytest.approx(1 / 3)
+
+
+def test_empty_segments_are_not_stored(memory):
+    memory.add("   ", "x", "French")
+    memory.add("Hello", "", "French")
+    assert memory.get_stats()["stored"] == 0
+
+
+def test_memory_persists_and_reloads_its_index(tmp_path):
+    path = str(tmp_path / "memory.sqlite")
+    TranslationMemory(path).add("Run the tests after every change.", "Lancez les tests.", "French")
+    
+    reopened = TranslationMemory(path)
+    assert reopened.lookup_exact("Run the tests after every change.", "French") == "Lancez les tests."
+    assert reopened.lookup_fuzzy("Run the tests after every change!", "French") is not None
+
+
+def test_num_perm_must_be_a_multiple_of_bands():
+    with pytest.raises(ValueError):
+        TranslationMemory(":memory:", num_perm=30, bands=8)
+
+
+def test_import_files_pairs_strings_by_position(memory, tmp_path):
+    source = [{"question": "What is the capital of France?", "id": "q1", "tags": ["geo", "easy"]}]
+    translated = [{"question": "Quelle est la capitale de la France ?", "id": "q1", "tags": ["géo", "facile"]}]
+    source_file, translated_file = tmp_path / "source.jsonl", tmp_path / "translated.jsonl"
+    source_file.write_text("\n".join(json.dumps(item) for item in source), encoding="utf-8")
+    translated_file.write_text("\n".join(json.dumps(item, ensure_ascii=False) for item in translated), encoding="utf-8")
+    
+    # The unchanged id is skipped
+    assert memory.import_files(str(source_file), str(translated_file), "French") == 3
+    assert memory.lookup_exact("What is the capital of France?", "French") == "Quelle est la capitale de la France ?"
+    assert memory.lookup_exact("q1", "French") is None
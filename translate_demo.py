@@ -19,6 +19,8 @@ from tqdm import tqdm
 from translator.llm_translator import LLMTranslator
 from translator.google_translator import GoogleTranslator
 from translator.hybrid_translator import HybridTranslator
+from translator.hedging import HedgePolicy
+from translator.document_translator import DocumentTranslator
 try:
     from translator.deepl_translator import DeepLTranslator
     DEEPL_AVAILABLE = True
@@ -28,6 +30,7 @@ except ImportError:
 # Import utilities
 from utils.logger import logger
 from utils.prompts_manager import PromptsManager
+from utils.segmenter import DocumentSegmenter
 
 # Load environment variables from .env file
 load_dotenv()
@@ -53,7 +56,8 @@ LANGUAGES = {
     "english": "en"
 }
 
-def initialize_translators(dataset_type: str = DEFAULT_DATASET_TYPE):
+def initialize_translators(dataset_type: str = DEFAULT_DATASET_TYPE, use_cache: bool = True,
+                           hedge: bool = False, pipeline: str = "three_step"):
     """Initialize translator instances based on available API keys."""
     
     # Initialize available translators
@@ -62,6 +66,9 @@ def initialize_translators(dataset_type: str = DEFAULT_DATASET_TYPE):
     deepl_translator = None
     hybrid_translator = None
     
+    # Optionally hedge slow LLM calls to cut tail latency
+    hedge_policy = HedgePolicy() if hedge else None
+    
     # Check for LLM API key
     azure_api_key = os.environ.get("AZURE_OPENAI_API_KEY")
     openai_api_key = os.environ.get("OPENAI_API_KEY")
@@ -77,7 +84,10 @@ def initialize_translators(dataset_type: str = DEFAULT_DATASET_TYPE):
             api_key=azure_api_key,
             api_base=api_base,
             api_version=api_version,
-            dataset_type=dataset_type
+            dataset_type=dataset_type,
+            use_cache=use_cache,
+            hedge_policy=hedge_policy,
+            pipeline=pipeline
         )
     elif openai_api_key:
         # Use regular OpenAI
@@ -86,7 +96,10 @@ def initialize_translators(dataset_type: str = DEFAULT_DATASET_TYPE):
         llm_translator = LLMTranslator(
             model_name=model_name,
             api_key=openai_api_key,
-            dataset_type=dataset_type
+            dataset_type=dataset_type,
+            use_cache=use_cache,
+            hedge_policy=hedge_policy,
+            pipeline=pipeline
         )
     else:
         logger.error("No OpenAI API key found. LLM translation will not be available.")
@@ -268,22 +281,42 @@ def interactive_mode(translators: Dict[str, Any]):
                 save_translation(text, translated, target_language, translator_mode)
         
         print("\n" + "-"*80 + "\n")
+    
+    # Report hedging of slow LLM calls over the session
+    llm_translator = translators.get("llm")
+    if llm_translator and llm_translator.hedge_policy is not None:
+        hedge_stats = llm_translator.hedge_policy.get_stats()
+        print(f"Hedged LLM calls: {hedge_stats['hedged']} / {hedge_stats['calls']} "
+              f"(hedge rate: {hedge_stats['hedge_rate']:.1%}, won: {hedge_stats['hedge_wins']}, "
+              f"saved {hedge_stats['latency_saved']:.1f} seconds)")
 
 @click.command()
 @click.option('--text', '-t', help='Text to translate')
 @click.option('--file', '-f', help='Input file containing text to translate')
-@click.option('--language', '-l', default='Japanese', help='Target language')
+@click.option('--language', '-l', default='Japanese',
+              help='Target language, or a comma-separated list of languages (e.g. Japanese,Hebrew)')
 @click.option('--mode', '-m', default='hybrid', 
               help='Translation mode (hybrid, llm, google, deepl)')
 @click.option('--dataset', '-d', default=DEFAULT_DATASET_TYPE,
               help='Dataset type for prompts (math, gaia, etc.)')
 @click.option('--interactive', '-i', is_flag=True, help='Interactive mode')
 @click.option('--save', '-s', is_flag=True, help='Save translation to file')
-def main(text, file, language, mode, dataset, interactive, save):
+@click.option('--no-cache', is_flag=True, help='Bypass the persistent LLM completion cache')
+@click.option('--hedge', is_flag=True, help='Send a duplicate of LLM calls slower than the recent p95 latency')
+@click.option('--pipeline', default='three_step', type=click.Choice(['three_step', 'fused']),
+              help='LLM pipeline: separate translate/review/correct calls or a single fused call')
+@click.option('--document', is_flag=True,
+              help='Split the text into paragraph/sentence chunks and translate them concurrently')
+@click.option('--context-chunks', default=0, type=int,
+              help='In document mode, neighbouring chunks on each side passed to the LLM as read-only context')
+@click.option('--chunk-chars', default=1500, type=int,
+              help='In document mode, paragraphs longer than this are split into sentence groups')
+def main(text, file, language, mode, dataset, interactive, save, no_cache, hedge, pipeline,
+         document, context_chunks, chunk_chars):
     """Hybrid Translation System Demo CLI."""
     
     # Initialize translators
-    translators = initialize_translators(dataset)
+    translators = initialize_translators(dataset, use_cache=not no_cache, hedge=hedge, pipeline=pipeline)
     
     # Use interactive mode if specified
     if interactive:
@@ -300,6 +333,34 @@ def main(text, file, language, mode, dataset, interactive, save):
         click.echo(main.get_help(click.Context(main)))
         return
     
+    # Translate long documents as concurrently translated chunks
+    if document:
+        translator = translators.get(mode.lower())
+        if not translator:
+            logger.error(f"Translator '{mode}' not available. Please check your API keys.")
+            sys.exit(1)
+        translators = dict(translators)
+        translators[mode.lower()] = DocumentTranslator(
+            translator,
+            segmenter=DocumentSegmenter(max_chunk_chars=chunk_chars),
+            context_chunks=context_chunks
+        )
+    
+    # Translate into several languages at once, analysing the source text only once
+    languages = [l.strip() for l in language.split(',') if l.strip()]
+    if len(languages) > 1:
+        translator = translators.get(mode.lower())
+        if not translator:
+            logger.error(f"Translator '{mode}' not available. Please check your API keys.")
+            sys.exit(1)
+        
+        logger.info(f"Translating text using {mode} translator to {', '.join(languages)}...")
+        for target_language, translated in translator.translate_many(text, languages).items():
+            display_results(text, translated, target_language)
+            if save:
+                save_translation(text, translated, target_language, mode)
+        return
+    
     # Translate text
     translated = translate_text(text, language, mode, translators)
     
@@ -6,13 +6,22 @@ Translator package for the hybrid translation system.
 from .base_translator import BaseTranslator
 from .llm_translator import LLMTranslator
 from .google_translator import GoogleTranslator
+from .retry import RetryPolicy, CompletionError, RetryableCompletionError, FatalCompletionError
+from .deployment_pool import Deployment, DeploymentPool
+from .hedging import HedgePolicy
+from .difficulty import DifficultyScorer
 
 # Try to import DeepL translator if available
 try:
     from .deepl_translator import DeepLTranslator
-    __all__ = ['BaseTranslator', 'LLMTranslator', 'GoogleTranslator', 'DeepLTranslator', 'HybridTranslator']
+    __all__ = ['BaseTranslator', 'LLMTranslator', 'GoogleTranslator', 'DeepLTranslator', 'HybridTranslator',
+               'RetryPolicy', 'CompletionError', 'RetryableCompletionError', 'FatalCompletionError',
+               'Deployment', 'DeploymentPool', 'HedgePolicy', 'DifficultyScorer', 'DocumentTranslator']
 except ImportError:
-    __all__ = ['BaseTranslator', 'LLMTranslator', 'GoogleTranslator', 'HybridTranslator']
+    __all__ = ['BaseTranslator', 'LLMTranslator', 'GoogleTranslator', 'HybridTranslator',
+               'RetryPolicy', 'CompletionError', 'RetryableCompletionError', 'FatalCompletionError',
+               'Deployment', 'DeploymentPool', 'HedgePolicy', 'DifficultyScorer', 'DocumentTranslator']
 
 # Always import hybrid translator last as it depends on the others
-from .hybrid_translator import HybridTranslator
\ No newline at end of file
+from .hybrid_translator import HybridTranslator
+from .document_translator import DocumentTranslator
\ No newline at end of file
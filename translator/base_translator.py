@@ -2,10 +2,15 @@
 Base translator class for all translation implementations.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List, Optional, Dict, Tuple, Any
+from typing import List, Optional, Dict, Tuple, Any, Sequence
 from utils.math_preserver import SimpleMathPreserver
+from utils.code_preserver import CodePreserver
 from utils.logger import logger
+from utils.rate_limiter import RateLimiter, get_rate_limiter
+from utils.skip_classifier import get_skip_classifier
+from utils.fallback_text import FallbackText
 
 class BaseTranslator(ABC):
     """
@@ -13,16 +18,135 @@ class BaseTranslator(ABC):
     Defines the common interface that all translator implementations must follow.
     """
     
-    def __init__(self, use_math_preservation: bool = True):
+    # Default number of texts translated concurrently by abatch_translate()
+    max_concurrency = 16
+    
+    # Whether translate()/atranslate() accept a read-only `context` keyword (see _with_context)
+    supports_context = False
+    
+    def __init__(self, use_math_preservation: bool = True, code_protection: Sequence[str] = ()):
         """
         Initialize the base translator.
         
         Args:
             use_math_preservation: Whether to use math preservation functionality
+            code_protection: Kinds of code spans kept out of translation (see CodePreserver.KINDS)
         """
-        self.use_math_preservation = use_math_preservation
-        if use_math_preservation:
+        # Code spans are carved out through the same placeholders as math
+        self.code_protection = tuple(code_protection)
+        self.use_math_preservation = use_math_preservation or bool(code_protection)
+        if code_protection:
+            self.math_preserver = CodePreserver(code_protection, include_math=use_math_preservation)
+        elif use_math_preservation:
             self.math_preserver = SimpleMathPreserver()
+        
+        # Character quota of machine translation APIs (see _setup_rate_limit)
+        self.rate_limiter = None
+        self.characters_bucket = None
+        
+        # Segments that need no translation are returned unchanged (see _skip)
+        self.skip_classifier = get_skip_classifier()
+    
+    def _setup_rate_limit(self, bucket: str, characters_per_minute: Optional[float],
+                          rate_limiter: Optional[RateLimiter] = None) -> None:
+        """
+        Enable a per-minute character quota for this translator.
+        
+        Args:
+            bucket: Name of the shared bucket holding the quota
+            characters_per_minute: Quota size; no limit is applied if None
+            rate_limiter: Rate limiter to use (defaults to the process-wide shared limiter)
+        """
+        if not characters_per_minute:
+            return
+        
+        self.characters_bucket = bucket
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.rate_limiter.configure(bucket, characters_per_minute)
+    
+    def _skip(self, text: str) -> bool:
+        """
+        Check whether a text needs no translation (a number, ID, URL, path, code, ...).
+        
+        Args:
+            text: Text to check
+            
+        Returns:
+            bool: True if the text should be returned unchanged
+        """
+        return self.skip_classifier.should_skip(text)
+    
+    def _restore_math(self, translation: str, text: str, replacements: Dict[str, str]) -> str:
+        """
+        Restore math expressions in the translation of a text with placeholders.
+        A failed translation (see FallbackText) stays marked as the fallback of the source text.
+        
+        Args:
+            translation: Translation of the text with placeholders
+            text: Source text
+            replacements: Dictionary mapping placeholders to original expressions
+            
+        Returns:
+            str: Translated text with math expressions restored
+        """
+        if isinstance(translation, FallbackText):
+            return FallbackText(text)
+        return self.math_preserver.restore_math(translation, replacements)
+    
+    def _acquire_characters(self, text: str) -> None:
+        """
+        Block until the character quota can cover a request for the given text.
+        
+        Args:
+            text: Text about to be sent to the translation API
+        """
+        if self.rate_limiter is not None and text:
+            self.rate_limiter.acquire({self.characters_bucket: len(text)})
+    
+    @staticmethod
+    def _with_context(prompt: str, context: Optional[str]) -> str:
+        """
+        Prepend surrounding document text to a user prompt as read-only context.
+        
+        Args:
+            prompt: User prompt
+            context: Neighbouring text of the document, or None
+            
+        Returns:
+            str: The prompt, preceded by the context if one is given
+        """
+        if not context:
+            return prompt
+        return (f"Surrounding document text, for reference only. Do not translate it or include it in your answer:\n"
+                f"{context}\n\n---\n\n{prompt}")
+    
+    @staticmethod
+    def _chunk_indices(texts: List[str], max_segments: int, max_characters: int) -> List[List[int]]:
+        """
+        Split a list of texts into request-sized chunks.
+        A text longer than max_characters gets a chunk of its own.
+        
+        Args:
+            texts: Texts to send
+            max_segments: Maximum number of texts per request
+            max_characters: Maximum total number of characters per request
+            
+        Returns:
+            List[List[int]]: Indices of the texts in each chunk, in input order
+        """
+        chunks = []
+        current = []
+        current_characters = 0
+        for index, text in enumerate(texts):
+            if current and (len(current) >= max_segments or current_characters + len(text) > max_characters):
+                chunks.append(current)
+                current = []
+                current_characters = 0
+            current.append(index)
+            current_characters += len(text)
+        if current:
+            chunks.append(current)
+        return chunks
     
     @abstractmethod
     def translate(self, text: str, target_language: str) -> str:
@@ -51,4 +175,71 @@ class BaseTranslator(ABC):
         Returns:
             List[str]: List of translated texts
         """
-        return [self.translate(text, target_language) for text in texts]
\ No newline at end of file
+        return [self.translate(text, target_language) for text in texts]
+    
+    def translate_many(self, text: str, target_languages: List[str]) -> Dict[str, str]:
+        """
+        Translate one text into several target languages.
+        Default implementation calls translate() for each language.
+        Subclasses can override this to analyse the source text only once.
+        
+        Args:
+            text: Text to translate
+            target_languages: Target language codes or names
+            
+        Returns:
+            Dict[str, str]: Translated text by target language
+        """
+        return {language: self.translate(text, language) for language in target_languages}
+    
+    async def atranslate(self, text: str, target_language: str) -> str:
+        """
+        Translate text without blocking the event loop.
+        Default implementation runs translate() in the loop's default executor.
+        Subclasses with a native async client should override this.
+        
+        Args:
+            text: Text to translate
+            target_language: Target language code or name
+            
+        Returns:
+            str: Translated text
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.translate, text, target_language)
+    
+    async def abatch_translate(self, texts: List[str], target_language: str,
+                               max_concurrency: Optional[int] = None) -> List[str]:
+        """
+        Translate a batch of texts concurrently.
+        The number of texts in flight is bounded by a semaphore.
+        
+        Args:
+            texts: List of texts to translate
+            target_language: Target language code or name
+            max_concurrency: Maximum number of concurrent translations (defaults to self.max_concurrency)
+            
+        Returns:
+            List[str]: List of translated texts, in input order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+        
+        async def translate_one(text: str) -> str:
+            async with semaphore:
+                return await self.atranslate(text, target_language)
+        
+        return list(await asyncio.gather(*(translate_one(text) for text in texts)))
+    
+    async def atranslate_many(self, text: str, target_languages: List[str]) -> Dict[str, str]:
+        """
+        Translate one text into several target languages concurrently.
+        
+        Args:
+            text: Text to translate
+            target_languages: Target language codes or names
+            
+        Returns:
+            Dict[str, str]: Translated text by target language
+        """
+        translations = await asyncio.gather(*(self.atranslate(text, language) for language in target_languages))
+        return dict(zip(target_languages, translations))
\ No newline at end of file
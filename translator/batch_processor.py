@@ -5,7 +5,10 @@ Batch processor for translating large datasets efficiently.
 import os
 import json
 import time
-from typing import List, Dict, Any, Optional
+import asyncio
+import threading
+import contextlib
+from typing import List, Dict, Any, Optional, Iterable, Tuple, Set
 from tqdm import tqdm
 import concurrent.futures
 
@@ -13,7 +16,15 @@ from .hybrid_translator import HybridTranslator
 from .deepl_translator import DeepLTranslator
 from .google_translator import GoogleTranslator
 from .llm_translator import LLMTranslator
+from .difficulty import DifficultyScorer
 from utils.logger import logger
+from utils.code_preserver import DATASET_CODE_PROTECTION
+from utils.json_stream import iter_json_items, JsonItemWriter
+from utils.run_journal import RunJournal
+from utils.fallback_text import FallbackText
+from utils.reorder_buffer import ReorderBuffer
+from utils.translation_memory import TranslationMemory
+from utils.skip_classifier import get_skip_classifier
 
 class BatchProcessor:
     """
@@ -28,7 +39,19 @@ class BatchProcessor:
         use_google: bool = False,
         max_workers: int = 4,
         azure_model: str = "azure/attack-gpt4o",
-        openai_model: str = "gpt-4o"
+        openai_model: str = "gpt-4o",
+        use_cache: bool = True,
+        use_async: bool = False,
+        max_concurrency: int = 64,
+        pack_short_texts: bool = False,
+        target_languages: Optional[List[str]] = None,
+        difficulty_routing: bool = False,
+        translation_memory: Optional[TranslationMemory] = None,
+        deduplicate: bool = False,
+        stream_window: Optional[int] = None,
+        journal: Optional[RunJournal] = None,
+        preserve_order: bool = True,
+        field_scheduling: bool = False
     ):
         """
         Initialize the batch processor.
@@ -40,24 +63,70 @@ class BatchProcessor:
             max_workers: Maximum number of parallel workers
             azure_model: Azure OpenAI model name to use if available
             openai_model: OpenAI model name to use as fallback
+            use_cache: Whether to reuse LLM completions from the persistent cache
+            use_async: Whether to translate on the asyncio path instead of a thread pool
+            max_concurrency: Maximum number of items in flight on the asyncio path
+            pack_short_texts: Whether short string fields of an item are translated together
+                in packed LLM requests (thread pool path only)
+            target_languages: Several target languages to translate the dataset into in one run
+                (overrides target_language; see process_batch_many())
+            difficulty_routing: Whether easy segments skip LLM enhancement or checks based on a local
+                difficulty score (see translator/difficulty.py)
+            translation_memory: Memory of earlier translations reused for exact and similar segments
+            deduplicate: Whether each distinct string of a batch is translated only once and its
+                translation reused at every place it occurs (see _plan_leaves())
+            stream_window: Maximum number of items read ahead and in flight when streaming a file
+                (defaults to 4 x max_workers, or max_concurrency on the asyncio path)
+            journal: Run journal recording each finished item; items it already holds are reused
+                instead of translated again (see utils/run_journal.py)
+            preserve_order: Whether a streamed file is written in input order; results that finish early
+                wait in a reorder buffer bounded by stream_window (otherwise they are written as they finish)
+            field_scheduling: Whether a batch is split into individual string fields scheduled from one
+                global longest-first queue, instead of one worker translating each item's fields in sequence
+                (see _process_fields())
         """
         self.dataset_type = dataset_type
-        self.target_language = target_language
+        self.target_languages = list(target_languages or [target_language])
+        self.target_language = self.target_languages[0]
         self.use_google = use_google
         self.max_workers = max_workers
         self.azure_model = azure_model
         self.openai_model = openai_model
+        self.use_cache = use_cache
+        self.use_async = use_async
+        self.max_concurrency = max_concurrency
+        self.pack_short_texts = pack_short_texts
+        self.difficulty_routing = difficulty_routing
+        self.translation_memory = translation_memory
+        self.deduplicate = deduplicate
+        self.stream_window = stream_window
+        self.journal = journal
+        self.preserve_order = preserve_order
+        self.field_scheduling = field_scheduling
+        
+        if deduplicate and journal is not None:
+            logger.warning("Deduplication is not combined with a run journal. Items are translated one by one.")
         
         # Create translator
         self.translator = self._setup_translator()
         
+        # Leaves that need no translation (numbers, IDs, URLs, code, ...) are kept as is
+        self.skip_classifier = get_skip_classifier()
+        
         # Statistics
         self.stats = {
             "total_items": 0,
             "successful": 0,
             "failed": 0,
             "start_time": None,
-            "end_time": None
+            "end_time": None,
+            "leaves": 0,
+            "unique_leaves": 0,
+            "failed_leaves": 0,
+            "resumed": 0,
+            "fields": 0,
+            "failed_fields": 0,
+            "busy_seconds": 0.0
         }
     
     def _setup_translator(self) -> HybridTranslator:
@@ -81,25 +150,31 @@ class BatchProcessor:
                 api_key=azure_key,
                 api_base=os.getenv('AZURE_OPENAI_API_BASE', "https://llm-sec.openai.azure.com/"),
                 api_version=os.getenv('AZURE_OPENAI_API_VERSION', "2024-08-01-preview"),
-                dataset_type=self.dataset_type
+                dataset_type=self.dataset_type,
+                use_cache=self.use_cache,
+                packing=self.pack_short_texts
             )
         else:
             # Fall back to OpenAI
             llm_translator = LLMTranslator(
                 model_name=self.openai_model,
                 api_key=openai_key,
-                dataset_type=self.dataset_type
+                dataset_type=self.dataset_type,
+                use_cache=self.use_cache,
+                packing=self.pack_short_texts
             )
         
         # Configure machine translator
         use_math_preservation = (self.dataset_type == 'math' or self.dataset_type == 'swe-bench')
+        code_protection = DATASET_CODE_PROTECTION.get(self.dataset_type, ())
         
         if self.use_google:
             # Google Translate
             google_creds = os.getenv('GOOGLE_APPLICATION_CREDENTIALS')
             machine_translator = GoogleTranslator(
                 api_key_path=google_creds,
-                use_math_preservation=use_math_preservation
+                use_math_preservation=use_math_preservation,
+                code_protection=code_protection
             )
         else:
             # DeepL
@@ -111,7 +186,8 @@ class BatchProcessor:
             
             machine_translator = DeepLTranslator(
                 auth_key=deepl_key,
-                use_math_preservation=use_math_preservation
+                use_math_preservation=use_math_preservation,
+                code_protection=code_protection
             )
         
         # Create and return hybrid translator
@@ -119,7 +195,9 @@ class BatchProcessor:
             deepl_translator=None if self.use_google else machine_translator,
             google_translator=machine_translator if self.use_google else None,
             llm_translator=llm_translator,
-            dataset_type=self.dataset_type
+            dataset_type=self.dataset_type,
+            difficulty_scorer=DifficultyScorer(self.dataset_type) if self.difficulty_routing else None,
+            translation_memory=self.translation_memory
         )
     
     def _translate_item(self, item: Dict[str, Any]) -> Dict[str, Any]:
@@ -134,14 +212,26 @@ class BatchProcessor:
         """
         translated_item = {}
         
+        # String fields to translate; the others are kept as is
+        keys = [key for key, value in item.items() if isinstance(value, str) and self._is_translatable(value)]
+        
+        # Translate the string fields together so short ones can share packed LLM requests
+        packed = {}
+        if self.pack_short_texts:
+            translations = self._translate_strings([item[key] for key in keys])
+            if translations is not None:
+                packed = dict(zip(keys, translations))
+        
         for key, value in item.items():
-            if isinstance(value, str) and len(value.strip()) > 0:
+            if key in packed:
+                translated_item[key] = packed[key]
+            elif key in keys:
                 # Translate string values
                 try:
                     translated_item[key] = self.translator.translate(value, self.target_language)
                 except Exception as e:
                     logger.error(f"Error translating field '{key}': {e}")
-                    translated_item[key] = value  # Use original value on error
+                    translated_item[key] = FallbackText(value)  # Use original value on error
             elif isinstance(value, dict):
                 # Recursively translate nested dictionaries
                 translated_item[key] = self._translate_item(value)
@@ -164,16 +254,22 @@ class BatchProcessor:
         Returns:
             List[Any]: Translated list
         """
+        # Lists of strings (e.g. answer options) are translated together in packed LLM requests
+        if self.pack_short_texts and len(items) > 1 and all(isinstance(item, str) for item in items):
+            translations = self._translate_strings(items)
+            if translations is not None:
+                return translations
+        
         translated_list = []
         
         for item in items:
-            if isinstance(item, str) and len(item.strip()) > 0:
+            if isinstance(item, str) and self._is_translatable(item):
                 # Translate string values
                 try:
                     translated_list.append(self.translator.translate(item, self.target_language))
                 except Exception as e:
                     logger.error(f"Error translating list item: {e}")
-                    translated_list.append(item)  # Use original value on error
+                    translated_list.append(FallbackText(item))  # Use original value on error
             elif isinstance(item, dict):
                 # Recursively translate dictionaries
                 translated_list.append(self._translate_item(item))
@@ -186,98 +282,1213 @@ class BatchProcessor:
         
         return translated_list
     
-    def process_batch(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _translate_strings(self, texts: List[str]) -> Optional[List[str]]:
         """
-        Process a batch of items for translation.
+        Translate several strings with one batch_translate() call.
+        
+        Args:
+            texts: Strings to translate
+            
+        Returns:
+            Optional[List[str]]: Translations in input order, or None if the batch failed
+        """
+        if len(texts) < 2:
+            return None
+        
+        try:
+            return self.translator.batch_translate(texts, self.target_language)
+        except Exception as e:
+            logger.error(f"Error translating packed strings: {e}")
+            return None
+    
+    def _is_translatable(self, text: str) -> bool:
+        """
+        Check whether a string leaf needs translation.
+        Empty strings and segments the skip classifier recognizes (numbers, IDs, URLs,
+        paths, code, ...) are kept as is without any machine translation or LLM call.
+        
+        Args:
+            text: String leaf
+            
+        Returns:
+            bool: True if the leaf should be translated
+        """
+        return len(text.strip()) > 0 and not self.skip_classifier.should_skip(text)
+    
+    @staticmethod
+    def _leaf_key(text: str) -> str:
+        """Get the key under which identical string leaves are translated once (the text without surrounding whitespace)."""
+        return text.strip()
+    
+    def _collect_leaves(self, value: Any, leaves: Dict[str, str]) -> int:
+        """
+        Collect the translatable string leaves of a JSON value.
+        
+        Args:
+            value: String, dictionary, list or scalar
+            leaves: Unique leaves found so far, keyed and valued by their stripped text, updated in place
+            
+        Returns:
+            int: Number of translatable string leaves in the value, duplicates included
+        """
+        if isinstance(value, str):
+            if not self._is_translatable(value):
+                return 0
+            key = self._leaf_key(value)
+            leaves.setdefault(key, key)
+            return 1
+        elif isinstance(value, dict):
+            return sum(self._collect_leaves(v, leaves) for v in value.values())
+        elif isinstance(value, list):
+            return sum(self._collect_leaves(v, leaves) for v in value)
+        return 0
+    
+    def _scatter(self, value: Any, translations: Dict[str, Any]) -> Any:
+        """
+        Rebuild a JSON value with every string leaf replaced by the translation of its text.
+        Each leaf keeps its own leading and trailing whitespace; a leaf whose translation
+        failed keeps its source text, still marked as a FallbackText.
+        
+        Args:
+            value: String, dictionary, list or scalar
+            translations: Translations by stripped text
+            
+        Returns:
+            Any: Translated value with the same structure
+        """
+        if isinstance(value, str):
+            key = self._leaf_key(value)
+            if not key or key not in translations:
+                return value
+            if isinstance(translations[key], FallbackText):
+                return FallbackText(value)
+            leading = value[:len(value) - len(value.lstrip())]
+            trailing = value[len(value.rstrip()):]
+            return leading + translations[key] + trailing
+        elif isinstance(value, dict):
+            return {key: self._scatter(v, translations) for key, v in value.items()}
+        elif isinstance(value, list):
+            return [self._scatter(v, translations) for v in value]
+        return value
+    
+    def _plan_leaves(self, data: List[Any]) -> Tuple[Dict[str, str], List[List[str]]]:
+        """
+        Planning pass of a deduplicated run: collect the distinct strings of the whole batch.
+        Category labels, answer options and repeated prompts then cost one translation each.
+        
+        Args:
+            data: List of items to translate
+            
+        Returns:
+            Tuple[Dict[str, str], List[List[str]]]: Distinct strings to translate, stripped of surrounding
+                whitespace, and the strings of each item (to tell which items a failed string affects)
+        """
+        leaves = {}
+        item_keys = []
+        total = 0
+        for item in data:
+            item_leaves = {}
+            total += self._collect_leaves(item, item_leaves)
+            item_keys.append(list(item_leaves))
+            for key, text in item_leaves.items():
+                leaves.setdefault(key, text)
+        
+        self.stats["leaves"] = total
+        self.stats["unique_leaves"] = len(leaves)
+        logger.info(f"Planned {len(leaves)} distinct strings for {total} string leaves in {len(data)} items")
+        return leaves, item_keys
+    
+    @staticmethod
+    def _fell_back(translation: Any) -> bool:
+        """
+        Check whether the translation of a string failed in any target language
+        (the translators then return the source text as a FallbackText).
+        
+        Args:
+            translation: Translation of a string, or its translations by target language
+            
+        Returns:
+            bool: True if the string was not translated
+        """
+        return FallbackText.contains(translation)
+    
+    def _count_deduplicated(self, item_keys: List[List[str]], failed_keys: Set[str]) -> None:
+        """
+        Count the items of a deduplicated run: an item failed if any of its strings failed.
+        
+        Args:
+            item_keys: Stripped texts of each item (see _plan_leaves())
+            failed_keys: Stripped texts whose translation raised or fell back to the source
+        """
+        failed = sum(1 for keys in item_keys if any(key in failed_keys for key in keys))
+        self.stats["failed_leaves"] = len(failed_keys)
+        self.stats["failed"] = failed
+        self.stats["successful"] = len(item_keys) - failed
+    
+    def _journal_hash(self, item: Any) -> str:
+        """Hash an item for the run journal, together with the run's target languages."""
+        return RunJournal.content_hash(item, self.target_languages)
+    
+    def _resumed_outputs(self, data: List[Any]) -> Dict[int, Any]:
+        """
+        Get the outputs of the items the run journal already holds.
+        
+        Args:
+            data: List of items to translate
+            
+        Returns:
+            Dict[int, Any]: Journaled outputs by item index (empty without a journal)
+        """
+        if self.journal is None:
+            return {}
+        
+        resumed = {}
+        for idx, item in enumerate(data):
+            entry = self.journal.completed(idx, self._journal_hash(item))
+            if entry is not None:
+                resumed[idx] = entry["output"]
+        
+        self.stats["resumed"] = len(resumed)
+        if resumed:
+            logger.info(f"Resuming run: {len(resumed)} of {len(data)} items taken from the journal")
+        return resumed
+    
+    def _journal_record(self, idx: int, item: Any, translated_item: Any, error: Optional[Exception] = None) -> None:
+        """
+        Record the outcome of an item in the run journal, if any.
+        
+        Args:
+            idx: Index of the item in the input
+            item: Source item
+            translated_item: Output of the item (the fallback output if it failed)
+            error: Error that made the item fail
+        """
+        if self.journal is None:
+            return
+        
+        # With several target languages the output holds every language, so any fallback counts
+        status = "failed" if error is not None else RunJournal.item_status(translated_item)
+        
+        self.journal.record(idx, self._journal_hash(item), status, translated_item,
+                            error=str(error) if error is not None else None)
+    
+    def _collect_fields(self, value: Any, path: tuple, fields: List[Tuple[tuple, str]]) -> None:
+        """
+        Collect the translatable string leaves of a JSON value with their paths.
+        
+        Args:
+            value: String, dictionary, list or scalar
+            path: Path of the value (dictionary keys and list indices)
+            fields: Found (path, text) pairs, updated in place
+        """
+        if isinstance(value, str):
+            if self._is_translatable(value):
+                fields.append((path, value))
+        elif isinstance(value, dict):
+            for key, v in value.items():
+                self._collect_fields(v, path + (key,), fields)
+        elif isinstance(value, list):
+            for i, v in enumerate(value):
+                self._collect_fields(v, path + (i,), fields)
+    
+    def _assemble(self, value: Any, results: Dict[tuple, Any], path: tuple = ()) -> Any:
+        """
+        Rebuild a JSON value with the string leaves at the given paths replaced.
+        
+        Args:
+            value: String, dictionary, list or scalar
+            results: Replacement values by path
+            path: Path of the value
+            
+        Returns:
+            Any: Value with the same structure
+        """
+        if path in results:
+            return results[path]
+        elif isinstance(value, dict):
+            return {key: self._assemble(v, results, path + (key,)) for key, v in value.items()}
+        elif isinstance(value, list):
+            return [self._assemble(v, results, path + (i,)) for i, v in enumerate(value)]
+        return value
+    
+    def _plan_fields(self, data: List[Any], resumed: Dict[int, Any]) -> List[Tuple[int, tuple, str]]:
+        """
+        Flatten a batch into field translation tasks, longest text first.
+        Starting the longest fields first keeps a few long fields from running alone at the end of the batch.
+        
+        Args:
+            data: List of items to translate
+            resumed: Outputs of items finished by an earlier run, which are skipped
+            
+        Returns:
+            List[Tuple[int, tuple, str]]: (item index, JSON path, text) tasks in scheduling order
+        """
+        tasks = []
+        for idx, item in enumerate(data):
+            if idx in resumed:
+                continue
+            fields = []
+            self._collect_fields(item, (), fields)
+            tasks.extend((idx, path, text) for path, text in fields)
+        
+        tasks.sort(key=lambda task: len(task[2]), reverse=True)
+        self.stats["fields"] = len(tasks)
+        self.stats["failed_fields"] = 0
+        logger.info(f"Scheduled {len(tasks)} fields of {len(data) - len(resumed)} items, longest first")
+        return tasks
+    
+    def _print_stats(self) -> None:
+        """Print statistics of the last batch run."""
+        duration = self.stats["end_time"] - self.stats["start_time"]
+        
+        print(f"\nBatch processing completed:")
+        print(f"  Total items: {self.stats['total_items']}")
+        print(f"  Successfully translated: {self.stats['successful']}")
+        print(f"  Failed: {self.stats['failed']}")
+        print(f"  Duration: {duration:.2f} seconds")
+        print(f"  Average time per item: {duration / max(self.stats['total_items'], 1):.2f} seconds")
+        
+        if self.stats["busy_seconds"] and duration > 0:
+            workers = self.max_concurrency if self.use_async else self.max_workers
+            print(f"  Worker utilization: {self.stats['busy_seconds'] / (workers * duration):.1%} "
+                  f"({self.stats['busy_seconds']:.1f} busy seconds over {workers} workers)")
+        
+        if self.field_scheduling:
+            print(f"  Fields scheduled: {self.stats['fields']} ({self.stats['failed_fields']} failed)")
+        
+        skip_stats = self.skip_classifier.get_stats()
+        if skip_stats["total"]:
+            categories = ", ".join(f"{category}: {count}" for category, count in skip_stats.items()
+                                   if category != "total" and count)
+            print(f"  Untranslatable segments kept as is: {skip_stats['total']} ({categories})")
+        
+        if self.journal is not None:
+            journal_stats = self.journal.get_stats()
+            print(f"  Resumed from journal: {self.stats['resumed']} items "
+                  f"({journal_stats['fallback']} fallback, {journal_stats['failed']} failed items journaled)")
+        
+        if self.deduplicate and self.journal is None:
+            leaves = self.stats["leaves"]
+            unique_leaves = self.stats["unique_leaves"]
+            print(f"  Deduplicated strings: {unique_leaves} translated for {leaves} string leaves "
+                  f"(dedup ratio: {1 - unique_leaves / max(leaves, 1):.1%}, {self.stats['failed_leaves']} failed)")
+        
+        llm_cache = self.translator.llm_translator.cache
+        if llm_cache is not None:
+            cache_stats = llm_cache.get_stats()
+            print(f"  LLM cache hits: {cache_stats['hits']} / misses: {cache_stats['misses']} "
+                  f"(hit rate: {cache_stats['hit_rate']:.1%})")
+        
+        deployment_pool = self.translator.llm_translator.deployment_pool
+        if len(deployment_pool.deployments) > 1:
+            for name, deployment_stats in deployment_pool.get_stats().items():
+                print(f"  Deployment {name}: {deployment_stats['calls']} calls, "
+                      f"{deployment_stats['failures']} failures, {deployment_stats['ejections']} ejections")
+        
+        difficulty_scorer = self.translator.difficulty_scorer
+        if difficulty_scorer is not None:
+            tier_stats = difficulty_scorer.get_stats()
+            print(f"  Difficulty tiers: {tier_stats['mt_only']} MT only, {tier_stats['mt_enhance']} MT + enhancement, "
+                  f"{tier_stats['full']} full pipeline")
+        
+        if self.translation_memory is not None:
+            memory_stats = self.translation_memory.get_stats()
+            print(f"  Translation memory: {memory_stats['exact_hits']} exact / {memory_stats['fuzzy_hits']} fuzzy hits, "
+                  f"{memory_stats['misses']} misses (exact hit rate: {memory_stats['exact_hit_rate']:.1%}, "
+                  f"fuzzy hit rate: {memory_stats['fuzzy_hit_rate']:.1%})")
+        
+        if self.pack_short_texts:
+            packing_stats = self.translator.llm_translator.get_packing_stats()
+            print(f"  Packed LLM items: {packing_stats['packed_items']} in {packing_stats['packed_calls']} calls "
+                  f"({packing_stats['calls_per_item']:.2f} calls per item, {packing_stats['splits']} splits, "
+                  f"{packing_stats['fallbacks']} translated individually)")
+        
+        hedge_policy = self.translator.llm_translator.hedge_policy
+        if hedge_policy is not None:
+            hedge_stats = hedge_policy.get_stats()
+            print(f"  Hedged LLM calls: {hedge_stats['hedged']} / {hedge_stats['calls']} "
+                  f"(hedge rate: {hedge_stats['hedge_rate']:.1%}, won: {hedge_stats['hedge_wins']}, "
+                  f"saved {hedge_stats['latency_saved']:.1f} seconds)")
+        
+        rate_limiter = self.translator.llm_translator.rate_limiter
+        if rate_limiter is not None:
+            limiter_stats = rate_limiter.get_stats()
+            print(f"  Rate-limited calls: {limiter_stats['throttled']} / {limiter_stats['acquired']} "
+                  f"(waited {limiter_stats['wait_seconds']:.1f} seconds)")
+    
+    async def _atranslate_value(self, value: Any) -> Any:
+        """
+        Translate a JSON value on the async path.
+        All string leaves of the value are translated concurrently.
+        
+        Args:
+            value: String, dictionary, list or scalar to translate
+            
+        Returns:
+            Any: Translated value with the same structure
+        """
+        if isinstance(value, str) and self._is_translatable(value):
+            try:
+                return await self.translator.atranslate(value, self.target_language)
+            except Exception as e:
+                logger.error(f"Error translating value: {e}")
+                return FallbackText(value)  # Use original value on error
+        elif isinstance(value, dict):
+            keys = list(value.keys())
+            translated = await asyncio.gather(*(self._atranslate_value(value[key]) for key in keys))
+            return dict(zip(keys, translated))
+        elif isinstance(value, list):
+            return list(await asyncio.gather(*(self._atranslate_value(v) for v in value)))
+        else:
+            # Keep non-string values as is
+            return value
+    
+    def _translate_value_many(self, value: Any) -> Dict[str, Any]:
+        """
+        Translate a JSON value into every target language.
+        Each string leaf is analysed once and translated into all languages together.
+        
+        Args:
+            value: String, dictionary, list or scalar to translate
+            
+        Returns:
+            Dict[str, Any]: Translated value with the same structure, by target language
+        """
+        if isinstance(value, str) and self._is_translatable(value):
+            try:
+                return self.translator.translate_many(value, self.target_languages)
+            except Exception as e:
+                logger.error(f"Error translating value: {e}")
+                return {language: FallbackText(value) for language in self.target_languages}
+        elif isinstance(value, dict):
+            translated = {key: self._translate_value_many(v) for key, v in value.items()}
+            return {
+                language: {key: translated[key][language] for key in value}
+                for language in self.target_languages
+            }
+        elif isinstance(value, list):
+            translated = [self._translate_value_many(v) for v in value]
+            return {
+                language: [t[language] for t in translated]
+                for language in self.target_languages
+            }
+        else:
+            # Keep non-string values as is
+            return {language: value for language in self.target_languages}
+    
+    async def _atranslate_value_many(self, value: Any) -> Dict[str, Any]:
+        """
+        Async version of _translate_value_many().
+        All string leaves of the value are translated concurrently.
+        
+        Args:
+            value: String, dictionary, list or scalar to translate
+            
+        Returns:
+            Dict[str, Any]: Translated value with the same structure, by target language
+        """
+        if isinstance(value, str) and self._is_translatable(value):
+            try:
+                return await self.translator.atranslate_many(value, self.target_languages)
+            except Exception as e:
+                logger.error(f"Error translating value: {e}")
+                return {language: FallbackText(value) for language in self.target_languages}
+        elif isinstance(value, dict):
+            keys = list(value.keys())
+            translated = dict(zip(keys, await asyncio.gather(*(self._atranslate_value_many(value[key]) for key in keys))))
+            return {
+                language: {key: translated[key][language] for key in keys}
+                for language in self.target_languages
+            }
+        elif isinstance(value, list):
+            translated = await asyncio.gather(*(self._atranslate_value_many(v) for v in value))
+            return {
+                language: [t[language] for t in translated]
+                for language in self.target_languages
+            }
+        else:
+            return {language: value for language in self.target_languages}
+    
+    async def _aprocess_items(self, data: List[Dict[str, Any]], atranslate_item, fallback) -> List[Any]:
+        """
+        Translate items concurrently on the asyncio path.
+        
+        Args:
+            data: List of items to translate
+            atranslate_item: Coroutine function translating one item
+            fallback: Function giving the result for an item whose translation failed
+            
+        Returns:
+            List[Any]: Translated items, in input order
+        """
+        self.stats["total_items"] = len(data)
+        self.stats["successful"] = 0
+        self.stats["failed"] = 0
+        self.stats["start_time"] = time.time()
+        
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        resumed = self._resumed_outputs(data)
+        
+        with tqdm(total=len(data), desc="Translating items") as pbar:
+            async def process_item(idx: int, item: Dict[str, Any]) -> Any:
+                if idx in resumed:
+                    pbar.update(1)
+                    return resumed[idx]
+                async with semaphore:
+                    try:
+                        translated_item = await atranslate_item(item)
+                        self._journal_record(idx, item, translated_item)
+                        self.stats["successful"] += 1
+                    except Exception as e:
+                        logger.error(f"Error processing item {idx}: {e}")
+                        # Use original item on error
+                        translated_item = fallback(item)
+                        self._journal_record(idx, item, translated_item, error=e)
+                        self.stats["failed"] += 1
+                    pbar.update(1)
+                    return translated_item
+            
+            translated_data = await asyncio.gather(*(process_item(i, item) for i, item in enumerate(data)))
+        
+        if self.journal is not None:
+            self.journal.flush()
+        self.stats["end_time"] = time.time()
+        self._print_stats()
+        
+        return list(translated_data)
+    
+    async def aprocess_batch(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Process a batch of items for translation on the asyncio path.
+        Items are scheduled concurrently; the number of items in flight is bounded
+        by max_concurrency and the number of LLM calls by the LLM translator's semaphore.
         
         Args:
             data: List of items to translate
             
         Returns:
-            List[Dict[str, Any]]: Translated items
+            List[Dict[str, Any]]: Translated items, in input order
+        """
+        if self.deduplicate and self.journal is None:
+            translations = await self._aprocess_deduplicated(
+                data, lambda text: self.translator.atranslate(text, self.target_language), FallbackText
+            )
+            return [self._scatter(item, translations) for item in data]
+        
+        if self.field_scheduling:
+            return await self._aprocess_fields(
+                data, lambda text: self.translator.atranslate(text, self.target_language), FallbackText,
+                self._assemble
+            )
+        
+        return await self._aprocess_items(data, self._atranslate_value, lambda item: item)
+    
+    def _process_items(self, data: List[Dict[str, Any]], translate_item, fallback) -> List[Any]:
+        """
+        Translate items on the thread pool (or sequentially with a single worker).
+        
+        Args:
+            data: List of items to translate
+            translate_item: Function translating one item
+            fallback: Function giving the result for an item whose translation failed
+            
+        Returns:
+            List[Any]: Translated items, in input order
         """
         self.stats["total_items"] = len(data)
         self.stats["successful"] = 0
         self.stats["failed"] = 0
+        self.stats["busy_seconds"] = 0.0
         self.stats["start_time"] = time.time()
         
-        translated_data = []
+        # Results are stored at their input index, whatever order they finish in
+        resumed = self._resumed_outputs(data)
+        translated_data = [resumed.get(idx) for idx in range(len(data))]
         
         # Use a progress bar to show translation progress
         with tqdm(total=len(data), desc="Translating items") as pbar:
-            # Limit the number of parallel workers based on LLM API rate limits
+            pbar.update(len(resumed))
+            
+            # Request, token and character budgets are enforced by the shared rate limiter
+            # (see utils/rate_limiter.py); max_workers only bounds the number of threads
             if self.max_workers > 1:
+                busy_lock = threading.Lock()
+                
+                def timed_translate_item(item: Any) -> Any:
+                    start = time.time()
+                    try:
+                        return translate_item(item)
+                    finally:
+                        with busy_lock:
+                            self.stats["busy_seconds"] += time.time() - start
+                
                 # Use parallel processing
                 with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-                    future_to_idx = {executor.submit(self._translate_item, item): i 
-                                     for i, item in enumerate(data)}
+                    future_to_idx = {executor.submit(timed_translate_item, item): i 
+                                     for i, item in enumerate(data) if i not in resumed}
                     
                     for future in concurrent.futures.as_completed(future_to_idx):
                         idx = future_to_idx[future]
                         try:
-                            translated_item = future.result()
-                            translated_data.append(translated_item)
+                            translated_data[idx] = future.result()
+                            self._journal_record(idx, data[idx], translated_data[idx])
                             self.stats["successful"] += 1
                         except Exception as e:
                             logger.error(f"Error processing item {idx}: {e}")
                             # Use original item on error
-                            translated_data.append(data[idx])
+                            translated_data[idx] = fallback(data[idx])
+                            self._journal_record(idx, data[idx], translated_data[idx], error=e)
                             self.stats["failed"] += 1
                         
                         pbar.update(1)
             else:
                 # Use sequential processing
-                for item in data:
+                for idx, item in enumerate(data):
+                    if idx in resumed:
+                        continue
+                    
                     try:
-                        translated_item = self._translate_item(item)
-                        translated_data.append(translated_item)
+                        translated_data[idx] = translate_item(item)
+                        self._journal_record(idx, item, translated_data[idx])
                         self.stats["successful"] += 1
                     except Exception as e:
                         logger.error(f"Error processing item: {e}")
                         # Use original item on error
-                        translated_data.append(item)
+                        translated_data[idx] = fallback(item)
+                        self._journal_record(idx, item, translated_data[idx], error=e)
                         self.stats["failed"] += 1
                     
                     pbar.update(1)
         
+        if self.journal is not None:
+            self.journal.flush()
         self.stats["end_time"] = time.time()
-        duration = self.stats["end_time"] - self.stats["start_time"]
+        self._print_stats()
         
-        # Print statistics
-        print(f"\nBatch processing completed:")
-        print(f"  Total items: {self.stats['total_items']}")
-        print(f"  Successfully translated: {self.stats['successful']}")
-        print(f"  Failed: {self.stats['failed']}")
-        print(f"  Duration: {duration:.2f} seconds")
-        print(f"  Average time per item: {duration / self.stats['total_items']:.2f} seconds")
+        return translated_data
+    
+    def _process_deduplicated(self, data: List[Any], translate_text, fallback) -> Dict[str, Any]:
+        """
+        Translate every distinct string of a batch once on the thread pool.
+        Each distinct text is submitted a single time, so duplicates are never in flight together.
+        
+        Args:
+            data: List of items to translate
+            translate_text: Function translating one string
+            fallback: Function giving the result for a string whose translation failed
+            
+        Returns:
+            Dict[str, Any]: Translations by stripped text (see _scatter())
+        """
+        self.stats["total_items"] = len(data)
+        self.stats["successful"] = 0
+        self.stats["failed"] = 0
+        self.stats["start_time"] = time.time()
+        
+        leaves, item_keys = self._plan_leaves(data)
+        translations = {}
+        failed_keys = set()
+        
+        def translate_leaf(key: str) -> Any:
+            try:
+                return translate_text(leaves[key])
+            except Exception as e:
+                logger.error(f"Error translating string: {e}")
+                return fallback(leaves[key])  # Use original string on error
+        
+        with tqdm(total=len(leaves), desc="Translating distinct strings") as pbar:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                # Longest strings first, so the run does not end waiting on a few long ones
+                keys = sorted(leaves, key=lambda key: len(leaves[key]), reverse=True)
+                future_to_key = {executor.submit(translate_leaf, key): key for key in keys}
+                for future in concurrent.futures.as_completed(future_to_key):
+                    key = future_to_key[future]
+                    translations[key] = future.result()
+                    if self._fell_back(translations[key]):
+                        failed_keys.add(key)
+                    pbar.update(1)
+        
+        self._count_deduplicated(item_keys, failed_keys)
+        self.stats["end_time"] = time.time()
+        self._print_stats()
+        
+        return translations
+    
+    async def _aprocess_deduplicated(self, data: List[Any], atranslate_text, fallback) -> Dict[str, Any]:
+        """
+        Async version of _process_deduplicated().
+        
+        Args:
+            data: List of items to translate
+            atranslate_text: Coroutine function translating one string
+            fallback: Function giving the result for a string whose translation failed
+            
+        Returns:
+            Dict[str, Any]: Translations by stripped text (see _scatter())
+        """
+        self.stats["total_items"] = len(data)
+        self.stats["successful"] = 0
+        self.stats["failed"] = 0
+        self.stats["start_time"] = time.time()
+        
+        leaves, item_keys = self._plan_leaves(data)
+        keys = sorted(leaves, key=lambda key: len(leaves[key]), reverse=True)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        with tqdm(total=len(keys), desc="Translating distinct strings") as pbar:
+            async def translate_leaf(key: str) -> Any:
+                async with semaphore:
+                    try:
+                        translation = await atranslate_text(leaves[key])
+                    except Exception as e:
+                        logger.error(f"Error translating string: {e}")
+                        translation = fallback(leaves[key])  # Use original string on error
+                    pbar.update(1)
+                    return translation
+            
+            translations = dict(zip(keys, await asyncio.gather(*(translate_leaf(key) for key in keys))))
+        
+        failed_keys = {key for key, translation in translations.items() if self._fell_back(translation)}
+        self._count_deduplicated(item_keys, failed_keys)
+        self.stats["end_time"] = time.time()
+        self._print_stats()
+        
+        return translations
+    
+    def _stream_items(self, items: Iterable[Any], translate_item, fallback, emit) -> None:
+        """
+        Translate items read lazily from an iterator on the thread pool.
+        At most stream_window items are held at a time, so memory stays flat however long
+        the input is. With preserve_order, results are emitted in input order as soon as
+        every earlier item has finished; otherwise each is emitted as soon as it finishes.
+        
+        Args:
+            items: Iterator over the items to translate
+            translate_item: Function translating one item
+            fallback: Function giving the result for an item whose translation failed
+            emit: Function receiving each result
+        """
+        window = self.stream_window or self.max_workers * 4
+        self.stats["total_items"] = 0
+        self.stats["successful"] = 0
+        self.stats["failed"] = 0
+        self.stats["resumed"] = 0
+        self.stats["start_time"] = time.time()
+        
+        items = iter(items)
+        pending = {}
+        exhausted = False
+        
+        # Results held until every earlier item is written; together with the items in flight
+        # they never exceed the window, so one slow item cannot make the buffer grow unbounded
+        reorder = ReorderBuffer() if self.preserve_order else None
+        
+        with tqdm(desc="Translating items") as pbar:
+            def release(idx: int, translated_item: Any) -> None:
+                for result in (reorder.put(idx, translated_item) if reorder is not None else [translated_item]):
+                    emit(result)
+                pbar.update(1)
+            
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                while True:
+                    # Read ahead until the window is full
+                    while not exhausted and len(pending) + (len(reorder) if reorder is not None else 0) < window:
+                        try:
+                            item = next(items)
+                        except StopIteration:
+                            exhausted = True
+                            break
+                        idx = self.stats["total_items"]
+                        self.stats["total_items"] += 1
+                        entry = self.journal.completed(idx, self._journal_hash(item)) if self.journal is not None else None
+                        if entry is not None:
+                            # Finished by an earlier run
+                            self.stats["resumed"] += 1
+                            release(idx, entry["output"])
+                            continue
+                        pending[executor.submit(translate_item, item)] = (idx, item)
+                    
+                    if not pending:
+                        break
+                    
+                    done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+                    for future in done:
+                        idx, item = pending.pop(future)
+                        try:
+                            translated_item = future.result()
+                            self._journal_record(idx, item, translated_item)
+                            self.stats["successful"] += 1
+                        except Exception as e:
+                            logger.error(f"Error processing item {idx}: {e}")
+                            # Use original item on error
+                            translated_item = fallback(item)
+                            self._journal_record(idx, item, translated_item, error=e)
+                            self.stats["failed"] += 1
+                        release(idx, translated_item)
+        
+        if self.journal is not None:
+            self.journal.flush()
+        self.stats["end_time"] = time.time()
+        self._print_stats()
+    
+    async def _astream_items(self, items: Iterable[Any], atranslate_item, fallback, emit) -> None:
+        """
+        Async version of _stream_items().
+        
+        Args:
+            items: Iterator over the items to translate
+            atranslate_item: Coroutine function translating one item
+            fallback: Function giving the result for an item whose translation failed
+            emit: Function receiving each result
+        """
+        window = self.stream_window or self.max_concurrency
+        self.stats["total_items"] = 0
+        self.stats["successful"] = 0
+        self.stats["failed"] = 0
+        self.stats["resumed"] = 0
+        self.stats["start_time"] = time.time()
+        
+        items = iter(items)
+        pending = {}
+        exhausted = False
+        
+        # Results held until every earlier item is written; together with the items in flight
+        # they never exceed the window, so one slow item cannot make the buffer grow unbounded
+        reorder = ReorderBuffer() if self.preserve_order else None
+        
+        with tqdm(desc="Translating items") as pbar:
+            def release(idx: int, translated_item: Any) -> None:
+                for result in (reorder.put(idx, translated_item) if reorder is not None else [translated_item]):
+                    emit(result)
+                pbar.update(1)
+            
+            while True:
+                # Read ahead until the window is full
+                while not exhausted and len(pending) + (len(reorder) if reorder is not None else 0) < window:
+                    try:
+                        item = next(items)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    idx = self.stats["total_items"]
+                    self.stats["total_items"] += 1
+                    entry = self.journal.completed(idx, self._journal_hash(item)) if self.journal is not None else None
+                    if entry is not None:
+                        # Finished by an earlier run
+                        self.stats["resumed"] += 1
+                        release(idx, entry["output"])
+                        continue
+                    pending[asyncio.ensure_future(atranslate_item(item))] = (idx, item)
+                
+                if not pending:
+                    break
+                
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    idx, item = pending.pop(task)
+                    try:
+                        translated_item = task.result()
+                        self._journal_record(idx, item, translated_item)
+                        self.stats["successful"] += 1
+                    except Exception as e:
+                        logger.error(f"Error processing item {idx}: {e}")
+                        # Use original item on error
+                        translated_item = fallback(item)
+                        self._journal_record(idx, item, translated_item, error=e)
+                        self.stats["failed"] += 1
+                    release(idx, translated_item)
+        
+        if self.journal is not None:
+            self.journal.flush()
+        self.stats["end_time"] = time.time()
+        self._print_stats()
+    
+    def _record_field(self, idx: int, result: Any, error: Optional[Exception],
+                      failures: Dict[int, Optional[Exception]]) -> None:
+        """
+        Note a failed field of a field-scheduled run against its item.
+        A field failed if its translation raised or the translator fell back to the source text.
+        
+        Args:
+            idx: Index of the item
+            result: Translation of the field (the fallback value if it raised)
+            error: Error raised by the translation, if any
+            failures: First error (or None for a fallback without error) by failed item index,
+                updated in place
+        """
+        if error is None and not self._fell_back(result):
+            return
+        self.stats["failed_fields"] += 1
+        if failures.get(idx) is None:
+            failures[idx] = error
+    
+    def _count_fields_item(self, idx: int, item: Any, translated_item: Any,
+                           failures: Dict[int, Optional[Exception]]) -> None:
+        """
+        Journal and count an item of a field-scheduled run once all of its fields are done.
+        An item with a failed field counts as failed; its journal status is 'failed' if a field
+        raised (otherwise 'fallback').
+        
+        Args:
+            idx: Index of the item
+            item: Source item
+            translated_item: Assembled output of the item
+            failures: Failed items, see _record_field()
+        """
+        self._journal_record(idx, item, translated_item, error=failures.get(idx))
+        if idx in failures:
+            self.stats["failed"] += 1
+        else:
+            self.stats["successful"] += 1
+    
+    def _process_fields(self, data: List[Any], translate_text, fallback_text, assemble) -> List[Any]:
+        """
+        Translate a batch field by field on the thread pool.
+        Every string field of every item becomes a task in one global queue, ordered longest
+        first, so no worker is held by the sequential fields of a single large item.
+        An item is reassembled as soon as all of its fields are done.
+        
+        Args:
+            data: List of items to translate
+            translate_text: Function translating one string
+            fallback_text: Function giving the result for a string whose translation failed
+            assemble: Function building an item's output from the item and its field results by path
+            
+        Returns:
+            List[Any]: Translated items, in input order
+        """
+        self.stats["total_items"] = len(data)
+        self.stats["successful"] = 0
+        self.stats["failed"] = 0
+        self.stats["busy_seconds"] = 0.0
+        self.stats["start_time"] = time.time()
+        
+        resumed = self._resumed_outputs(data)
+        translated_data = [resumed.get(idx) for idx in range(len(data))]
+        tasks = self._plan_fields(data, resumed)
+        
+        # Field results, number of fields still missing and field errors per item
+        results: Dict[int, Dict[tuple, Any]] = {}
+        remaining: Dict[int, int] = {}
+        failures: Dict[int, Optional[Exception]] = {}
+        for idx, _, _ in tasks:
+            remaining[idx] = remaining.get(idx, 0) + 1
+        
+        def translate_field(text: str) -> Tuple[Any, float, Optional[Exception]]:
+            start = time.time()
+            try:
+                return translate_text(text), time.time() - start, None
+            except Exception as e:
+                logger.error(f"Error translating field: {e}")
+                return fallback_text(text), time.time() - start, e  # Use original value on error
+        
+        def complete(idx: int) -> None:
+            translated_data[idx] = assemble(data[idx], results.pop(idx, {}))
+            self._count_fields_item(idx, data[idx], translated_data[idx], failures)
+            pbar.update(1)
+        
+        with tqdm(total=len(data), desc="Translating items") as pbar:
+            pbar.update(len(resumed))
+            
+            # Items without any translatable field are done already
+            for idx in range(len(data)):
+                if idx not in resumed and idx not in remaining:
+                    complete(idx)
+            
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                future_to_task = {
+                    executor.submit(translate_field, text): (idx, path, text) for idx, path, text in tasks
+                }
+                
+                for future in concurrent.futures.as_completed(future_to_task):
+                    idx, path, _ = future_to_task[future]
+                    result, busy, error = future.result()
+                    self.stats["busy_seconds"] += busy
+                    self._record_field(idx, result, error, failures)
+                    results.setdefault(idx, {})[path] = result
+                    remaining[idx] -= 1
+                    if remaining[idx] == 0:
+                        complete(idx)
+        
+        if self.journal is not None:
+            self.journal.flush()
+        self.stats["end_time"] = time.time()
+        self._print_stats()
         
         return translated_data
     
-    def process_file(self, input_file: str, output_file: str) -> None:
+    async def _aprocess_fields(self, data: List[Any], atranslate_text, fallback_text, assemble) -> List[Any]:
+        """
+        Async version of _process_fields().
+        Fields start in longest-first order; at most max_concurrency are in flight.
+        
+        Args:
+            data: List of items to translate
+            atranslate_text: Coroutine function translating one string
+            fallback_text: Function giving the result for a string whose translation failed
+            assemble: Function building an item's output from the item and its field results by path
+            
+        Returns:
+            List[Any]: Translated items, in input order
+        """
+        self.stats["total_items"] = len(data)
+        self.stats["successful"] = 0
+        self.stats["failed"] = 0
+        self.stats["busy_seconds"] = 0.0
+        self.stats["start_time"] = time.time()
+        
+        resumed = self._resumed_outputs(data)
+        translated_data = [resumed.get(idx) for idx in range(len(data))]
+        tasks = self._plan_fields(data, resumed)
+        
+        results: Dict[int, Dict[tuple, Any]] = {}
+        remaining: Dict[int, int] = {}
+        failures: Dict[int, Optional[Exception]] = {}
+        for idx, _, _ in tasks:
+            remaining[idx] = remaining.get(idx, 0) + 1
+        
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        with tqdm(total=len(data), desc="Translating items") as pbar:
+            pbar.update(len(resumed))
+            
+            def complete(idx: int) -> None:
+                translated_data[idx] = assemble(data[idx], results.pop(idx, {}))
+                self._count_fields_item(idx, data[idx], translated_data[idx], failures)
+                pbar.update(1)
+            
+            for idx in range(len(data)):
+                if idx not in resumed and idx not in remaining:
+                    complete(idx)
+            
+            async def translate_field(idx: int, path: tuple, text: str) -> None:
+                async with semaphore:
+                    start = time.time()
+                    error = None
+                    try:
+                        result = await atranslate_text(text)
+                    except Exception as e:
+                        logger.error(f"Error translating field: {e}")
+                        result = fallback_text(text)  # Use original value on error
+                        error = e
+                    self.stats["busy_seconds"] += time.time() - start
+                self._record_field(idx, result, error, failures)
+                results.setdefault(idx, {})[path] = result
+                remaining[idx] -= 1
+                if remaining[idx] == 0:
+                    complete(idx)
+            
+            await asyncio.gather(*(translate_field(idx, path, text) for idx, path, text in tasks))
+        
+        if self.journal is not None:
+            self.journal.flush()
+        self.stats["end_time"] = time.time()
+        self._print_stats()
+        
+        return translated_data
+    
+    def process_batch(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Process a batch of items for translation.
+        
+        Args:
+            data: List of items to translate
+            
+        Returns:
+            List[Dict[str, Any]]: Translated items, in input order
+        """
+        if self.use_async:
+            return asyncio.run(self.aprocess_batch(data))
+        
+        if self.deduplicate and self.journal is None:
+            translations = self._process_deduplicated(
+                data, lambda text: self.translator.translate(text, self.target_language), FallbackText
+            )
+            return [self._scatter(item, translations) for item in data]
+        
+        if self.field_scheduling:
+            return self._process_fields(
+                data, lambda text: self.translator.translate(text, self.target_language), FallbackText,
+                self._assemble
+            )
+        
+        return self._process_items(data, self._translate_item, lambda item: item)
+    
+    def process_batch_many(self, data: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Process a batch of items for translation into every target language in one pass.
+        Each string is analysed once and its translations for all languages are scheduled
+        together, sharing the translators' rate limits.
+        
+        Args:
+            data: List of items to translate
+            
+        Returns:
+            Dict[str, List[Dict[str, Any]]]: Translated items by target language
+        """
+        def fallback(item: Dict[str, Any]) -> Dict[str, Any]:
+            return {language: item for language in self.target_languages}
+        
+        def fallback_text(text: str) -> Dict[str, str]:
+            return {language: FallbackText(text) for language in self.target_languages}
+        
+        if self.deduplicate and self.journal is None:
+            if self.use_async:
+                translations = asyncio.run(self._aprocess_deduplicated(
+                    data, lambda text: self.translator.atranslate_many(text, self.target_languages), fallback_text
+                ))
+            else:
+                translations = self._process_deduplicated(
+                    data, lambda text: self.translator.translate_many(text, self.target_languages), fallback_text
+                )
+            translated = {}
+            for language in self.target_languages:
+                language_translations = {key: t[language] for key, t in translations.items()}
+                translated[language] = [self._scatter(item, language_translations) for item in data]
+            return translated
+        
+        if self.field_scheduling:
+            def assemble(item: Any, results: Dict[tuple, Dict[str, Any]]) -> Dict[str, Any]:
+                return {
+                    language: self._assemble(item, {path: result[language] for path, result in results.items()})
+                    for language in self.target_languages
+                }
+            
+            if self.use_async:
+                translated = asyncio.run(self._aprocess_fields(
+                    data, lambda text: self.translator.atranslate_many(text, self.target_languages), fallback_text,
+                    assemble
+                ))
+            else:
+                translated = self._process_fields(
+                    data, lambda text: self.translator.translate_many(text, self.target_languages), fallback_text,
+                    assemble
+                )
+        elif self.use_async:
+            translated = asyncio.run(self._aprocess_items(data, self._atranslate_value_many, fallback))
+        else:
+            translated = self._process_items(data, self._translate_value_many, fallback)
+        
+        return {
+            language: [item[language] for item in translated]
+            for language in self.target_languages
+        }
+    
+    @staticmethod
+    def language_output_path(output_file: str, language: str) -> str:
+        """
+        Get the output file of one target language in a multi-language run.
+        
+        Args:
+            output_file: Output path given for the run (e.g. 'out.json')
+            language: Target language (e.g. 'Japanese')
+            
+        Returns:
+            str: Path with the language inserted before the extension (e.g. 'out.japanese.json')
+        """
+        root, ext = os.path.splitext(output_file)
+        return f"{root}.{language.lower().replace(' ', '_')}{ext or '.json'}"
+    
+    def process_file_stream(self, input_file: str, output_file: str, combined: bool = False) -> None:
+        """
+        Process a JSON Lines file, or a file holding a top-level JSON array, as a stream.
+        Items are read lazily, translated with a bounded number in flight (see stream_window)
+        and appended to the output in input order as soon as the prefix before them is complete
+        (see preserve_order), so a .jsonl output can be consumed and diffed item by item while
+        the run is going. Deduplication needs the whole batch and is not applied.
+        
+        Args:
+            input_file: Path to input JSON Lines or JSON array file
+            output_file: Path to output file (.jsonl for line records, otherwise a JSON array)
+            combined: Whether a multi-language run writes all languages into output_file
+        """
+        if self.deduplicate:
+            logger.warning("Deduplication needs the whole batch and is not applied when streaming")
+        
+        many = len(self.target_languages) > 1
+        if many:
+            translate_item, atranslate_item = self._translate_value_many, self._atranslate_value_many
+            fallback = lambda item: {language: item for language in self.target_languages}
+        else:
+            translate_item, atranslate_item = self._translate_item, self._atranslate_value
+            fallback = lambda item: item
+        
+        if many and not combined:
+            paths = [self.language_output_path(output_file, language) for language in self.target_languages]
+        else:
+            paths = [output_file]
+        
+        with contextlib.ExitStack() as stack:
+            writers = [stack.enter_context(JsonItemWriter(path)) for path in paths]
+            
+            def emit(translated_item: Any) -> None:
+                if len(writers) > 1:
+                    for writer, language in zip(writers, self.target_languages):
+                        writer.write(translated_item[language])
+                else:
+                    writers[0].write(translated_item)
+            
+            items = iter_json_items(input_file)
+            if self.use_async:
+                asyncio.run(self._astream_items(items, atranslate_item, fallback, emit))
+            else:
+                self._stream_items(items, translate_item, fallback, emit)
+        
+        for path in paths:
+            print(f"Translated data saved to {path}")
+    
+    def process_file(self, input_file: str, output_file: str, combined: bool = False,
+                     stream: Optional[bool] = None) -> None:
         """
         Process a file containing items for translation.
+        With several target languages, one output file per language is written
+        (see language_output_path()), or a single file keyed by language if combined.
         
         Args:
             input_file: Path to input JSON file
             output_file: Path to output JSON file
+            combined: Whether a multi-language run writes all languages into output_file
+            stream: Whether the file is translated as a stream (see process_file_stream());
+                defaults to True for .jsonl input
         """
+        if stream is None:
+            stream = input_file.endswith(".jsonl")
+        if stream:
+            return self.process_file_stream(input_file, output_file, combined=combined)
+        
         try:
             # Load input file
             with open(input_file, 'r', encoding='utf-8') as f:
                 data = json.load(f)
             
             # Process data
-            if isinstance(data, list):
-                translated_data = self.process_batch(data)
+            if len(self.target_languages) > 1:
+                if isinstance(data, list):
+                    translations = self.process_batch_many(data)
+                else:
+                    translations = self._translate_value_many(data)
+                
+                if combined:
+                    outputs = {output_file: translations}
+                else:
+                    outputs = {
+                        self.language_output_path(output_file, language): translated_data
+                        for language, translated_data in translations.items()
+                    }
             else:
-                # Handle single item or dictionary with nested lists
-                translated_data = self._translate_item(data)
-            
-            # Write output file
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(translated_data, f, ensure_ascii=False, indent=2)
+                if isinstance(data, list):
+                    translated_data = self.process_batch(data)
+                else:
+                    # Handle single item or dictionary with nested lists
+                    translated_data = self._translate_item(data)
+                outputs = {output_file: translated_data}
             
-            print(f"Translated data saved to {output_file}")
+            # Write output files
+            for path, translated_data in outputs.items():
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump(translated_data, f, ensure_ascii=False, indent=2)
+                
+                print(f"Translated data saved to {path}")
             
         except Exception as e:
             logger.error(f"Error processing file: {e}")
@@ -18,15 +18,25 @@ from translator.hybrid_translator import HybridTranslator
 from translator.deepl_translator import DeepLTranslator
 from translator.google_translator import GoogleTranslator
 from translator.llm_translator import LLMTranslator
+from translator.batch_processor import BatchProcessor
+from translator.difficulty import DifficultyScorer
 from utils.logger import logger
+from utils.code_preserver import DATASET_CODE_PROTECTION
+from utils.translation_memory import TranslationMemory, DEFAULT_MEMORY_PATH
+from utils.run_journal import RunJournal
+from utils.fallback_text import FallbackText
 
-def setup_translators(dataset_type: str, use_google: bool = False):
+def setup_translators(dataset_type: str, use_google: bool = False, use_cache: bool = True,
+                      difficulty_routing: bool = False, translation_memory: Optional[TranslationMemory] = None):
     """
     Set up and initialize the translators based on available API keys.
     
     Args:
         dataset_type: Type of dataset ('math', 'gaia', 'swe-bench', 'asb')
         use_google: Whether to use Google Translate instead of DeepL
+        use_cache: Whether to reuse LLM completions from the persistent cache
+        difficulty_routing: Whether easy segments take a shorter pipeline based on a local difficulty score
+        translation_memory: Memory of earlier translations reused for exact and similar segments
         
     Returns:
         HybridTranslator: Configured translator instance
@@ -49,18 +59,21 @@ def setup_translators(dataset_type: str, use_google: bool = False):
             api_key=azure_key,
             api_base=os.getenv('AZURE_OPENAI_API_BASE', "https://llm-sec.openai.azure.com/"),
             api_version=os.getenv('AZURE_OPENAI_API_VERSION', "2024-08-01-preview"),
-            dataset_type=dataset_type
+            dataset_type=dataset_type,
+            use_cache=use_cache
         )
     else:
         # Fall back to OpenAI
         llm_translator = LLMTranslator(
             model_name="gpt-4o",
             api_key=openai_key,
-            dataset_type=dataset_type
+            dataset_type=dataset_type,
+            use_cache=use_cache
         )
     
     # Configure machine translator
     use_math_preservation = (dataset_type == 'math' or dataset_type == 'swe-bench')
+    code_protection = DATASET_CODE_PROTECTION.get(dataset_type, ())
     
     if use_google:
         # Google Translate
@@ -70,7 +83,8 @@ def setup_translators(dataset_type: str, use_google: bool = False):
         
         machine_translator = GoogleTranslator(
             api_key_path=google_creds,
-            use_math_preservation=use_math_preservation
+            use_math_preservation=use_math_preservation,
+            code_protection=code_protection
         )
     else:
         # DeepL
@@ -78,11 +92,13 @@ def setup_translators(dataset_type: str, use_google: bool = False):
         if not deepl_key:
             print("Warning: DEEPL_API_KEY not set. Falling back to Google Translate.")
             # Fall back to Google if DeepL key is not available
-            return setup_translators(dataset_type, use_google=True)
+            return setup_translators(dataset_type, use_google=True, use_cache=use_cache,
+                                     difficulty_routing=difficulty_routing, translation_memory=translation_memory)
         
         machine_translator = DeepLTranslator(
             auth_key=deepl_key,
-            use_math_preservation=use_math_preservation
+            use_math_preservation=use_math_preservation,
+            code_protection=code_protection
         )
     
     # Create and return hybrid translator
@@ -90,7 +106,9 @@ def setup_translators(dataset_type: str, use_google: bool = False):
         deepl_translator=None if use_google else machine_translator,
         google_translator=machine_translator if use_google else None,
         llm_translator=llm_translator,
-        dataset_type=dataset_type
+        dataset_type=dataset_type,
+        difficulty_scorer=DifficultyScorer(dataset_type) if difficulty_routing else None,
+        translation_memory=translation_memory
     )
 
 def translate_text(text: str, translator: HybridTranslator, target_language: str) -> str:
@@ -103,16 +121,17 @@ def translate_text(text: str, translator: HybridTranslator, target_language: str
         target_language: Target language code or name
         
     Returns:
-        str: Translated text
+        str: Translated text, or an error notice marked as a FallbackText if translation raised
     """
     try:
         return translator.translate(text, target_language)
     except Exception as e:
         logger.error(f"Translation error: {e}")
-        return f"[Translation Error: {str(e)}]"
+        return FallbackText(f"[Translation Error: {str(e)}]")
 
 def translate_file(input_file: str, translator: HybridTranslator, 
-                  target_language: str, output_file: Optional[str] = None) -> None:
+                  target_language: str, output_file: Optional[str] = None,
+                  journal: Optional[RunJournal] = None) -> None:
     """
     Translate all text content in a JSON file.
     
@@ -121,6 +140,7 @@ def translate_file(input_file: str, translator: HybridTranslator,
         translator: Configured translator instance
         target_language: Target language code or name
         output_file: Path to output JSON file (if None, prints to stdout)
+        journal: Run journal recording each finished list item; items it already holds are reused
     """
     try:
         # Load input file
@@ -130,8 +150,22 @@ def translate_file(input_file: str, translator: HybridTranslator,
         # Determine if it's a list or object
         if isinstance(data, list):
             # Process list of objects
-            for item in data:
+            for idx, item in enumerate(data):
+                if journal is None:
+                    process_json_item(item, translator, target_language)
+                    continue
+                
+                content_hash = RunJournal.content_hash(item, [target_language])
+                entry = journal.completed(idx, content_hash)
+                if entry is not None:
+                    data[idx] = entry["output"]
+                    continue
+                
                 process_json_item(item, translator, target_language)
+                journal.record(idx, content_hash, RunJournal.item_status(item), item)
+            
+            if journal is not None:
+                journal.flush()
         else:
             # Process single object
             process_json_item(data, translator, target_language)
@@ -149,6 +183,76 @@ def translate_file(input_file: str, translator: HybridTranslator,
         logger.error(f"File translation error: {e}")
         print(f"Error processing file: {e}")
 
+def translate_value_many(value: Any, translator: HybridTranslator, target_languages: List[str]) -> Dict[str, Any]:
+    """
+    Translate all text content of a JSON value into several target languages.
+    Each string is analysed once and translated into all languages together.
+    
+    Args:
+        value: JSON value to translate
+        translator: Configured translator instance
+        target_languages: Target language codes or names
+        
+    Returns:
+        Dict[str, Any]: Translated copy of the value by target language
+    """
+    if isinstance(value, str) and len(value.strip()) > 0:
+        try:
+            return translator.translate_many(value, target_languages)
+        except Exception as e:
+            logger.error(f"Translation error: {e}")
+            return {language: FallbackText(f"[Translation Error: {str(e)}]") for language in target_languages}
+    elif isinstance(value, dict):
+        translated = {key: translate_value_many(v, translator, target_languages) for key, v in value.items()}
+        return {language: {key: translated[key][language] for key in value} for language in target_languages}
+    elif isinstance(value, list):
+        translated = [translate_value_many(v, translator, target_languages) for v in value]
+        return {language: [t[language] for t in translated] for language in target_languages}
+    else:
+        return {language: value for language in target_languages}
+
+def translate_file_many(input_file: str, translator: HybridTranslator, target_languages: List[str],
+                        output_file: Optional[str] = None, combined: bool = False) -> None:
+    """
+    Translate all text content in a JSON file into several target languages in one pass.
+    
+    Args:
+        input_file: Path to input JSON file
+        translator: Configured translator instance
+        target_languages: Target language codes or names
+        output_file: Path to output JSON file; one file per language is written next to it
+            unless combined (if None, prints to stdout)
+        combined: Whether to write all languages into a single file keyed by language
+    """
+    try:
+        # Load input file once for all languages
+        with open(input_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        
+        translations = translate_value_many(data, translator, target_languages)
+        
+        # Write output
+        if not output_file:
+            print(json.dumps(translations, ensure_ascii=False, indent=2))
+            return
+        
+        if combined:
+            outputs = {output_file: translations}
+        else:
+            outputs = {
+                BatchProcessor.language_output_path(output_file, language): translated
+                for language, translated in translations.items()
+            }
+        
+        for path, translated in outputs.items():
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(translated, f, ensure_ascii=False, indent=2)
+            print(f"Translated content saved to {path}")
+            
+    except Exception as e:
+        logger.error(f"File translation error: {e}")
+        print(f"Error processing file: {e}")
+
 def process_json_item(item: Dict[str, Any], translator: HybridTranslator, target_language: str) -> None:
     """
     Process a JSON object by translating all string values.
@@ -183,28 +287,82 @@ def main():
     input_group.add_argument('--file', help='JSON file to translate')
     
     # Translation options
-    parser.add_argument('--language', required=True, help='Target language (e.g., Japanese, Hebrew)')
+    parser.add_argument('--language', required=True,
+                       help='Target language, or a comma-separated list of languages (e.g., Japanese,Hebrew)')
     parser.add_argument('--domain', default='math', choices=['math', 'gaia', 'swe-bench', 'asb'],
                        help='Content domain type')
     parser.add_argument('--google', action='store_true', help='Force using Google Translate')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the persistent LLM completion cache')
+    parser.add_argument('--difficulty-routing', action='store_true',
+                       help='Skip LLM enhancement and checks for segments scored as easy')
+    parser.add_argument('--memory', nargs='?', const=DEFAULT_MEMORY_PATH, metavar='PATH',
+                       help=f'Reuse earlier translations from a translation memory (default: {DEFAULT_MEMORY_PATH})')
+    parser.add_argument('--journal', metavar='PATH',
+                       help='Record finished items of a JSON list file in a run journal (default with --resume: '
+                            '<output>.journal.jsonl)')
+    parser.add_argument('--resume', action='store_true',
+                       help='Reuse the items finished by an earlier run from its journal and translate the rest')
+    parser.add_argument('--retry-fallbacks', action='store_true',
+                       help='On resume, also translate again the items that fell back to their source text')
+    parser.add_argument('--memory-import', nargs=2, metavar=('SOURCE', 'TRANSLATED'),
+                       help='Import a source file and its earlier translated output into the translation memory')
     
     # Output options
     parser.add_argument('--output', help='Output file for translated content')
+    parser.add_argument('--combined', action='store_true',
+                       help='With several languages, write a single output file keyed by language')
     
     args = parser.parse_args()
     
+    languages = [language.strip() for language in args.language.split(',') if language.strip()]
+    
+    # Setup translation memory
+    translation_memory = None
+    if args.memory or args.memory_import:
+        translation_memory = TranslationMemory(args.memory or DEFAULT_MEMORY_PATH)
+        if args.memory_import:
+            if len(languages) > 1:
+                parser.error("--memory-import takes a translated file of a single target language")
+            imported = translation_memory.import_files(args.memory_import[0], args.memory_import[1], languages[0])
+            print(f"Imported {imported} segments into the translation memory for {languages[0]}")
+    
     # Setup translator
-    translator = setup_translators(args.domain, use_google=args.google)
+    translator = setup_translators(args.domain, use_google=args.google, use_cache=not args.no_cache,
+                                   difficulty_routing=args.difficulty_routing, translation_memory=translation_memory)
     
-    if args.text:
+    if len(languages) > 1:
+        # Translate into all languages in one pass
+        if args.text:
+            results = translator.translate_many(args.text, languages)
+            for language, result in results.items():
+                print(f"\nTranslation Result ({language}):")
+                print("-------------------")
+                print(result)
+        else:
+            translate_file_many(args.file, translator, languages, args.output, combined=args.combined)
+    elif args.text:
         # Translate single text
         result = translate_text(args.text, translator, args.language)
         print("\nTranslation Result:")
         print("-------------------")
         print(result)
     else:
-        # Translate file
-        translate_file(args.file, translator, args.language, args.output)
+        # Translate file, optionally journaling finished items for a later --resume
+        journal_path = args.journal or (f"{args.output}.journal.jsonl" if args.resume and args.output else None)
+        if journal_path:
+            with RunJournal(journal_path, resume=args.resume, retry_fallbacks=args.retry_fallbacks) as journal:
+                translate_file(args.file, translator, args.language, args.output, journal=journal)
+                journal_stats = journal.get_stats()
+            print(f"Run journal {journal_path}: {journal_stats['resumed']} items resumed, "
+                  f"{journal_stats['fallback']} fell back to the source text")
+        else:
+            translate_file(args.file, translator, args.language, args.output)
+    
+    if translation_memory is not None:
+        memory_stats = translation_memory.get_stats()
+        print(f"\nTranslation memory: {memory_stats['exact_hits']} exact / {memory_stats['fuzzy_hits']} fuzzy hits, "
+              f"{memory_stats['misses']} misses (exact hit rate: {memory_stats['exact_hit_rate']:.1%}, "
+              f"fuzzy hit rate: {memory_stats['fuzzy_hit_rate']:.1%})")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -3,26 +3,78 @@ DeepL API implementation for translation.
 """
 
 import os
-from typing import Optional, List, Dict
+import re
+import asyncio
+import threading
+import concurrent.futures
+from xml.sax.saxutils import escape, unescape
+from typing import Optional, List, Dict, Sequence
 
 from .base_translator import BaseTranslator
 from utils.logger import logger
+from utils.fallback_text import FallbackText
+from utils.math_preserver import SimpleMathPreserver
+from utils.rate_limiter import RateLimiter, get_rate_limiter, env_limit
 
 
 class DeepLTranslator(BaseTranslator):
     """
     Translator implementation using DeepL API.
+    Math placeholders are sent inside ignored XML tags so DeepL leaves them untouched.
     """
     
-    def __init__(self, auth_key: Optional[str] = None, use_math_preservation: bool = True):
+    # Map language names to codes if needed
+    LANGUAGE_CODES = {
+        'Japanese': 'JA',
+        'Hebrew': 'HE',
+        'Russian': 'RU',
+        'Spanish': 'ES',
+        'Chinese': 'ZH',
+        'French': 'FR',
+        'German': 'DE',
+        'Korean': 'KO',
+        'Italian': 'IT',
+        'Portuguese': 'PT-BR',
+        'Arabic': 'AR',
+    }
+    
+    # Limits of a single DeepL translate request (50 texts, 128 KiB request body)
+    MAX_SEGMENTS = 50
+    MAX_REQUEST_CHARACTERS = 100000
+    
+    # XML tag wrapping math placeholders; its content is excluded from translation
+    PLACEHOLDER_TAG = "m"
+    TAGGED_PLACEHOLDER_PATTERN = re.compile(r'<m>(.*?)</m>')
+    
+    def __init__(self, auth_key: Optional[str] = None, use_math_preservation: bool = True,
+                 characters_per_minute: Optional[float] = None, rate_limiter: Optional[RateLimiter] = None,
+                 xml_placeholders: bool = True, max_workers: int = 4, server_url: Optional[str] = None,
+                 code_protection: Sequence[str] = ()):
         """
         Initialize the DeepL translator.
         
         Args:
             auth_key: DeepL API authentication key
             use_math_preservation: Whether to use math preservation functionality
+            code_protection: Kinds of code spans kept out of translation (see CodePreserver.KINDS)
+            characters_per_minute: Character quota (defaults to DEEPL_CHARACTERS_PER_MINUTE)
+            rate_limiter: Rate limiter holding the quota (defaults to the process-wide shared limiter)
+            xml_placeholders: Whether to protect math placeholders with XML tag handling
+            max_workers: Number of batch requests batch_translate() sends concurrently
+            server_url: DeepL API server URL (defaults to DEEPL_SERVER_URL, or the DeepL server for the key)
         """
-        super().__init__(use_math_preservation=use_math_preservation)
+        super().__init__(use_math_preservation=use_math_preservation, code_protection=code_protection)
+        self.xml_placeholders = xml_placeholders and self.use_math_preservation
+        self.max_workers = max_workers
+        
+        # Statistics
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "segments": 0,
+            "placeholder_losses": 0
+        }
+        self._setup_rate_limit("deepl:characters", characters_per_minute or env_limit("DEEPL_CHARACTERS_PER_MINUTE"), rate_limiter)
         
         try:
             # Import the client here to avoid unnecessary dependencies if not used
@@ -36,7 +88,10 @@ class DeepLTranslator(BaseTranslator):
                 raise ValueError("DeepL API key is required")
             
             # Initialize the DeepL client
-            self.translator = deepl.Translator(self.auth_key)
+            self.translator = deepl.Translator(
+                self.auth_key,
+                server_url=server_url or os.environ.get("DEEPL_SERVER_URL")
+            )
             
             logger.info("DeepL client initialized successfully")
         except ImportError:
@@ -46,6 +101,112 @@ class DeepLTranslator(BaseTranslator):
             logger.error(f"Failed to initialize DeepL client: {e}")
             raise
     
+    def _protect(self, text: str) -> str:
+        """
+        Prepare a text with math placeholders for translation.
+        With XML tag handling the text is escaped and each placeholder wrapped in an ignored tag.
+        
+        Args:
+            text: Text with math placeholders
+            
+        Returns:
+            str: Text to send to DeepL
+        """
+        if not self.xml_placeholders:
+            return text
+        return SimpleMathPreserver.PLACEHOLDER_PATTERN.sub(
+            lambda match: f"<{self.PLACEHOLDER_TAG}>{match.group(0)}</{self.PLACEHOLDER_TAG}>",
+            escape(text)
+        )
+    
+    def _unprotect(self, text: str) -> str:
+        """
+        Undo _protect() on a translated text.
+        
+        Args:
+            text: Text returned by DeepL
+            
+        Returns:
+            str: Translated text with bare placeholders
+        """
+        if not self.xml_placeholders:
+            return text
+        return unescape(self.TAGGED_PLACEHOLDER_PATTERN.sub(r'\1', text))
+    
+    def _check_placeholders(self, sent: str, translated: str) -> None:
+        """
+        Count a placeholder-loss incident if DeepL dropped or altered any placeholder of a text.
+        
+        Args:
+            sent: Text sent to DeepL (with placeholders)
+            translated: Text returned by DeepL, after _unprotect()
+        """
+        expected = set(SimpleMathPreserver.PLACEHOLDER_PATTERN.findall(sent))
+        found = set(SimpleMathPreserver.find_placeholders(translated))
+        missing = [placeholder for placeholder in expected if placeholder not in found]
+        if missing:
+            with self._stats_lock:
+                self.stats["placeholder_losses"] += 1
+            logger.warning(f"DeepL altered {len(missing)} of {len(expected)} math placeholders")
+    
+    def _translate_segments(self, segments: List[str], target_code: str) -> List[str]:
+        """
+        Send one translate request for a list of segments.
+        
+        Args:
+            segments: Texts to translate (with math already replaced by placeholders)
+            target_code: DeepL language code
+            
+        Returns:
+            List[str]: Translated texts, after _unprotect()
+        """
+        protected = [self._protect(segment) for segment in segments]
+        self._acquire_characters("".join(protected))
+        with self._stats_lock:
+            self.stats["requests"] += 1
+            self.stats["segments"] += len(segments)
+        
+        options = {"target_lang": target_code, "preserve_formatting": True}
+        if self.xml_placeholders:
+            options.update(tag_handling="xml", ignore_tags=[self.PLACEHOLDER_TAG])
+        results = self.translator.translate_text(protected, **options)
+        
+        translations = [self._unprotect(result.text) for result in results]
+        for segment, translation in zip(segments, translations):
+            self._check_placeholders(segment, translation)
+        return translations
+    
+    def _translate_chunk(self, segments: List[str], target_code: str) -> List[Optional[str]]:
+        """
+        Translate the segments of one request.
+        If the batch request fails, each segment is retried on its own so that
+        one bad segment does not fail the others.
+        
+        Args:
+            segments: Texts to translate (with math already replaced by placeholders)
+            target_code: DeepL language code
+            
+        Returns:
+            List[Optional[str]]: Translated texts, None for segments that could not be translated
+        """
+        try:
+            return self._translate_segments(segments, target_code)
+        except Exception as e:
+            if len(segments) == 1:
+                logger.error(f"DeepL translation error: {e}")
+                return [None]
+            logger.warning(f"DeepL batch translation of {len(segments)} segments failed: {e}. "
+                           f"Translating them individually")
+        
+        translations = []
+        for segment in segments:
+            try:
+                translations.extend(self._translate_segments([segment], target_code))
+            except Exception as e:
+                logger.error(f"DeepL translation error: {e}")
+                translations.append(None)
+        return translations
+    
     def translate(self, text: str, target_language: str) -> str:
         """
         Translate text using DeepL with optional math preservation.
@@ -57,25 +218,10 @@ class DeepLTranslator(BaseTranslator):
         Returns:
             str: Translated text
         """
-        if not text:
+        if not text or self._skip(text):
             return text
         
-        # Map language names to codes if needed
-        language_mapping = {
-            'Japanese': 'JA',
-            'Hebrew': 'HE',
-            'Russian': 'RU',
-            'Spanish': 'ES',
-            'Chinese': 'ZH',
-            'French': 'FR',
-            'German': 'DE',
-            'Korean': 'KO',
-            'Italian': 'IT',
-            'Portuguese': 'PT-BR',
-            'Arabic': 'AR',
-        }
-        
-        target_code = language_mapping.get(target_language, target_language.upper())
+        target_code = self.LANGUAGE_CODES.get(target_language, target_language.upper())
         
         try:
             # If math preservation is enabled, extract mathematical expressions first
@@ -86,12 +232,7 @@ class DeepLTranslator(BaseTranslator):
                 modified_text, replacements = self.math_preserver.extract_math(text)
             
             # Translate the modified text
-            result = self.translator.translate_text(
-                modified_text, 
-                target_lang=target_code,
-                preserve_formatting=True
-            )
-            translated_text = result.text
+            translated_text = self._translate_segments([modified_text], target_code)[0]
             
             # Restore mathematical expressions if math preservation is enabled
             if self.use_math_preservation:
@@ -105,24 +246,86 @@ class DeepLTranslator(BaseTranslator):
             # If translation fails, try to restore math expressions in original text
             if self.use_math_preservation and 'replacements' in locals():
                 try:
-                    return self.math_preserver.restore_math(text, replacements)
+                    return FallbackText(self.math_preserver.restore_math(text, replacements))
                 except:
                     pass
-            return text  # Return original text as fallback
+            return FallbackText(text)  # Return original text as fallback
     
     def batch_translate(self, texts: List[str], target_language: str) -> List[str]:
         """
         Translate a batch of texts using DeepL.
+        Texts are sent as lists of up to MAX_SEGMENTS texts (and MAX_REQUEST_CHARACTERS
+        characters) per request, with up to max_workers requests in flight.
+        Math is extracted from and restored in all texts of the batch in one pass.
         
         Args:
             texts: List of texts to translate
             target_language: Target language code or name
             
         Returns:
-            List[str]: List of translated texts
+            List[str]: List of translated texts (the original text, as a FallbackText, for texts that failed)
         """
         if not texts:
             return []
+        
+        target_code = self.LANGUAGE_CODES.get(target_language, target_language.upper())
+        
+        # Extract math from all texts in one pass; empty and untranslatable texts are not sent
+        indices = [i for i, text in enumerate(texts) if text and not self._skip(text)]
+        if self.use_math_preservation:
+            segments, replacements, _ = self.math_preserver.extract_batch([texts[i] for i in indices])
+        else:
+            segments, replacements = [texts[i] for i in indices], [{} for _ in indices]
+        
+        chunks = self._chunk_indices(segments, self.MAX_SEGMENTS, self.MAX_REQUEST_CHARACTERS)
+        translations = [None] * len(segments)
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks) or 1)) as executor:
+            futures = {
+                executor.submit(self._translate_chunk, [segments[j] for j in chunk], target_code): chunk
+                for chunk in chunks
+            }
+            for future in concurrent.futures.as_completed(futures):
+                for j, translation in zip(futures[future], future.result()):
+                    translations[j] = translation
+        
+        logger.info(f"DeepL translated {len(segments)} texts in {len(chunks)} request(s)")
+        
+        if self.use_math_preservation:
+            translations = self.math_preserver.restore_batch(translations, replacements)
+        
+        results = list(texts)
+        for j, i in enumerate(indices):
+            if translations[j] is None:
+                # Return original text as fallback
+                results[i] = FallbackText(texts[i])
+                continue
+            results[i] = translations[j]
+        return results
+    
+    async def abatch_translate(self, texts: List[str], target_language: str,
+                               max_concurrency: Optional[int] = None) -> List[str]:
+        """
+        Translate a batch of texts without blocking the event loop.
+        Runs the batched batch_translate() in the loop's default executor.
+        
+        Args:
+            texts: List of texts to translate
+            target_language: Target language code or name
+            max_concurrency: Unused; requests are bounded by max_workers
             
-        # Process each text individually to preserve math in each
-        return [self.translate(text, target_language) for text in texts]
\ No newline at end of file
+        Returns:
+            List[str]: List of translated texts, in input order
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.batch_translate, texts, target_language)
+    
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get request statistics.
+        
+        Returns:
+            Dict[str, int]: Requests sent, segments translated and placeholder-loss incidents
+        """
+        with self._stats_lock:
+            return dict(self.stats)
\ No newline at end of file
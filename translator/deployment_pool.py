@@ -0,0 +1,280 @@
+"""
+Pool of LLM deployments that LLMTranslator load-balances its calls across.
+"""
+
+import os
+import json
+import time
+import threading
+from typing import Optional, List, Dict, Any, Iterable
+
+from utils.logger import logger
+from utils.rate_limiter import RateLimiter, get_rate_limiter
+
+
+class Deployment:
+    """
+    A single model endpoint (e.g. one Azure OpenAI deployment in one region).
+    """
+    
+    def __init__(
+        self,
+        model: str,
+        api_key: Optional[str] = None,
+        api_base: Optional[str] = None,
+        api_version: Optional[str] = None,
+        weight: float = 1.0,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        name: Optional[str] = None
+    ):
+        """
+        Initialize the deployment.
+        
+        Args:
+            model: LiteLLM model name (e.g. 'azure/attack-gpt4o')
+            api_key: API key of the endpoint
+            api_base: Base URL of the endpoint
+            api_version: API version
+            weight: Relative share of traffic the deployment should receive
+            requests_per_minute: Request quota of the deployment
+            tokens_per_minute: Token quota of the deployment
+            name: Unique name used in logs and rate limit buckets (defaults to model@api_base)
+        """
+        self.model = model
+        self.api_key = api_key
+        self.api_base = api_base
+        self.api_version = api_version
+        self.weight = weight if weight > 0 else 1.0
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.name = name or (f"{model}@{api_base}" if api_base else model)
+        
+        # Rate limit buckets of this deployment
+        self.requests_bucket = f"llm:{self.name}:requests"
+        self.tokens_bucket = f"llm:{self.name}:tokens"
+        
+        # Routing state
+        self.outstanding = 0
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0
+        
+        # Statistics
+        self.stats = {
+            "calls": 0,
+            "failures": 0,
+            "ejections": 0
+        }
+    
+    def api_params(self) -> Dict[str, Any]:
+        """
+        Get the provider-specific LiteLLM parameters of this deployment.
+        
+        Returns:
+            Dict[str, Any]: Model name and credentials to add to a completion request
+        """
+        params = {"model": self.model, "api_key": self.api_key}
+        if "azure" in self.model.lower():
+            params.update({
+                "api_base": self.api_base,
+                "api_version": self.api_version
+            })
+        elif self.api_base:
+            params["api_base"] = self.api_base
+        return params
+    
+    def is_available(self, now: float) -> bool:
+        """Whether the deployment is currently in rotation."""
+        return now >= self.ejected_until
+
+
+class DeploymentPool:
+    """
+    Routes completion calls across several deployments.
+    Each call goes to the available deployment with the fewest outstanding requests
+    relative to its weight, preferring deployments with more remaining quota.
+    Deployments that fail repeatedly are ejected for a cool-down period and
+    reinstated automatically once it expires.
+    """
+    
+    def __init__(
+        self,
+        deployments: List[Deployment],
+        rate_limiter: Optional[RateLimiter] = None,
+        failure_threshold: int = 3,
+        ejection_seconds: float = 30.0
+    ):
+        """
+        Initialize the deployment pool.
+        
+        Args:
+            deployments: Deployments to route across
+            rate_limiter: Rate limiter holding the deployments' quotas (defaults to the shared limiter)
+            failure_threshold: Consecutive failures after which a deployment is ejected
+            ejection_seconds: How long an ejected deployment stays out of rotation
+        """
+        if not deployments:
+            raise ValueError("A deployment pool needs at least one deployment")
+        
+        self.deployments = deployments
+        self.failure_threshold = failure_threshold
+        self.ejection_seconds = ejection_seconds
+        self._lock = threading.Lock()
+        
+        # Configure the quota buckets of deployments that declare one
+        self.rate_limiter = None
+        if any(d.requests_per_minute or d.tokens_per_minute for d in deployments):
+            self.rate_limiter = rate_limiter or get_rate_limiter()
+            for deployment in deployments:
+                if deployment.requests_per_minute:
+                    self.rate_limiter.configure(deployment.requests_bucket, deployment.requests_per_minute)
+                if deployment.tokens_per_minute:
+                    self.rate_limiter.configure(deployment.tokens_bucket, deployment.tokens_per_minute)
+        
+        logger.info(f"Deployment pool initialized with {len(deployments)} deployment(s): "
+                    f"{', '.join(d.name for d in deployments)}")
+    
+    @classmethod
+    def from_config(cls, entries: Iterable[Dict[str, Any]], **kwargs) -> "DeploymentPool":
+        """
+        Create a pool from a list of deployment entries.
+        Each entry holds the Deployment arguments; 'api_key_env' may name an
+        environment variable to read the key from instead of 'api_key'.
+        
+        Args:
+            entries: Deployment entries
+            **kwargs: Additional DeploymentPool arguments
+        
+        Returns:
+            DeploymentPool: The configured pool
+        """
+        deployments = []
+        for entry in entries:
+            entry = dict(entry)
+            api_key_env = entry.pop("api_key_env", None)
+            if api_key_env and not entry.get("api_key"):
+                entry["api_key"] = os.environ.get(api_key_env)
+            deployments.append(Deployment(**entry))
+        return cls(deployments, **kwargs)
+    
+    @classmethod
+    def from_env(cls, **kwargs) -> Optional["DeploymentPool"]:
+        """
+        Create a pool from LLM_DEPLOYMENTS (a JSON list) or LLM_DEPLOYMENTS_FILE (path to a JSON list).
+        
+        Args:
+            **kwargs: Additional DeploymentPool arguments
+        
+        Returns:
+            Optional[DeploymentPool]: The configured pool, or None if neither variable is set
+        """
+        config = os.environ.get("LLM_DEPLOYMENTS")
+        config_file = os.environ.get("LLM_DEPLOYMENTS_FILE")
+        
+        if config:
+            entries = json.loads(config)
+        elif config_file:
+            with open(config_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        else:
+            return None
+        
+        return cls.from_config(entries, **kwargs)
+    
+    def _quota_fraction(self, deployment: Deployment) -> float:
+        """Get the smallest remaining share of the deployment's request and token quotas."""
+        if self.rate_limiter is None:
+            return 1.0
+        
+        fractions = [
+            self.rate_limiter.remaining_fraction(bucket)
+            for bucket in (deployment.requests_bucket, deployment.tokens_bucket)
+        ]
+        fractions = [f for f in fractions if f is not None]
+        return min(fractions) if fractions else 1.0
+    
+    def acquire(self, exclude: Optional[Iterable[Deployment]] = None) -> Deployment:
+        """
+        Pick the deployment for the next call and count it as outstanding.
+        
+        Args:
+            exclude: Deployments to avoid (e.g. ones that just failed), unless no other is available
+        
+        Returns:
+            Deployment: The selected deployment; release() must be called when the call ends
+        """
+        exclude = set(id(d) for d in (exclude or ()))
+        now = time.time()
+        
+        # Read the quotas before taking the lock, so routing decisions never wait on the rate limiter
+        quotas = {}
+        if self.rate_limiter is not None and len(self.deployments) > 1:
+            quotas = {id(d): self._quota_fraction(d) for d in self.deployments}
+        
+        with self._lock:
+            candidates = [d for d in self.deployments if d.is_available(now) and id(d) not in exclude]
+            if not candidates:
+                candidates = [d for d in self.deployments if d.is_available(now)]
+            if not candidates:
+                # Everything is ejected: reinstate the deployment whose cool-down ends first
+                candidates = [min(self.deployments, key=lambda d: d.ejected_until)]
+            
+            if len(candidates) == 1:
+                selected = candidates[0]
+            else:
+                # Least outstanding requests per unit of weight, scaled by remaining quota;
+                # ties (e.g. sequential traffic) go to the deployment with the fewest calls per weight
+                selected = min(
+                    candidates,
+                    key=lambda d: (
+                        d.outstanding / d.weight / max(quotas.get(id(d), 1.0), 0.05),
+                        d.stats["calls"] / d.weight
+                    )
+                )
+            
+            selected.outstanding += 1
+            selected.stats["calls"] += 1
+            return selected
+    
+    def release(self, deployment: Deployment, success: Optional[bool]) -> None:
+        """
+        Record the outcome of a call routed to a deployment.
+        
+        Args:
+            deployment: Deployment returned by acquire()
+            success: Whether the call succeeded, or None if its outcome says nothing about the
+                deployment's health (e.g. a fatal error caused by the request itself)
+        """
+        with self._lock:
+            deployment.outstanding -= 1
+            
+            if success is None:
+                return
+            
+            if success:
+                if deployment.consecutive_failures >= self.failure_threshold:
+                    logger.info(f"Deployment {deployment.name} reinstated")
+                deployment.consecutive_failures = 0
+                return
+            
+            deployment.stats["failures"] += 1
+            deployment.consecutive_failures += 1
+            
+            if deployment.consecutive_failures == self.failure_threshold and len(self.deployments) > 1:
+                deployment.ejected_until = time.time() + self.ejection_seconds
+                deployment.stats["ejections"] += 1
+                logger.warning(f"Deployment {deployment.name} ejected for {self.ejection_seconds:g} seconds "
+                               f"after {deployment.consecutive_failures} consecutive failures")
+            elif deployment.consecutive_failures > self.failure_threshold:
+                # Failed again after being reinstated: put it back in cool-down
+                deployment.ejected_until = time.time() + self.ejection_seconds
+    
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Get per-deployment call statistics.
+        
+        Returns:
+            Dict[str, Dict[str, int]]: Calls, failures and ejections by deployment name
+        """
+        with self._lock:
+            return {d.name: dict(d.stats) for d in self.deployments}
@@ -0,0 +1,157 @@
+"""
+Cheap local difficulty scoring used to route segments to a shorter translation pipeline.
+"""
+
+import re
+import threading
+from difflib import SequenceMatcher
+from typing import Optional, Dict, Tuple, Any
+
+from utils.logger import logger
+from utils.math_preserver import SimpleMathPreserver
+
+
+class DifficultyScorer:
+    """
+    Scores how hard a segment is to translate from local features only and maps the
+    score to a pipeline tier:
+    - 'mt_only': keep the machine translation (or, without MT, the first LLM translation)
+    - 'mt_enhance': machine translation plus LLM enhancement, without verification and safety checks
+    - 'full': the complete pipeline
+    """
+    
+    TIERS = ("mt_only", "mt_enhance", "full")
+    
+    # (mt_only below, full at or above) score thresholds by dataset type
+    DEFAULT_THRESHOLDS = {
+        "math": (0.12, 0.4),
+        "general": (0.15, 0.45),
+        "technical": (0.12, 0.4),
+        "gaia": (0.15, 0.45),
+        "swe-bench": (0.1, 0.35),
+        "asb": (0.15, 0.45)
+    }
+    
+    # Relative weight of each feature in the score
+    DEFAULT_WEIGHTS = {
+        "length": 0.35,
+        "math_density": 0.3,
+        "question": 0.3,
+        "code": 0.2,
+        "mt_similarity": 0.35
+    }
+    
+    # Number of words at which the length feature saturates
+    LONG_SEGMENT_WORDS = 60
+    
+    CODE_PATTERN = re.compile(r"```|^( {4}|\t)\S", re.MULTILINE)
+    
+    def __init__(
+        self,
+        dataset_type: str = "general",
+        thresholds: Optional[Dict[str, Tuple[float, float]]] = None,
+        weights: Optional[Dict[str, float]] = None
+    ):
+        """
+        Initialize the difficulty scorer.
+        
+        Args:
+            dataset_type: Dataset type whose thresholds are used
+            thresholds: Per-dataset (mt_only below, full at or above) thresholds overriding the defaults
+            weights: Feature weights overriding the defaults
+        """
+        all_thresholds = dict(self.DEFAULT_THRESHOLDS)
+        all_thresholds.update(thresholds or {})
+        self.dataset_type = dataset_type
+        self.mt_only_below, self.full_above = all_thresholds.get(dataset_type, all_thresholds["general"])
+        
+        self.weights = dict(self.DEFAULT_WEIGHTS)
+        self.weights.update(weights or {})
+        
+        # Statistics
+        self._lock = threading.Lock()
+        self.stats = {tier: 0 for tier in self.TIERS}
+        
+        logger.info(f"Difficulty scorer initialized for {dataset_type} "
+                    f"(mt_only < {self.mt_only_below:g}, full >= {self.full_above:g})")
+    
+    def features(self, text: str, machine_translation: Optional[str] = None) -> Dict[str, float]:
+        """
+        Compute the difficulty features of a segment, each between 0 and 1.
+        
+        Args:
+            text: Source text, with math placeholders if math was extracted
+            machine_translation: Machine translation of the text, if available
+            
+        Returns:
+            Dict[str, float]: Feature values by name ('mt_similarity' only when an MT is given)
+        """
+        placeholders = len(SimpleMathPreserver.PLACEHOLDER_PATTERN.findall(text))
+        plain_text = SimpleMathPreserver.PLACEHOLDER_PATTERN.sub(" ", text)
+        words = len(plain_text.split())
+        
+        features = {
+            "length": min(1.0, words / self.LONG_SEGMENT_WORDS),
+            "math_density": min(1.0, 4 * placeholders / max(words + placeholders, 1)),
+            "question": 1.0 if "?" in text else 0.0,
+            "code": 1.0 if self.CODE_PATTERN.search(text) else 0.0
+        }
+        
+        if machine_translation is not None:
+            # An MT output close to its source usually means it was left (partly) untranslated
+            plain_translation = SimpleMathPreserver.PLACEHOLDER_PATTERN.sub(" ", machine_translation)
+            features["mt_similarity"] = SequenceMatcher(None, plain_text, plain_translation).ratio()
+        
+        return features
+    
+    def score(self, text: str, machine_translation: Optional[str] = None) -> float:
+        """
+        Score the difficulty of a segment.
+        
+        Args:
+            text: Source text, with math placeholders if math was extracted
+            machine_translation: Machine translation of the text, if available
+            
+        Returns:
+            float: Weighted average of the features, between 0 (easy) and 1 (hard)
+        """
+        features = self.features(text, machine_translation)
+        total_weight = sum(self.weights[name] for name in features)
+        if not total_weight:
+            return 1.0
+        return sum(self.weights[name] * value for name, value in features.items()) / total_weight
+    
+    def tier(self, text: str, machine_translation: Optional[str] = None) -> str:
+        """
+        Choose the pipeline tier of a segment and count it.
+        
+        Args:
+            text: Source text, with math placeholders if math was extracted
+            machine_translation: Machine translation of the text, if available
+            
+        Returns:
+            str: 'mt_only', 'mt_enhance' or 'full'
+        """
+        score = self.score(text, machine_translation)
+        if score < self.mt_only_below:
+            tier = "mt_only"
+        elif score < self.full_above:
+            tier = "mt_enhance"
+        else:
+            tier = "full"
+        
+        with self._lock:
+            self.stats[tier] += 1
+        return tier
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get the number of segments routed to each tier.
+        
+        Returns:
+            Dict[str, Any]: Count by tier and the total
+        """
+        with self._lock:
+            stats = dict(self.stats)
+        stats["total"] = sum(stats[tier] for tier in self.TIERS)
+        return stats
\ No newline at end of file
@@ -0,0 +1,193 @@
+"""
+Translation of long documents as concurrently translated chunks.
+"""
+
+import asyncio
+import threading
+import concurrent.futures
+from typing import Optional, List, Dict, Any
+
+from .base_translator import BaseTranslator
+from utils.logger import logger
+from utils.segmenter import DocumentSegmenter
+
+
+class DocumentTranslator(BaseTranslator):
+    """
+    Translates a document by splitting it into paragraph and sentence chunks,
+    translating the chunks concurrently with another translator and reassembling
+    them with the document's original whitespace and line breaks.
+    Latency then follows the slowest chunk rather than the length of the document.
+    """
+    
+    def __init__(
+        self,
+        translator: BaseTranslator,
+        segmenter: Optional[DocumentSegmenter] = None,
+        max_workers: int = 8,
+        context_chunks: int = 0
+    ):
+        """
+        Initialize the document translator.
+        
+        Args:
+            translator: Translator used for each chunk
+            segmenter: Segmenter splitting documents into chunks (defaults to DocumentSegmenter())
+            max_workers: Maximum number of chunks translated concurrently
+            context_chunks: Number of neighbouring chunks on each side passed as read-only context
+                (only used with translators that support context)
+        """
+        # Math is handled by the chunk translator
+        super().__init__(use_math_preservation=False)
+        
+        self.translator = translator
+        self.segmenter = segmenter or DocumentSegmenter()
+        self.max_workers = max_workers
+        self.context_chunks = context_chunks if translator.supports_context else 0
+        
+        if context_chunks and not translator.supports_context:
+            logger.warning(f"{translator.__class__.__name__} does not accept context. "
+                           f"Translating chunks without neighbouring context.")
+        
+        # Statistics
+        self._lock = threading.Lock()
+        self.stats = {
+            "documents": 0,
+            "chunks": 0,
+            "passthrough_pieces": 0
+        }
+    
+    def _prepare(self, text: str):
+        """
+        Segment a document and collect the chunks to translate.
+        
+        Args:
+            text: Document text
+        
+        Returns:
+            Tuple containing:
+                - Pieces of the document with whether each is translated
+                - Indices of the translatable pieces
+        """
+        pieces = self.segmenter.segment(text)
+        chunk_indices = [i for i, (_, translatable) in enumerate(pieces) if translatable]
+        
+        with self._lock:
+            self.stats["documents"] += 1
+            self.stats["chunks"] += len(chunk_indices)
+            self.stats["passthrough_pieces"] += len(pieces) - len(chunk_indices)
+        return pieces, chunk_indices
+    
+    def _context(self, chunks: List[str], position: int) -> Optional[str]:
+        """
+        Get the neighbouring chunks of a chunk.
+        
+        Args:
+            chunks: Translatable chunks of the document, in order
+            position: Position of the chunk in the list
+        
+        Returns:
+            Optional[str]: The neighbouring chunks, or None if context is disabled
+        """
+        if not self.context_chunks:
+            return None
+        before = chunks[max(0, position - self.context_chunks):position]
+        after = chunks[position + 1:position + 1 + self.context_chunks]
+        return "\n\n".join(before + ["[...]"] + after) if before or after else None
+    
+    def _translate_chunk(self, chunk: str, target_language: str, context: Optional[str]) -> str:
+        """Translate one chunk, falling back to the source chunk if translation fails."""
+        try:
+            if context:
+                return self.translator.translate(chunk, target_language, context=context)
+            return self.translator.translate(chunk, target_language)
+        except Exception as e:
+            logger.error(f"Error translating document chunk: {e}")
+            return chunk
+    
+    async def _atranslate_chunk(self, chunk: str, target_language: str, context: Optional[str]) -> str:
+        """Async version of _translate_chunk()."""
+        try:
+            if context:
+                return await self.translator.atranslate(chunk, target_language, context=context)
+            return await self.translator.atranslate(chunk, target_language)
+        except Exception as e:
+            logger.error(f"Error translating document chunk: {e}")
+            return chunk
+    
+    @staticmethod
+    def _reassemble(pieces, chunk_indices: List[int], translations: List[str]) -> str:
+        """Put the translated chunks back between the untranslated pieces."""
+        texts = [piece for piece, _ in pieces]
+        for index, translation in zip(chunk_indices, translations):
+            texts[index] = translation
+        return "".join(texts)
+    
+    def translate(self, text: str, target_language: str) -> str:
+        """
+        Translate a document chunk by chunk.
+        
+        Args:
+            text: Document text
+            target_language: Target language code or name
+        
+        Returns:
+            str: Translated document
+        """
+        if not text:
+            return text
+        
+        pieces, chunk_indices = self._prepare(text)
+        chunks = [pieces[i][0] for i in chunk_indices]
+        if not chunks:
+            return text
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as executor:
+            translations = list(executor.map(
+                lambda position: self._translate_chunk(chunks[position], target_language,
+                                                       self._context(chunks, position)),
+                range(len(chunks))
+            ))
+        
+        logger.info(f"Translated document of {len(chunks)} chunks")
+        return self._reassemble(pieces, chunk_indices, translations)
+    
+    async def atranslate(self, text: str, target_language: str) -> str:
+        """
+        Translate a document chunk by chunk without blocking the event loop.
+        
+        Args:
+            text: Document text
+            target_language: Target language code or name
+        
+        Returns:
+            str: Translated document
+        """
+        if not text:
+            return text
+        
+        pieces, chunk_indices = self._prepare(text)
+        chunks = [pieces[i][0] for i in chunk_indices]
+        if not chunks:
+            return text
+        
+        semaphore = asyncio.Semaphore(self.max_workers)
+        
+        async def translate_one(position: int) -> str:
+            async with semaphore:
+                return await self._atranslate_chunk(chunks[position], target_language,
+                                                    self._context(chunks, position))
+        
+        translations = await asyncio.gather(*(translate_one(position) for position in range(len(chunks))))
+        logger.info(f"Translated document of {len(chunks)} chunks")
+        return self._reassemble(pieces, chunk_indices, translations)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get segmentation statistics.
+        
+        Returns:
+            Dict[str, Any]: Documents translated, chunks sent and pieces kept untranslated
+        """
+        with self._lock:
+            return dict(self.stats)
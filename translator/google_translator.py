@@ -3,10 +3,14 @@ Google Cloud Translation API implementation.
 """
 
 import os
-from typing import Optional, List, Dict
+import asyncio
+import concurrent.futures
+from typing import Optional, List, Dict, Sequence
 
 from .base_translator import BaseTranslator
 from utils.logger import logger
+from utils.fallback_text import FallbackText
+from utils.rate_limiter import RateLimiter, get_rate_limiter, env_limit
 
 
 class GoogleTranslator(BaseTranslator):
@@ -14,15 +18,46 @@ class GoogleTranslator(BaseTranslator):
     Translator implementation using Google Cloud Translation API.
     """
     
-    def __init__(self, api_key_path: Optional[str] = None, use_math_preservation: bool = True):
+    # Map language names to codes if needed
+    LANGUAGE_CODES = {
+        'Japanese': 'ja',
+        'Hebrew': 'he',  # Google uses 'he' for Hebrew
+        'Russian': 'ru',
+        'Spanish': 'es',
+        'Chinese': 'zh',
+        'French': 'fr',
+        'German': 'de',
+        'Korean': 'ko',
+        'Italian': 'it',
+        'Portuguese': 'pt',
+        'Arabic': 'ar',
+        'Hindi': 'hi',
+        'Bengali': 'bn',
+        'English': 'en'
+    }
+    
+    # Limits of a single Translation API v2 request
+    MAX_SEGMENTS = 128
+    MAX_REQUEST_CHARACTERS = 30000
+    
+    def __init__(self, api_key_path: Optional[str] = None, use_math_preservation: bool = True,
+                 characters_per_minute: Optional[float] = None, rate_limiter: Optional[RateLimiter] = None,
+                 max_workers: int = 4,
+                 code_protection: Sequence[str] = ()):
         """
         Initialize the Google translator.
         
         Args:
             api_key_path: Path to Google Cloud API key JSON file
             use_math_preservation: Whether to use math preservation functionality
+            code_protection: Kinds of code spans kept out of translation (see CodePreserver.KINDS)
+            characters_per_minute: Character quota (defaults to GOOGLE_CHARACTERS_PER_MINUTE)
+            rate_limiter: Rate limiter holding the quota (defaults to the process-wide shared limiter)
+            max_workers: Number of batch requests batch_translate() sends concurrently
         """
-        super().__init__(use_math_preservation=use_math_preservation)
+        super().__init__(use_math_preservation=use_math_preservation, code_protection=code_protection)
+        self.max_workers = max_workers
+        self._setup_rate_limit("google:characters", characters_per_minute or env_limit("GOOGLE_CHARACTERS_PER_MINUTE"), rate_limiter)
         
         try:
             # Set credentials environment variable if provided
@@ -53,28 +88,10 @@ class GoogleTranslator(BaseTranslator):
         Returns:
             str: Translated text
         """
-        if not text:
+        if not text or self._skip(text):
             return text
         
-        # Map language names to codes if needed
-        language_mapping = {
-            'Japanese': 'ja',
-            'Hebrew': 'he',  # Google uses 'he' for Hebrew
-            'Russian': 'ru',
-            'Spanish': 'es',
-            'Chinese': 'zh',
-            'French': 'fr',
-            'German': 'de',
-            'Korean': 'ko',
-            'Italian': 'it',
-            'Portuguese': 'pt',
-            'Arabic': 'ar',
-            'Hindi': 'hi',
-            'Bengali': 'bn',
-            'English': 'en'
-        }
-        
-        target_code = language_mapping.get(target_language, target_language)
+        target_code = self.LANGUAGE_CODES.get(target_language, target_language)
         
         try:
             # If math preservation is enabled, extract mathematical expressions first
@@ -84,6 +101,9 @@ class GoogleTranslator(BaseTranslator):
             if self.use_math_preservation:
                 modified_text, replacements = self.math_preserver.extract_math(text)
             
+            # Wait for the character quota
+            self._acquire_characters(modified_text)
+            
             # Translate the modified text
             result = self.client.translate(modified_text, target_language=target_code)
             translated_text = result['translatedText']
@@ -100,25 +120,109 @@ class GoogleTranslator(BaseTranslator):
             # If translation fails, try to restore math expressions in original text
             if self.use_math_preservation and 'replacements' in locals():
                 try:
-                    return self.math_preserver.restore_math(text, replacements)
+                    return FallbackText(self.math_preserver.restore_math(text, replacements))
                 except:
                     pass
-            return text  # Return original text as fallback
+            return FallbackText(text)  # Return original text as fallback
+    
+    def _translate_chunk(self, segments: List[str], target_code: str) -> List[Optional[str]]:
+        """
+        Translate the segments of one request.
+        If the batch request fails, each segment is retried on its own so that
+        one bad segment does not fail the others.
+        
+        Args:
+            segments: Texts to translate (with math already replaced by placeholders)
+            target_code: Google language code
+            
+        Returns:
+            List[Optional[str]]: Translated texts, None for segments that could not be translated
+        """
+        self._acquire_characters("".join(segments))
+        try:
+            results = self.client.translate(segments, target_language=target_code)
+            return [result['translatedText'] for result in results]
+        except Exception as e:
+            if len(segments) == 1:
+                logger.error(f"Google translation error: {e}")
+                return [None]
+            logger.warning(f"Google batch translation of {len(segments)} segments failed: {e}. "
+                           f"Translating them individually")
+        
+        translations = []
+        for segment in segments:
+            try:
+                translations.append(self.client.translate(segment, target_language=target_code)['translatedText'])
+            except Exception as e:
+                logger.error(f"Google translation error: {e}")
+                translations.append(None)
+        return translations
     
     def batch_translate(self, texts: List[str], target_language: str) -> List[str]:
         """
         Translate a batch of texts using Google Translate.
-        Uses the built-in batch functionality for efficiency.
+        Texts are sent as lists of up to MAX_SEGMENTS segments (and MAX_REQUEST_CHARACTERS
+        characters) per request, with up to max_workers requests in flight.
+        Math is extracted from and restored in all texts of the batch in one pass.
         
         Args:
             texts: List of texts to translate
             target_language: Target language code
             
         Returns:
-            List[str]: List of translated texts
+            List[str]: List of translated texts (the original text, as a FallbackText, for texts that failed)
         """
         if not texts:
             return []
+        
+        target_code = self.LANGUAGE_CODES.get(target_language, target_language)
+        
+        # Extract math from all texts in one pass; empty and untranslatable texts are not sent
+        indices = [i for i, text in enumerate(texts) if text and not self._skip(text)]
+        if self.use_math_preservation:
+            segments, replacements, _ = self.math_preserver.extract_batch([texts[i] for i in indices])
+        else:
+            segments, replacements = [texts[i] for i in indices], [{} for _ in indices]
+        
+        chunks = self._chunk_indices(segments, self.MAX_SEGMENTS, self.MAX_REQUEST_CHARACTERS)
+        translations = [None] * len(segments)
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks) or 1)) as executor:
+            futures = {
+                executor.submit(self._translate_chunk, [segments[j] for j in chunk], target_code): chunk
+                for chunk in chunks
+            }
+            for future in concurrent.futures.as_completed(futures):
+                for j, translation in zip(futures[future], future.result()):
+                    translations[j] = translation
+        
+        logger.info(f"Google translated {len(segments)} texts in {len(chunks)} request(s)")
+        
+        if self.use_math_preservation:
+            translations = self.math_preserver.restore_batch(translations, replacements)
+        
+        results = list(texts)
+        for j, i in enumerate(indices):
+            if translations[j] is None:
+                # Return original text as fallback
+                results[i] = FallbackText(texts[i])
+                continue
+            results[i] = translations[j]
+        return results
+    
+    async def abatch_translate(self, texts: List[str], target_language: str,
+                               max_concurrency: Optional[int] = None) -> List[str]:
+        """
+        Translate a batch of texts without blocking the event loop.
+        Runs the batched batch_translate() in the loop's default executor.
+        
+        Args:
+            texts: List of texts to translate
+            target_language: Target language code
+            max_concurrency: Unused; requests are bounded by max_workers
             
-        # Process each text individually to preserve math in each
-        return [self.translate(text, target_language) for text in texts]
\ No newline at end of file
+        Returns:
+            List[str]: List of translated texts, in input order
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.batch_translate, texts, target_language)
\ No newline at end of file
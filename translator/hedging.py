@@ -0,0 +1,240 @@
+"""
+Request hedging for LLM completion calls to cut tail latency.
+"""
+
+import time
+import asyncio
+import threading
+import concurrent.futures
+from collections import deque
+from typing import Optional, Callable, Any, Awaitable, Dict
+
+from utils.logger import logger
+
+
+class HedgePolicy:
+    """
+    Decides when to send a duplicate ("hedge") of a slow completion call.
+    A hedge is sent once a call has been outstanding longer than a percentile of
+    recently observed call latencies, as long as the share of hedged calls stays
+    within the budget. The first answer wins; the loser is left to finish in the
+    background so the latency saved by hedging can be measured.
+    """
+    
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        max_hedge_ratio: float = 0.05,
+        min_samples: int = 20,
+        window: int = 500,
+        max_workers: int = 32
+    ):
+        """
+        Initialize the hedge policy.
+        
+        Args:
+            percentile: Latency percentile after which a hedge is sent
+            max_hedge_ratio: Maximum share of calls that may be hedged (e.g. 0.05 = 5% extra calls)
+            min_samples: Number of observed latencies needed before hedging starts
+            window: Number of recent latencies the percentile is computed over
+            max_workers: Thread pool size for hedged calls on the synchronous path
+        """
+        self.percentile = percentile
+        self.max_hedge_ratio = max_hedge_ratio
+        self.min_samples = min_samples
+        self.max_workers = max_workers
+        
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._background_tasks = set()
+        
+        # Statistics
+        self.stats = {
+            "calls": 0,
+            "hedged": 0,
+            "hedge_wins": 0,
+            "latency_saved": 0.0
+        }
+    
+    def record_latency(self, seconds: float) -> None:
+        """
+        Record the latency of a completed call.
+        
+        Args:
+            seconds: Duration of the call
+        """
+        with self._lock:
+            self._latencies.append(seconds)
+    
+    def hedge_delay(self) -> Optional[float]:
+        """
+        Get how long to wait for a call before hedging it.
+        
+        Returns:
+            Optional[float]: Delay in seconds, or None while too few latencies have been observed
+        """
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100.0))
+        return ordered[index]
+    
+    def _start_call(self) -> None:
+        """Count a new call."""
+        with self._lock:
+            self.stats["calls"] += 1
+    
+    def _try_start_hedge(self) -> bool:
+        """Reserve a hedge if the budget allows it."""
+        with self._lock:
+            if self.stats["hedged"] + 1 > self.max_hedge_ratio * self.stats["calls"]:
+                return False
+            self.stats["hedged"] += 1
+            return True
+    
+    def _record_saving(self, winner_end: float, loser_end: float) -> None:
+        """Record the latency saved by a hedge that won its race."""
+        with self._lock:
+            self.stats["latency_saved"] += max(0.0, loser_end - winner_end)
+    
+    def _get_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        """Get the thread pool used for hedged calls on the synchronous path."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="llm-hedge"
+                )
+            return self._executor
+    
+    def call(self, make_call: Callable[[], Any]) -> Any:
+        """
+        Run a call, hedging it with a duplicate if it is slow.
+        
+        Args:
+            make_call: Function performing the call; invoked once for the primary and once for a hedge
+        
+        Returns:
+            Any: Result of whichever call finished first successfully
+        
+        Raises:
+            Exception: The primary's error if neither call succeeds
+        """
+        self._start_call()
+        delay = self.hedge_delay()
+        if delay is None:
+            return self._timed(make_call)
+        
+        executor = self._get_executor()
+        primary = executor.submit(self._timed, make_call)
+        try:
+            return primary.result(timeout=delay)
+        except concurrent.futures.TimeoutError:
+            pass
+        
+        if not self._try_start_hedge():
+            return primary.result()
+        
+        logger.info(f"LLM call exceeded {delay:.2f}s (p{self.percentile:g}); sending hedge request")
+        hedge = executor.submit(self._timed, make_call)
+        end_times = {}
+        for future in (primary, hedge):
+            future.add_done_callback(lambda f, ends=end_times: ends.setdefault(f, time.time()))
+        
+        done, _ = concurrent.futures.wait([primary, hedge], return_when=concurrent.futures.FIRST_COMPLETED)
+        winner = next(iter(done))
+        if winner.exception() is not None:
+            # The first call to finish failed: fall back to the other one
+            winner = hedge if winner is primary else primary
+            concurrent.futures.wait([winner])
+        
+        self._track_race(winner is hedge, winner, primary if winner is hedge else hedge, end_times)
+        return winner.result()
+    
+    def _track_race(self, hedge_won: bool, winner, loser, end_times: Dict[Any, float]) -> None:
+        """Record the race outcome; the latency saved is known once the losing call finishes."""
+        if not hedge_won:
+            return
+        with self._lock:
+            self.stats["hedge_wins"] += 1
+        
+        winner_end = end_times.get(winner, time.time())
+        if loser.done():
+            self._record_saving(winner_end, end_times.get(loser, time.time()))
+        else:
+            loser.add_done_callback(lambda f: self._record_saving(winner_end, time.time()))
+    
+    def _timed(self, make_call: Callable[[], Any]) -> Any:
+        """Run a call and record its latency if it succeeds."""
+        start = time.time()
+        result = make_call()
+        self.record_latency(time.time() - start)
+        return result
+    
+    async def _atimed(self, make_call: Callable[[], Awaitable[Any]]) -> Any:
+        """Async version of _timed()."""
+        start = time.time()
+        result = await make_call()
+        self.record_latency(time.time() - start)
+        return result
+    
+    async def acall(self, make_call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Async version of call().
+        
+        Args:
+            make_call: Coroutine function performing the call; invoked once for the primary and once for a hedge
+        
+        Returns:
+            Any: Result of whichever call finished first successfully
+        
+        Raises:
+            Exception: The primary's error if neither call succeeds
+        """
+        self._start_call()
+        delay = self.hedge_delay()
+        if delay is None:
+            return await self._atimed(make_call)
+        
+        primary = asyncio.ensure_future(self._atimed(make_call))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or not self._try_start_hedge():
+            return await primary
+        
+        logger.info(f"LLM call exceeded {delay:.2f}s (p{self.percentile:g}); sending hedge request")
+        hedge = asyncio.ensure_future(self._atimed(make_call))
+        end_times = {}
+        for task in (primary, hedge):
+            task.add_done_callback(lambda t, ends=end_times: ends.setdefault(t, time.time()))
+        
+        done, _ = await asyncio.wait({primary, hedge}, return_when=asyncio.FIRST_COMPLETED)
+        winner = next(iter(done))
+        if winner.exception() is not None:
+            winner = hedge if winner is primary else primary
+            await asyncio.wait({winner})
+        
+        loser = primary if winner is hedge else hedge
+        if not loser.done():
+            # Keep a reference so the losing call can finish in the background
+            self._background_tasks.add(loser)
+            loser.add_done_callback(self._background_tasks.discard)
+            loser.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._track_race(winner is hedge, winner, loser, end_times)
+        return winner.result()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get hedging statistics.
+        
+        Returns:
+            Dict[str, Any]: Calls, hedges, hedge rate, hedge wins, latency saved and current latency percentiles
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            ordered = sorted(self._latencies)
+        stats["hedge_rate"] = stats["hedged"] / stats["calls"] if stats["calls"] else 0.0
+        if ordered:
+            stats["p50_latency"] = ordered[len(ordered) // 2]
+            stats["p99_latency"] = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        return stats
@@ -4,15 +4,20 @@ Hybrid translator that combines machine translation (DeepL or Google) with LLM e
 
 import os
 import time
-import re
 import copy
-from typing import Optional, List, Dict, Any
+import asyncio
+import concurrent.futures
+from typing import Optional, List, Dict, Any, Tuple
 
 from .base_translator import BaseTranslator
 from .google_translator import GoogleTranslator
 from .llm_translator import LLMTranslator
+from .difficulty import DifficultyScorer
 from utils.logger import logger
+from utils.fallback_text import FallbackText
+from utils.code_preserver import DATASET_CODE_PROTECTION
 from utils.prompts_manager import PromptsManager
+from utils.translation_memory import TranslationMemory
 
 # Try to import DeepL translator if available
 try:
@@ -25,12 +30,24 @@ except ImportError:
 class HybridTranslator(BaseTranslator):
     """
     A hybrid translator that follows an ordered approach:
-    1. Check if the text is a numeric answer - if so, return as is
+    1. Return segments that need no translation (numbers, IDs, URLs, paths, code, ...) as is
     2. Apply machine translation (DeepL or Google)
-    3. Enhance translation using LLM
-    4. Safety check to ensure questions aren't answered instead of translated
+    3. Verify the machine translation with the LLM, translating directly with the LLM if it is unusable
+    4. Enhance translation using LLM
+    5. Safety check to ensure questions aren't answered instead of translated
+    
+    Without a difficulty scorer (the default) every segment takes all steps. With one, each
+    segment is routed by its score once machine translated: 'mt_only' segments stop after
+    step 2 without any LLM call, 'mt_enhance' segments skip steps 3 and 5, and only 'full'
+    segments take every step. Short declarative sentences whose machine translation differs
+    clearly from the source score far below the 'mt_only' thresholds (around 0.02 against
+    0.1-0.15, see DifficultyScorer.DEFAULT_THRESHOLDS), so with routing enabled they keep the
+    machine translation as is.
     """
     
+    # translate() accepts neighbouring document text as read-only context for the LLM steps
+    supports_context = True
+    
     # DeepL supported languages (as of your specification)
     DEEPL_SUPPORTED_LANGUAGES = [
         "ar", "bg", "cs", "da", "de", "el", "en-gb", "en-us", 
@@ -46,7 +63,9 @@ class HybridTranslator(BaseTranslator):
         google_translator: Optional[GoogleTranslator] = None,
         llm_translator: Optional[LLMTranslator] = None,
         dataset_type: str = "math",
-        prompts_dir: str = "prompts"
+        prompts_dir: str = "prompts",
+        difficulty_scorer: Optional[DifficultyScorer] = None,
+        translation_memory: Optional[TranslationMemory] = None
     ):
         """
         Initialize the hybrid translator.
@@ -57,9 +76,17 @@ class HybridTranslator(BaseTranslator):
             llm_translator: LLMTranslator instance
             dataset_type: Type of dataset being translated
             prompts_dir: Directory containing prompt templates
+            difficulty_scorer: Routes easy segments to a shorter pipeline (all segments take the full
+                pipeline if None)
+            translation_memory: Memory of earlier translations; exact matches are reused as is and
+                fuzzy matches replace the machine translation as the draft to enhance
         """
+        # Math and code spans are carved out before any translation stage
         use_math_preservation = (dataset_type == 'math')
-        super().__init__(use_math_preservation=use_math_preservation)
+        super().__init__(
+            use_math_preservation=use_math_preservation,
+            code_protection=DATASET_CODE_PROTECTION.get(dataset_type, ())
+        )
         
         # Store translators
         self.deepl_translator = deepl_translator
@@ -74,6 +101,11 @@ class HybridTranslator(BaseTranslator):
         
         # Store preferences
         self.dataset_type = dataset_type
+        self.difficulty_scorer = difficulty_scorer
+        self.translation_memory = translation_memory
+        
+        # Async batches can keep as many items in flight as the LLM translator allows
+        self.max_concurrency = llm_translator.max_concurrency
         
         # Load hybrid-specific prompts
         self.prompts_manager = PromptsManager(prompts_dir)
@@ -97,36 +129,38 @@ class HybridTranslator(BaseTranslator):
             self.prompts = default_prompts
             self.prompts_manager.update_prompts(dataset_type, "hybrid", default_prompts)
     
-    def _is_numeric_answer(self, text: str) -> bool:
+    @staticmethod
+    def _machine_translation_failed(verification_result: str) -> bool:
         """
-        Check if the text is a numeric answer, possibly with minor additional characters.
+        Interpret the LLM verdict on a machine translation.
         
         Args:
-            text: Text to check
+            verification_result: Response of the machine translation check prompt
             
         Returns:
-            bool: True if the text is primarily a numeric answer
+            bool: True if the machine translation was judged unusable
         """
-        # Strip whitespace
-        text = text.strip()
-        
-        # Check if it's a pure number (integer or decimal)
-        if re.match(r'^\d+(\.\d+)?$', text):
-            return True
-        
-        # Check if it's a number with units or simple text (e.g., "42 meters", "43 kg", "$50")
-        if re.match(r'^\$?\d+(\.\d+)?\s*[a-zA-Z]*$', text):
-            return True
-        
-        # Check if it's a simple arithmetic expression result (e.g., "= 42")
-        if re.match(r'^=\s*\d+(\.\d+)?$', text):
-            return True
+        return (
+            verification_result.strip().upper() == "FAILED" or
+            "FAILED" in verification_result.upper() or
+            "NO" in verification_result.upper() or
+            "UNUSABLE" in verification_result.upper()
+        )
+    
+    def _difficulty_tier(self, text: str, machine_translation: Optional[str] = None) -> str:
+        """
+        Choose the pipeline tier of a segment with the difficulty scorer.
         
-        # If the text is very short (less than 5 chars) and contains mainly digits
-        if len(text) < 5 and sum(c.isdigit() for c in text) / len(text) > 0.5:
-            return True
+        Args:
+            text: Source text, with math placeholders if math was extracted
+            machine_translation: Machine translation of the text, if available
             
-        return False
+        Returns:
+            str: 'mt_only', 'mt_enhance' or 'full' ('full' when no scorer is configured)
+        """
+        if self.difficulty_scorer is None:
+            return "full"
+        return self.difficulty_scorer.tier(text, machine_translation)
     
     def _check_translation_safety(self, original_text: str, translated_text: str) -> bool:
         """
@@ -159,6 +193,33 @@ class HybridTranslator(BaseTranslator):
             # Default to safe in case of errors
             return True
     
+    async def _acheck_translation_safety(self, original_text: str, translated_text: str) -> bool:
+        """
+        Async version of _check_translation_safety().
+        
+        Args:
+            original_text: Original English text
+            translated_text: Translated text
+            
+        Returns:
+            bool: True if the translation is safe, False if it appears to be answering a question
+        """
+        try:
+            system_prompt = self.prompts["safety_check_prompt"]
+            user_prompt = f"{original_text}\n\n{translated_text}"
+            
+            response = await self.llm_translator._aget_completion(system_prompt, user_prompt)
+            is_safe = response.strip().upper() != "ISSUE"
+            
+            if not is_safe:
+                logger.warning(f"Safety check detected a question was answered instead of translated")
+            
+            return is_safe
+            
+        except Exception as e:
+            logger.warning(f"Error in translation safety check: {e}")
+            return True
+    
     def _select_machine_translator(self, target_language: str):
         """
         Select the appropriate machine translator based on language support.
@@ -188,13 +249,14 @@ class HybridTranslator(BaseTranslator):
             logger.warning(f"No preferred translator available, using fallback")
             return self.deepl_translator or self.google_translator
     
-    def translate(self, text: str, target_language: str) -> str:
+    def translate(self, text: str, target_language: str, context: Optional[str] = None) -> str:
         """
         Translate text using the ordered hybrid approach.
         
         Args:
             text: Text to translate
             target_language: Target language code or name
+            context: Neighbouring document text passed to the LLM steps as read-only context
             
         Returns:
             str: Translated text
@@ -203,49 +265,268 @@ class HybridTranslator(BaseTranslator):
             return text
         
         try:
-            # Step 1: Check if this is a numeric answer
-            if self._is_numeric_answer(text):
-                logger.info(f"Detected numeric answer, returning as is: {text}")
+            # Step 1: Return segments that need no translation (numbers, IDs, URLs, code, ...) as is
+            if self._skip(text):
                 return text
             
             # Step 2: Extract math expressions if applicable
-            replacements = {}
-            modified_text = copy.deepcopy(text)
+            modified_text, replacements = self._extract_math(text)
+        except Exception as e:
+            logger.error(f"Error during hybrid translation: {e}")
+            return FallbackText(text)
+        
+        return self._translate_extracted(text, modified_text, replacements, target_language, context)
+    
+    def _extract_math(self, text: str) -> Tuple[str, Dict[str, str]]:
+        """
+        Extract math expressions from a source text if math preservation is enabled.
+        
+        Args:
+            text: Source text
             
-            if self.use_math_preservation:
-                modified_text, replacements = self.math_preserver.extract_math(text)
+        Returns:
+            Tuple containing:
+                - Text with placeholders (the text itself without math preservation)
+                - Dictionary mapping placeholders to original expressions
+        """
+        if self.use_math_preservation:
+            return self.math_preserver.extract_math(text)
+        return copy.deepcopy(text), {}
+    
+    @staticmethod
+    def _memory_prompt(text: str, match_source: str, match_translation: str) -> str:
+        """Build the enhancement user prompt with a translation memory match as the draft."""
+        return (f"The draft translation below was made for a similar earlier text; adapt it to the differences.\n"
+                f"Earlier text:\n{match_source}\n\n---\n\n{text}\n\n{match_translation}")
+    
+    def _translate_extracted(self, text: str, modified_text: str, replacements: Dict[str, str],
+                             target_language: str, context: Optional[str] = None) -> str:
+        """
+        Translate a source text whose math was already extracted, reusing the translation memory
+        (see _translate_with_match()).
+        
+        Args:
+            text: Original source text
+            modified_text: Source text with math placeholders
+            replacements: Dictionary mapping placeholders to original expressions
+            target_language: Target language code or name
+            context: Neighbouring document text passed to the LLM steps as read-only context
+            
+        Returns:
+            str: Translated text
+        """
+        if self.translation_memory is None:
+            return (self._run_steps(text, modified_text, replacements, target_language, context))[0]
+        
+        try:
+            match = self.translation_memory.lookup(text, target_language)
+        except Exception as e:
+            logger.error(f"Error looking up the translation memory: {e}")
+            return (self._run_steps(text, modified_text, replacements, target_language, context))[0]
+        
+        return self._translate_with_match(text, modified_text, replacements, target_language, match, context)
+    
+    def _translate_with_match(self, text: str, modified_text: str, replacements: Dict[str, str],
+                              target_language: str, match: Optional[Tuple[str, str, float]],
+                              context: Optional[str] = None) -> str:
+        """
+        Translate a source text whose math was already extracted, given its translation memory match.
+        An exact match is returned without any external call; a fuzzy match is enhanced
+        by the LLM in place of a fresh machine translation. Results are stored in the memory.
+        
+        Args:
+            text: Original source text
+            modified_text: Source text with math placeholders
+            replacements: Dictionary mapping placeholders to original expressions
+            target_language: Target language code or name
+            match: Stored source, its translation and the similarity, or None for a miss
+            context: Neighbouring document text passed to the LLM steps as read-only context
+            
+        Returns:
+            str: Translated text
+        """
+        if match is not None and match[2] >= 1.0:
+            logger.info("Translation memory exact match. Skipping translation.")
+            return match[1]
+        
+        translation = None
+        tier = None
+        if match is not None:
+            match_source, match_translation, similarity = match
+            logger.info(f"Translation memory fuzzy match ({similarity:.0%}). Enhancing the stored translation.")
+            try:
+                # The tier is scored once and reused if the pipeline has to run after all
+                tier = self._difficulty_tier(modified_text, match_translation)
+                system_prompt = self.prompts["translation_prompt"].format(target_language=target_language)
+                user_prompt = self._with_context(self._memory_prompt(text, match_source, match_translation), context)
+                translation = self.llm_translator._get_completion(system_prompt, user_prompt)
+                
+                if tier == "full" and not self._check_translation_safety(text, translation):
+                    logger.warning("Safety check failed - translating without the memory match")
+                    translation = None
+            except Exception as e:
+                logger.error(f"Error enhancing translation memory match: {e}")
+                translation = None
+        
+        # Only translations that went through the whole pipeline are stored, never error fallbacks
+        complete = translation is not None
+        if translation is None:
+            translation, complete = self._run_steps(text, modified_text, replacements, target_language, context, tier)
+        
+        if complete:
+            self._remember(text, translation, target_language)
+        return translation
+    
+    def _remember(self, text: str, translation: str, target_language: str) -> None:
+        """
+        Store a complete translation in the translation memory, if any.
+        
+        Args:
+            text: Original source text
+            translation: Its translation
+            target_language: Target language code or name
+        """
+        if self.translation_memory is None or not translation or translation == text:
+            return
+        try:
+            self.translation_memory.add(text, translation, target_language)
+        except Exception as e:
+            logger.error(f"Error storing the translation in the translation memory: {e}")
+    
+    async def _atranslate_extracted(self, text: str, modified_text: str, replacements: Dict[str, str],
+                                    target_language: str, context: Optional[str] = None) -> str:
+        """
+        Async version of _translate_extracted().
+        
+        Args:
+            text: Original source text
+            modified_text: Source text with math placeholders
+            replacements: Dictionary mapping placeholders to original expressions
+            target_language: Target language code or name
+            context: Neighbouring document text passed to the LLM steps as read-only context
+            
+        Returns:
+            str: Translated text
+        """
+        if self.translation_memory is None:
+            return (await self._arun_steps(text, modified_text, replacements, target_language, context))[0]
+        
+        try:
+            match = self.translation_memory.lookup(text, target_language)
+        except Exception as e:
+            logger.error(f"Error looking up the translation memory: {e}")
+            return (await self._arun_steps(text, modified_text, replacements, target_language, context))[0]
+        
+        return await self._atranslate_with_match(text, modified_text, replacements, target_language, match, context)
+    
+    async def _atranslate_with_match(self, text: str, modified_text: str, replacements: Dict[str, str],
+                                     target_language: str, match: Optional[Tuple[str, str, float]],
+                                     context: Optional[str] = None) -> str:
+        """
+        Async version of _translate_with_match().
+        
+        Args:
+            text: Original source text
+            modified_text: Source text with math placeholders
+            replacements: Dictionary mapping placeholders to original expressions
+            target_language: Target language code or name
+            match: Stored source, its translation and the similarity, or None for a miss
+            context: Neighbouring document text passed to the LLM steps as read-only context
+            
+        Returns:
+            str: Translated text
+        """
+        if match is not None and match[2] >= 1.0:
+            logger.info("Translation memory exact match. Skipping translation.")
+            return match[1]
+        
+        translation = None
+        tier = None
+        if match is not None:
+            match_source, match_translation, similarity = match
+            logger.info(f"Translation memory fuzzy match ({similarity:.0%}). Enhancing the stored translation.")
+            try:
+                # The tier is scored once and reused if the pipeline has to run after all
+                tier = self._difficulty_tier(modified_text, match_translation)
+                system_prompt = self.prompts["translation_prompt"].format(target_language=target_language)
+                user_prompt = self._with_context(self._memory_prompt(text, match_source, match_translation), context)
+                translation = await self.llm_translator._aget_completion(system_prompt, user_prompt)
+                
+                if tier == "full" and not await self._acheck_translation_safety(text, translation):
+                    logger.warning("Safety check failed - translating without the memory match")
+                    translation = None
+            except Exception as e:
+                logger.error(f"Error enhancing translation memory match: {e}")
+                translation = None
+        
+        # Only translations that went through the whole pipeline are stored, never error fallbacks
+        complete = translation is not None
+        if translation is None:
+            translation, complete = await self._arun_steps(text, modified_text, replacements, target_language, context, tier)
+        
+        if complete:
+            self._remember(text, translation, target_language)
+        return translation
+    
+    def _run_steps(self, text: str, modified_text: str, replacements: Dict[str, str],
+                   target_language: str, context: Optional[str] = None,
+                   tier: Optional[str] = None) -> Tuple[str, bool]:
+        """
+        Run steps 3-8 of the hybrid approach on a source text whose math was already extracted.
+        
+        Args:
+            text: Original source text
+            modified_text: Source text with math placeholders
+            replacements: Dictionary mapping placeholders to original expressions
+            target_language: Target language code or name
+            context: Neighbouring document text passed to the LLM steps as read-only context
+            tier: Pipeline tier already chosen for the text (scored from the machine translation if None)
             
+        Returns:
+            Tuple containing:
+                - Translated text
+                - Whether it went through the pipeline (False for error and safety fallbacks)
+        """
+        if self.code_protection and replacements:
+            # Protected code stays a placeholder through the LLM steps as well and is restored at the end
+            translation, complete = self._run_steps(modified_text, modified_text, {}, target_language, context, tier)
+            return self._restore_math(translation, text, replacements), complete
+        
+        try:
             # Step 3: Select and apply machine translation
             machine_translator = self._select_machine_translator(target_language)
             machine_translation = machine_translator.translate(modified_text, target_language)
+            if tier is None:
+                tier = self._difficulty_tier(modified_text, machine_translation)
             
             # Step 4: Restore math expressions if applicable
             if self.use_math_preservation:
-                machine_translation = self.math_preserver.restore_math(machine_translation, replacements)
+                machine_translation = self._restore_math(machine_translation, text, replacements)
                 
-            final_translation = machine_translation
             logger.info(f"Machine translation completed using {machine_translator.__class__.__name__}")
             
-            # Step 5: Verify if machine translation succeeded and is usable
-            system_prompt_verification = self.prompts["machine_translation_check"].format(target_language=target_language)
-            verification_prompt = f"{text}\n\n{machine_translation}"
-            
-            verification_result = self.llm_translator._get_completion(system_prompt_verification, verification_prompt)
-            logger.info(f"Machine translation verification result: {verification_result}")
+            # Easy segments keep the machine translation as is
+            if tier == "mt_only":
+                logger.info("Segment routed to the 'mt_only' tier. Keeping the machine translation.")
+                return machine_translation, True
             
-            # Check if verification indicates machine translation failed
-            machine_translation_failed = (
-                verification_result.strip().upper() == "FAILED" or
-                "FAILED" in verification_result.upper() or
-                "NO" in verification_result.upper() or
-                "UNUSABLE" in verification_result.upper()
-            )
+            # Step 5: Verify if machine translation succeeded and is usable (full tier only)
+            machine_translation_failed = False
+            if tier == "full":
+                system_prompt_verification = self.prompts["machine_translation_check"].format(target_language=target_language)
+                verification_prompt = f"{text}\n\n{machine_translation}"
+                
+                verification_result = self.llm_translator._get_completion(system_prompt_verification, verification_prompt)
+                logger.info(f"Machine translation verification result: {verification_result}")
+                
+                # Check if verification indicates machine translation failed
+                machine_translation_failed = self._machine_translation_failed(verification_result)
             
             # Step 6: If machine translation failed, use LLM for direct translation
             if machine_translation_failed:
                 logger.warning("Machine translation verification failed - using LLM for direct translation")
                 system_prompt_direct = self.prompts["llm_translation"].format(target_language=target_language)
-                direct_prompt = text
+                direct_prompt = self._with_context(text, context)
                 
                 llm_direct_translation = self.llm_translator._get_completion(system_prompt_direct, direct_prompt)
                 logger.info("LLM direct translation completed")
@@ -254,23 +535,21 @@ class HybridTranslator(BaseTranslator):
                 if self.use_math_preservation:
                     llm_direct_translation = self.math_preserver.restore_math(llm_direct_translation, replacements)
                     
-                return llm_direct_translation
+                return llm_direct_translation, True
             
             # Step 7: Enhance translation using LLM
             system_prompt = self.prompts["translation_prompt"].format(target_language=target_language)
-            user_prompt = f"{text}\n\n{machine_translation}"
+            user_prompt = self._with_context(f"{text}\n\n{machine_translation}", context)
             enhanced_translation = self.llm_translator._get_completion(system_prompt, user_prompt)
             
             logger.info("LLM enhancement of machine translation completed")
             
-            # Step 8: Safety check - ensure questions aren't answered
-            if not self._check_translation_safety(text, enhanced_translation):
+            # Step 8: Safety check - ensure questions aren't answered (full tier only)
+            if tier == "full" and not self._check_translation_safety(text, enhanced_translation):
                 logger.warning("Safety check failed - falling back to machine translation")
-                final_translation = machine_translation
-            else:
-                final_translation = enhanced_translation
+                return machine_translation, False
             
-            return final_translation
+            return enhanced_translation, True
                 
         except Exception as e:
             logger.error(f"Error during hybrid translation: {e}")
@@ -279,25 +558,267 @@ class HybridTranslator(BaseTranslator):
             if 'machine_translation' in locals():
                 logger.warning("Falling back to machine translation due to error in hybrid process")
                 
-                if self.use_math_preservation and 'replacements' in locals():
-                    return self.math_preserver.restore_math(machine_translation, replacements)
-                return machine_translation
+                if self.use_math_preservation:
+                    return self._restore_math(machine_translation, text, replacements), False
+                return machine_translation, False
             
             # If all else fails, return the original text
+            return FallbackText(text), False
+    
+    async def atranslate(self, text: str, target_language: str, context: Optional[str] = None) -> str:
+        """
+        Translate text using the ordered hybrid approach without blocking the event loop.
+        Mirrors translate(), awaiting the machine translator and the async LLM calls.
+        
+        Args:
+            text: Text to translate
+            target_language: Target language code or name
+            context: Neighbouring document text passed to the LLM steps as read-only context
+            
+        Returns:
+            str: Translated text
+        """
+        if not text:
             return text
+        
+        try:
+            # Step 1: Return segments that need no translation (numbers, IDs, URLs, code, ...) as is
+            if self._skip(text):
+                return text
+            
+            # Step 2: Extract math expressions if applicable
+            modified_text, replacements = self._extract_math(text)
+        except Exception as e:
+            logger.error(f"Error during hybrid translation: {e}")
+            return FallbackText(text)
+        
+        return await self._atranslate_extracted(text, modified_text, replacements, target_language, context)
+    
+    async def _arun_steps(self, text: str, modified_text: str, replacements: Dict[str, str],
+                          target_language: str, context: Optional[str] = None,
+                          tier: Optional[str] = None) -> Tuple[str, bool]:
+        """
+        Async version of _run_steps().
+        
+        Args:
+            text: Original source text
+            modified_text: Source text with math placeholders
+            replacements: Dictionary mapping placeholders to original expressions
+            target_language: Target language code or name
+            context: Neighbouring document text passed to the LLM steps as read-only context
+            tier: Pipeline tier already chosen for the text (scored from the machine translation if None)
+            
+        Returns:
+            Tuple containing:
+                - Translated text
+                - Whether it went through the pipeline (False for error and safety fallbacks)
+        """
+        if self.code_protection and replacements:
+            # Protected code stays a placeholder through the LLM steps as well and is restored at the end
+            translation, complete = await self._arun_steps(modified_text, modified_text, {}, target_language, context, tier)
+            return self._restore_math(translation, text, replacements), complete
+        
+        try:
+            # Step 3: Select and apply machine translation
+            machine_translator = self._select_machine_translator(target_language)
+            machine_translation = await machine_translator.atranslate(modified_text, target_language)
+            if tier is None:
+                tier = self._difficulty_tier(modified_text, machine_translation)
+            
+            # Step 4: Restore math expressions if applicable
+            if self.use_math_preservation:
+                machine_translation = self._restore_math(machine_translation, text, replacements)
+            
+            logger.info(f"Machine translation completed using {machine_translator.__class__.__name__}")
+            
+            # Easy segments keep the machine translation as is
+            if tier == "mt_only":
+                logger.info("Segment routed to the 'mt_only' tier. Keeping the machine translation.")
+                return machine_translation, True
+            
+            # Step 5: Verify if machine translation succeeded and is usable (full tier only)
+            machine_translation_failed = False
+            if tier == "full":
+                system_prompt_verification = self.prompts["machine_translation_check"].format(target_language=target_language)
+                verification_prompt = f"{text}\n\n{machine_translation}"
+                verification_result = await self.llm_translator._aget_completion(system_prompt_verification, verification_prompt)
+                logger.info(f"Machine translation verification result: {verification_result}")
+                machine_translation_failed = self._machine_translation_failed(verification_result)
+            
+            # Step 6: If machine translation failed, use LLM for direct translation
+            if machine_translation_failed:
+                logger.warning("Machine translation verification failed - using LLM for direct translation")
+                system_prompt_direct = self.prompts["llm_translation"].format(target_language=target_language)
+                llm_direct_translation = await self.llm_translator._aget_completion(
+                    system_prompt_direct, self._with_context(text, context)
+                )
+                logger.info("LLM direct translation completed")
+                
+                if self.use_math_preservation:
+                    llm_direct_translation = self.math_preserver.restore_math(llm_direct_translation, replacements)
+                    
+                return llm_direct_translation, True
+            
+            # Step 7: Enhance translation using LLM
+            system_prompt = self.prompts["translation_prompt"].format(target_language=target_language)
+            user_prompt = self._with_context(f"{text}\n\n{machine_translation}", context)
+            enhanced_translation = await self.llm_translator._aget_completion(system_prompt, user_prompt)
+            logger.info("LLM enhancement of machine translation completed")
+            
+            # Step 8: Safety check - ensure questions aren't answered (full tier only)
+            if tier == "full" and not await self._acheck_translation_safety(text, enhanced_translation):
+                logger.warning("Safety check failed - falling back to machine translation")
+                return machine_translation, False
+            
+            return enhanced_translation, True
+                
+        except Exception as e:
+            logger.error(f"Error during hybrid translation: {e}")
+            
+            # Try to fall back to the machine translation if available
+            if 'machine_translation' in locals():
+                logger.warning("Falling back to machine translation due to error in hybrid process")
+                return machine_translation, False
+            
+            return FallbackText(text), False
+    
+    def translate_many(self, text: str, target_languages: List[str]) -> Dict[str, str]:
+        """
+        Translate one text into several target languages.
+        The skip check and math extraction run once; the per-language
+        pipelines then run concurrently under the shared rate limits.
+        
+        Args:
+            text: Text to translate
+            target_languages: Target language codes or names
+            
+        Returns:
+            Dict[str, str]: Translated text by target language
+        """
+        if not text or self._skip(text):
+            return {language: text for language in target_languages}
+        
+        modified_text, replacements = self._extract_math(text)
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, len(target_languages))) as executor:
+            translations = list(executor.map(
+                lambda language: self._translate_extracted(text, modified_text, replacements, language),
+                target_languages
+            ))
+        return dict(zip(target_languages, translations))
+    
+    async def atranslate_many(self, text: str, target_languages: List[str]) -> Dict[str, str]:
+        """
+        Async version of translate_many().
+        
+        Args:
+            text: Text to translate
+            target_languages: Target language codes or names
+            
+        Returns:
+            Dict[str, str]: Translated text by target language
+        """
+        if not text or self._skip(text):
+            return {language: text for language in target_languages}
+        
+        modified_text, replacements = self._extract_math(text)
+        
+        translations = await asyncio.gather(*(
+            self._atranslate_extracted(text, modified_text, replacements, language)
+            for language in target_languages
+        ))
+        return dict(zip(target_languages, translations))
     
     def batch_translate(self, texts: List[str], target_language: str) -> List[str]:
         """
         Translate a batch of texts.
+        When the LLM translator has packing enabled, short texts are machine translated and
+        then enhanced together in JSON-array requests (skipping the per-item verification
+        and safety checks); long texts and items whose packed output is invalid go through
+        translate(). With a translation memory, only the short texts it does not hold are
+        packed: exact matches are reused, fuzzy matches are enhanced one by one, and the
+        packed translations are stored.
         
         Args:
             texts: List of texts to translate
             target_language: Target language code or name
             
         Returns:
-            List[str]: List of translated texts
+            List[str]: List of translated texts, in input order
         """
-        return [self.translate(text, target_language) for text in texts]
+        if not self.llm_translator.packing:
+            return [self.translate(text, target_language) for text in texts]
+        
+        results = list(texts)
+        indices = []  # Texts to pack
+        
+        for i, text in enumerate(texts):
+            if not text or not text.strip() or self._skip(text):
+                continue
+            if not self.llm_translator.is_packable(text):
+                results[i] = self.translate(text, target_language)
+                continue
+            if self.translation_memory is not None:
+                try:
+                    match = self.translation_memory.lookup(text, target_language)
+                except Exception as e:
+                    logger.error(f"Error looking up the translation memory: {e}")
+                    match = None
+                if match is not None:
+                    modified_text, replacements = self._extract_math(text)
+                    results[i] = self._translate_with_match(text, modified_text, replacements, target_language, match)
+                    continue
+            indices.append(i)
+        
+        # Extract math from the texts to pack in one pass
+        if self.use_math_preservation:
+            modified_texts, tables, _ = self.math_preserver.extract_batch([texts[i] for i in indices])
+        else:
+            modified_texts, tables = [texts[i] for i in indices], [{} for _ in indices]
+        packed = list(zip(indices, modified_texts, tables))  # (index, text with placeholders, math replacements)
+        
+        if not packed:
+            return results
+        
+        try:
+            # Machine translate the short texts, keeping the math placeholders for the LLM to preserve
+            machine_translator = self._select_machine_translator(target_language)
+            machine_translations = machine_translator.batch_translate(
+                [modified_text for _, modified_text, _ in packed], target_language
+            )
+            
+            # Enhance the machine translations in packed requests
+            system_prompt = self.prompts["translation_prompt"].format(target_language=target_language)
+            outputs = self.llm_translator.translate_packed(
+                [
+                    {"original": modified_text, "machine_translation": machine_translation}
+                    for (_, modified_text, _), machine_translation in zip(packed, machine_translations)
+                ],
+                [
+                    self.llm_translator.required_placeholders(modified_text, replacements)
+                    for _, modified_text, replacements in packed
+                ],
+                system_prompt,
+                "objects holding an original English text and its machine translation; "
+                "return the improved translation of each"
+            )
+            outputs = self.llm_translator.verify_packed_language(outputs, target_language)
+        except Exception as e:
+            logger.error(f"Error during packed hybrid translation: {e}")
+            outputs = [None] * len(packed)
+        
+        if self.use_math_preservation:
+            outputs = self.math_preserver.restore_batch(outputs, tables)
+        
+        for (i, modified_text, replacements), output in zip(packed, outputs):
+            if output is None:
+                # Already looked up in the memory; translate it on its own as a miss
+                results[i] = self._translate_with_match(texts[i], modified_text, replacements, target_language, None)
+            else:
+                results[i] = output
+                self._remember(texts[i], output, target_language)
+        
+        return results
     
     def update_prompts(self, prompts: Dict[str, str]):
         """
@@ -4,24 +4,32 @@ Includes language detection verification.
 """
 
 import os
-import time
+import re
+import json
+import asyncio
+import concurrent.futures
+from contextlib import contextmanager
 from typing import Optional, List, Dict, Any, Tuple
 
 from .base_translator import BaseTranslator
+from .retry import RetryPolicy, CompletionError, FatalCompletionError, RetryableCompletionError, classify_error
+from .deployment_pool import Deployment, DeploymentPool
+from .hedging import HedgePolicy
+from .difficulty import DifficultyScorer
 from utils.logger import logger
+from utils.fallback_text import FallbackText
+from utils.code_preserver import DATASET_CODE_PROTECTION
 from utils.prompts_manager import PromptsManager
+from utils.completion_cache import CompletionCache, DEFAULT_CACHE_PATH
+from utils.rate_limiter import RateLimiter, estimate_tokens, env_limit
 
-try:
-    # Attempt to import language detection
-    from langdetect import detect, LangDetectException
-    LANG_DETECT_AVAILABLE = True
-except ImportError:
-    LANG_DETECT_AVAILABLE = False
-    logger.warning("langdetect not installed. Language verification will be disabled.")
-    # Define placeholder for LangDetectException
-    class LangDetectException(Exception):
-        pass
+from utils.lang_detect import LanguageVerifier, LangDetectException, LANGDETECT_AVAILABLE
 
+# Kept for callers that checked whether language verification is possible at all;
+# distinctive-script targets are now verified without langdetect
+LANG_DETECT_AVAILABLE = LANGDETECT_AVAILABLE
+if not LANGDETECT_AVAILABLE:
+    logger.warning("langdetect not installed. Language verification is limited to script-distinctive languages.")
 
 class LLMTranslator(BaseTranslator):
     """
@@ -30,6 +38,23 @@ class LLMTranslator(BaseTranslator):
     Includes language detection verification.
     """
     
+    # translate() accepts neighbouring document text as read-only context
+    supports_context = True
+    
+    # Supported translation pipelines: separate translate/review/correct calls,
+    # or a single call returning all three as JSON
+    PIPELINES = ("three_step", "fused")
+    
+    # Appended to a single-text system prompt when several short texts are packed into one request
+    PACKED_PROMPT_SUFFIX = """
+
+The input is a JSON array of {count} {item_description}. Apply the instructions above to each element independently.
+Respond with ONLY a JSON array of exactly {count} strings, where the i-th string is the result for the i-th input element.
+Keep every placeholder such as [[M0]] exactly as written. Do not include any notes or explanations."""
+    
+    # Number of times the items of a packed request that lost a placeholder are sent again
+    PACK_MAX_RETRIES = 2
+    
     def __init__(
         self,
         model_name: str = "azure/attack-gpt4o",
@@ -37,7 +62,24 @@ class LLMTranslator(BaseTranslator):
         api_base: Optional[str] = "https://llm-sec.openai.azure.com/",
         api_version: str = "2024-08-01-preview",
         dataset_type: str = "math",
-        prompts_dir: str = "prompts"
+        prompts_dir: str = "prompts",
+        sampling_params: Optional[Dict[str, Any]] = None,
+        use_cache: bool = True,
+        cache: Optional[CompletionCache] = None,
+        max_concurrency: int = 64,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        deployment_pool: Optional[DeploymentPool] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        pipeline: str = "three_step",
+        packing: bool = False,
+        pack_max_items: int = 20,
+        pack_token_budget: int = 1500,
+        pack_max_item_tokens: int = 100,
+        difficulty_scorer: Optional[DifficultyScorer] = None,
+        language_verifier: Optional[LanguageVerifier] = None
     ):
         """
         Initialize the LLM translator.
@@ -47,20 +89,72 @@ class LLMTranslator(BaseTranslator):
             api_key: API key for the LLM service
             api_base: Base URL for the API
             api_version: API version
-            dataset_type: Type of dataset ('math' or 'gaia')
+            dataset_type: Type of dataset ('math', 'gaia', 'swe-bench', 'asb'); selects math and code protection
             prompts_dir: Directory containing prompt templates
+            sampling_params: Extra sampling parameters passed to the model (e.g. temperature)
+            use_cache: Whether to reuse completions from the persistent completion cache
+            cache: Completion cache to use (defaults to one at LLM_CACHE_PATH)
+            max_concurrency: Maximum number of in-flight LLM calls on the async path
+            requests_per_minute: Request budget of the deployment (defaults to LLM_REQUESTS_PER_MINUTE)
+            tokens_per_minute: Token budget of the deployment (defaults to LLM_TOKENS_PER_MINUTE)
+            rate_limiter: Rate limiter holding the budgets (defaults to the process-wide shared limiter)
+            retry_policy: Retry policy for failed completion calls
+            deployment_pool: Deployments to load-balance calls across (defaults to LLM_DEPLOYMENTS,
+                or a single deployment built from the arguments above)
+            hedge_policy: Opt-in hedging of slow completion calls (disabled if None)
+            pipeline: Translation pipeline, 'three_step' or 'fused' (one call with self-review)
+            packing: Whether batch_translate() packs short texts into shared JSON-array requests
+            pack_max_items: Maximum number of texts per packed request
+            pack_token_budget: Maximum estimated source tokens per packed request
+            pack_max_item_tokens: Texts longer than this (in estimated tokens) are translated individually
+            difficulty_scorer: Lets easy segments skip the review and correction steps (all segments
+                take the full pipeline if None)
+            language_verifier: Verifier used to check that translations are in the target language
         """
-        super().__init__(use_math_preservation=(dataset_type == 'math'))
+        super().__init__(
+            use_math_preservation=(dataset_type == 'math'),
+            code_protection=DATASET_CODE_PROTECTION.get(dataset_type, ())
+        )
+        
+        if pipeline not in self.PIPELINES:
+            raise ValueError(f"Unknown pipeline '{pipeline}'. Choose from: {', '.join(self.PIPELINES)}")
+        self.pipeline = pipeline
+        
+        # Statistics of the fused pipeline
+        self.pipeline_stats = {
+            "fused_calls": 0,
+            "fused_fallbacks": 0
+        }
+        
+        self.difficulty_scorer = difficulty_scorer
+        self.language_verifier = language_verifier or LanguageVerifier()
+        
+        # Packing of short texts in batch_translate()
+        self.packing = packing
+        self.pack_max_items = pack_max_items
+        self.pack_token_budget = pack_token_budget
+        self.pack_max_item_tokens = pack_max_item_tokens
+        self.packing_stats = {
+            "packed_items": 0,
+            "packed_calls": 0,
+            "splits": 0,
+            "fallbacks": 0
+        }
         
         # Store dataset type for prompting
         self.dataset_type = dataset_type
         
+        # Bound on concurrent async LLM calls (semaphore is created per event loop)
+        self.max_concurrency = max_concurrency
+        self._async_semaphore = None
+        
         try:
             # Import litellm here to avoid unnecessary dependencies if not used
-            from litellm import completion
+            from litellm import completion, acompletion
             
-            # Store the completion function
+            # Store the completion functions
             self.completion = completion
+            self.acompletion = acompletion
             
             # Get API key from parameter or environment variable
             self.api_key = api_key or os.environ.get("AZURE_OPENAI_API_KEY") or os.environ.get("OPENAI_API_KEY")
@@ -74,6 +168,41 @@ class LLMTranslator(BaseTranslator):
             self.model_name = model_name
             self.api_base = api_base
             self.api_version = api_version
+            self.sampling_params = sampling_params or {}
+            self.retry_policy = retry_policy or RetryPolicy()
+            self.hedge_policy = hedge_policy
+            
+            # Set up the deployments calls are routed to, either from LLM_DEPLOYMENTS(_FILE)
+            # or a single deployment built from the arguments above
+            if deployment_pool is None:
+                deployment_pool = DeploymentPool.from_env(rate_limiter=rate_limiter)
+            if deployment_pool is None:
+                deployment_pool = DeploymentPool(
+                    [Deployment(
+                        model=model_name,
+                        api_key=self.api_key,
+                        api_base=api_base if "azure" in model_name.lower() else None,
+                        api_version=api_version,
+                        requests_per_minute=requests_per_minute or env_limit("LLM_REQUESTS_PER_MINUTE"),
+                        tokens_per_minute=tokens_per_minute or env_limit("LLM_TOKENS_PER_MINUTE"),
+                        name=model_name
+                    )],
+                    rate_limiter=rate_limiter
+                )
+            else:
+                self.model_name = deployment_pool.deployments[0].model
+            self.deployment_pool = deployment_pool
+            self.rate_limiter = deployment_pool.rate_limiter
+            
+            # Completions are cached under every model the pool may route to, so a pool mixing
+            # models never serves one model's completion as another's
+            self.cache_model = "+".join(sorted({d.model for d in deployment_pool.deployments}))
+            
+            # Set up the persistent completion cache
+            if use_cache:
+                self.cache = cache or CompletionCache(os.environ.get("LLM_CACHE_PATH", DEFAULT_CACHE_PATH))
+            else:
+                self.cache = None
             
             # Initialize prompts manager and load prompts
             self.prompts_manager = PromptsManager(prompts_dir)
@@ -113,6 +242,10 @@ class LLMTranslator(BaseTranslator):
                 'english': 'en'
             }
             
+            if self.pipeline == "fused" and "system_prompt_fused" not in self.prompts:
+                logger.warning(f"No fused prompt for dataset '{dataset_type}'. Using the 3-step pipeline.")
+                self.pipeline = "three_step"
+            
             logger.info(f"LLM Translator initialized successfully with model: {model_name} for dataset type: {dataset_type}")
             
         except ImportError as e:
@@ -122,46 +255,247 @@ class LLMTranslator(BaseTranslator):
             logger.error(f"Failed to initialize LLM translator: {e}")
             raise
     
-    def _get_completion(self, system_prompt: str, user_prompt: str) -> str:
+    def _build_api_params(self, system_prompt: str, user_prompt: str, deployment: Deployment) -> Dict[str, Any]:
         """
-        Get completion from the LLM using LiteLLM.
+        Build the LiteLLM request parameters for a completion call.
         
         Args:
             system_prompt: The system prompt to instruct the model
             user_prompt: The prompt to send to the LLM
+            deployment: Deployment the call is routed to
             
         Returns:
-            str: The LLM's response
+            Dict[str, Any]: Keyword arguments for litellm.completion/acompletion
         """
-        try:
-            # Set up the API parameters - account for different model providers
-            api_params = {
-                "model": self.model_name,
-                "messages": [
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-            }
+        api_params = {
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+        }
+        api_params.update(self.sampling_params)
+        
+        # Add the model and provider-specific parameters of the deployment
+        api_params.update(deployment.api_params())
+        
+        return api_params
+    
+    def _lookup_cache(self, system_prompt: str, user_prompt: str, refresh: bool = False) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Look up a completion request in the completion cache.
+        
+        Args:
+            system_prompt: The system prompt to instruct the model
+            user_prompt: The prompt to send to the LLM
+            refresh: Whether to skip the cached response so a fresh one replaces it
             
-            # Add provider-specific parameters
-            if "azure" in self.model_name.lower():
-                api_params.update({
-                    "api_key": self.api_key,
-                    "api_base": self.api_base,
-                    "api_version": self.api_version
-                })
-            else:
-                api_params.update({
-                    "api_key": self.api_key
-                })
+        Returns:
+            Tuple containing:
+                - Cache key for the request (None if caching is disabled)
+                - Cached response (None on a miss or when refreshing)
+        """
+        if self.cache is None:
+            return None, None
+        
+        cache_key = self.cache.make_key(self.cache_model, system_prompt, user_prompt, self.sampling_params)
+        if refresh:
+            return cache_key, None
+        return cache_key, self.cache.get(cache_key)
+    
+    def _store_completion(self, cache_key: Optional[str], response: Any) -> str:
+        """
+        Extract the completion text from a LiteLLM response and cache it.
+        
+        Args:
+            cache_key: Cache key returned by _lookup_cache()
+            response: LiteLLM response object
+            
+        Returns:
+            str: The LLM's response text
+            
+        Raises:
+            FatalCompletionError: If the response has no content
+        """
+        content = response.choices[0].message.content
+        if content is None:
+            raise FatalCompletionError(f"LLM returned no content (finish reason: {getattr(response.choices[0], 'finish_reason', None)})")
+        
+        # Only successful completions are cached
+        if cache_key is not None:
+            self.cache.set(cache_key, content, model_name=self.cache_model)
+        
+        return content
+    
+    def _quota_request(self, system_prompt: str, user_prompt: str, deployment: Deployment) -> Dict[str, float]:
+        """
+        Estimate the rate limit budget a completion request will consume.
+        
+        Args:
+            system_prompt: The system prompt to instruct the model
+            user_prompt: The prompt to send to the LLM
+            deployment: Deployment the call is routed to
             
-            # Call the LLM
-            response = self.completion(**api_params)
+        Returns:
+            Dict[str, float]: Amounts to take from the deployment's request and token buckets
+        """
+        prompt_tokens = estimate_tokens(system_prompt) + estimate_tokens(user_prompt)
+        # A translation is about as long as its source unless max_tokens caps it
+        completion_tokens = self.sampling_params.get("max_tokens") or estimate_tokens(user_prompt)
+        return {
+            deployment.requests_bucket: 1,
+            deployment.tokens_bucket: prompt_tokens + completion_tokens
+        }
+    
+    def _reconcile_quota(self, quota: Optional[Dict[str, float]], response: Any, deployment: Deployment) -> None:
+        """
+        Correct the token bucket with the usage reported in a response.
+        
+        Args:
+            quota: Amounts taken by _quota_request() (None if rate limiting is disabled)
+            response: LiteLLM response object
+            deployment: Deployment the call was routed to
+        """
+        if quota is None:
+            return
+        
+        usage = getattr(response, "usage", None)
+        total_tokens = getattr(usage, "total_tokens", None)
+        if total_tokens is not None:
+            self.rate_limiter.reconcile(deployment.tokens_bucket, quota[deployment.tokens_bucket], total_tokens)
+    
+    @contextmanager
+    def _route_call(self, tried: List[Deployment]):
+        """
+        Route one completion attempt to a deployment and record its outcome.
+        Only transient failures (rate limits, server errors, timeouts, connection errors) count
+        against the deployment's health; fatal errors such as invalid requests or content filter
+        rejections are caused by the input and are re-raised without touching it.
+        
+        Args:
+            tried: Deployments already used by attempts (or hedges) of the same call; they are
+                avoided when another deployment is available, and the selected one is appended
             
-            return response.choices[0].message.content
+        Yields:
+            Deployment: The deployment to send the attempt to
+        """
+        deployment = self.deployment_pool.acquire(exclude=tried)
+        tried.append(deployment)
+        try:
+            yield deployment
         except Exception as e:
-            logger.error(f"Error during LLM completion: {e}")
-            return f"Error: {str(e)}"
+            transient = isinstance(classify_error(e), RetryableCompletionError)
+            self.deployment_pool.release(deployment, success=False if transient else None)
+            raise
+        except BaseException:
+            # Cancelled (e.g. the losing request of a hedged call)
+            self.deployment_pool.release(deployment, success=None)
+            raise
+        self.deployment_pool.release(deployment, success=True)
+    
+    def _get_async_semaphore(self) -> asyncio.Semaphore:
+        """
+        Get the semaphore bounding in-flight async LLM calls for the running event loop.
+        
+        Returns:
+            asyncio.Semaphore: Semaphore with max_concurrency slots
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_semaphore is None or self._async_semaphore[0] is not loop:
+            self._async_semaphore = (loop, asyncio.Semaphore(self.max_concurrency))
+        return self._async_semaphore[1]
+    
+    def _get_completion(self, system_prompt: str, user_prompt: str, refresh: bool = False) -> str:
+        """
+        Get completion from the LLM using LiteLLM.
+        Transient failures of the call are retried according to the retry policy.
+        
+        Args:
+            system_prompt: The system prompt to instruct the model
+            user_prompt: The prompt to send to the LLM
+            refresh: Whether to bypass the completion cache for this request (the fresh response is still stored)
+            
+        Returns:
+            str: The LLM's response
+            
+        Raises:
+            CompletionError: If the completion fails with a fatal error or runs out of retries
+        """
+        # Serve repeated requests from the completion cache
+        cache_key, cached_response = self._lookup_cache(system_prompt, user_prompt, refresh)
+        if cached_response is not None:
+            return cached_response
+        
+        tried_deployments = []
+        
+        def attempt():
+            with self._route_call(tried_deployments) as deployment:
+                # Wait for the deployment's request and token budgets
+                quota = None
+                if self.rate_limiter is not None:
+                    quota = self._quota_request(system_prompt, user_prompt, deployment)
+                    self.rate_limiter.acquire(quota)
+                
+                # Call the LLM
+                response = self.completion(**self._build_api_params(system_prompt, user_prompt, deployment))
+                self._reconcile_quota(quota, response, deployment)
+                return response
+        
+        def call():
+            return self.retry_policy.call(attempt)
+        
+        # Optionally race a duplicate request against a slow one
+        if self.hedge_policy is not None:
+            response = self.hedge_policy.call(call)
+        else:
+            response = call()
+        return self._store_completion(cache_key, response)
+    
+    async def _aget_completion(self, system_prompt: str, user_prompt: str, refresh: bool = False) -> str:
+        """
+        Get completion from the LLM using LiteLLM's async API.
+        The number of in-flight calls is bounded by max_concurrency.
+        
+        Args:
+            system_prompt: The system prompt to instruct the model
+            user_prompt: The prompt to send to the LLM
+            refresh: Whether to bypass the completion cache for this request (the fresh response is still stored)
+            
+        Returns:
+            str: The LLM's response
+            
+        Raises:
+            CompletionError: If the completion fails with a fatal error or runs out of retries
+        """
+        # Serve repeated requests from the completion cache
+        cache_key, cached_response = self._lookup_cache(system_prompt, user_prompt, refresh)
+        if cached_response is not None:
+            return cached_response
+        
+        tried_deployments = []
+        
+        async def attempt():
+            async with self._get_async_semaphore():
+                with self._route_call(tried_deployments) as deployment:
+                    # Wait for the deployment's request and token budgets
+                    quota = None
+                    if self.rate_limiter is not None:
+                        quota = self._quota_request(system_prompt, user_prompt, deployment)
+                        await self.rate_limiter.aacquire(quota)
+                    
+                    # Call the LLM
+                    response = await self.acompletion(**self._build_api_params(system_prompt, user_prompt, deployment))
+                    self._reconcile_quota(quota, response, deployment)
+                    return response
+        
+        async def call():
+            return await self.retry_policy.acall(attempt)
+        
+        # Optionally race a duplicate request against a slow one
+        if self.hedge_policy is not None:
+            response = await self.hedge_policy.acall(call)
+        else:
+            response = await call()
+        return self._store_completion(cache_key, response)
     
     def detect_language(self, text: str) -> str:
         """
@@ -176,12 +510,10 @@ class LLMTranslator(BaseTranslator):
         Raises:
             LangDetectException: If language detection fails
         """
-        if LANG_DETECT_AVAILABLE:
-            return detect(text)
-        else:
-            # Return an empty string if langdetect is not available
-            logger.warning("Language detection attempted but langdetect is not installed")
-            raise LangDetectException("langdetect not installed")
+        detected = self.language_verifier.detect(text)
+        if detected is None:
+            raise LangDetectException("Could not determine the language of the text")
+        return detected
     
     def _verify_language(self, text: str, target_language: str) -> bool:
         """
@@ -194,11 +526,6 @@ class LLMTranslator(BaseTranslator):
         Returns:
             bool: True if the text is in the target language, False otherwise
         """
-        if not LANG_DETECT_AVAILABLE:
-            # Skip verification if langdetect is not available
-            logger.warning("Language verification skipped: langdetect not installed")
-            return True
-            
         if not text or len(text.strip()) < 10:
             # Too short to reliably detect language
             logger.warning("Text too short for reliable language detection")
@@ -207,145 +534,738 @@ class LLMTranslator(BaseTranslator):
         # Get the language code for detection
         target_code = self.language_code_map.get(target_language.lower(), target_language.lower())
         
-        try:
-            # Detect the language of the text
-            detected_lang = self.detect_language(text)
-            
-            # Check if the detected language matches the target language
-            if detected_lang == target_code:
-                logger.info(f"Language verified: detected {detected_lang}, expected {target_code}")
-                return True
-            else:
-                logger.warning(f"Language mismatch: detected {detected_lang}, expected {target_code}")
-                return False
-                
-        except LangDetectException as e:
-            logger.warning(f"Language detection error: {e}")
-            # Return True to not block the process on language detection failures
+        verified = self.language_verifier.verify(text, target_code)
+        if verified is None:
+            # Do not block the process when the language cannot be determined
+            logger.warning(f"Language verification skipped: could not determine whether the text is {target_code}")
             return True
+        
+        if verified:
+            logger.info(f"Language verified: expected {target_code}")
+        else:
+            logger.warning(f"Language mismatch: expected {target_code}, detected {self.language_verifier.detect(text)}")
+        return verified
+    
+    def _step_system_prompt(self, prompt_key: str, target_language: str, lang_emphasis: bool,
+                            format_language: bool = True) -> str:
+        """
+        Render the system prompt of a pipeline step.
+        
+        Args:
+            prompt_key: Key of the prompt template in self.prompts
+            target_language: Target language name
+            lang_emphasis: Whether to prepend an instruction to answer only in the target language
+            format_language: Whether the template has a {target_language} field to fill in.
+                The correction prompt is used verbatim, so literal braces in it are kept.
+            
+        Returns:
+            str: Rendered system prompt
+        """
+        system_prompt = self.prompts[prompt_key]
+        if format_language:
+            system_prompt = system_prompt.format(target_language=target_language)
+        
+        # Add emphasis if language detection failed previously
+        if lang_emphasis:
+            emphasis = f"IMPORTANT: You MUST respond ONLY in {target_language}. Do not use any other language in your response."
+            system_prompt = f"{emphasis}\n\n{system_prompt}"
+        
+        return system_prompt
+    
+    @staticmethod
+    def _review_prompt(text: str, initial_translation: str) -> str:
+        """Build the user prompt of the review step."""
+        return f"Original English Text:\n{text}\n\nTranslated Text:\n{initial_translation}"
+    
+    @staticmethod
+    def _correction_prompt(text: str, initial_translation: str, review_feedback: str) -> str:
+        """Build the user prompt of the correction step."""
+        return f"Original English Text:\n{text}\n\nPrevious Translation:\n{initial_translation}\n\nReviewer Feedback:\n{review_feedback}"
     
-    def _three_step_translation(self, text: str, target_language: str) -> str:
+    def _three_step_translation(self, text: str, target_language: str, context: Optional[str] = None) -> str:
         """
         Perform a 3-step translation QA and correction pipeline.
+        Failed LLM calls are retried individually by _get_completion(); if a call
+        still fails, the best translation obtained so far is returned.
         
         Args:
             text: Text to translate
             target_language: Target language name
+            context: Neighbouring document text shown to the translation step as read-only context
             
         Returns:
             str: Final translated text
         """
-        max_retries = 3
         lang_emphasis_added = False
+        initial_translation = None
         
-        for attempt in range(max_retries):
-            try:
-                # Step 1: Initial Translation
-                system_prompt_1 = self.prompts["system_prompt_step1"].format(target_language=target_language)
-                
-                # Add emphasis if language detection failed previously
-                if lang_emphasis_added:
-                    emphasis = f"IMPORTANT: You MUST respond ONLY in {target_language}. Do not use any other language in your response."
-                    system_prompt_1 = f"{emphasis}\n\n{system_prompt_1}"
-                
-                initial_translation = self._get_completion(system_prompt_1, text)
+        # Segments below the 'full' tier are not reviewed
+        tier = self.difficulty_scorer.tier(text) if self.difficulty_scorer is not None else "full"
+        
+        try:
+            # Step 1: Initial Translation (retried once with emphasis if the language is wrong)
+            while True:
+                system_prompt_1 = self._step_system_prompt("system_prompt_step1", target_language, lang_emphasis_added)
+                initial_translation = self._get_completion(system_prompt_1, self._with_context(text, context))
                 
-                if self.dataset_type != 'math' and LANG_DETECT_AVAILABLE:
+                if self.dataset_type != 'math':
                     # Verify the language of the translation
-                    correct_language = self._verify_language(initial_translation, target_language)
-                
-                    if not correct_language:
+                    if not self._verify_language(initial_translation, target_language):
                         # If language verification failed, retry with emphasis
                         if not lang_emphasis_added:
                             lang_emphasis_added = True
                             logger.info(f"Language verification failed. Retrying with emphasis on {target_language}")
                             continue
-                        else:
-                            # If already tried with emphasis, log warning and continue anyway
-                            logger.warning(f"Language verification failed even with emphasis. Continuing with the process.")
-                
-                # Step 2: Review Translation
-                system_prompt_2 = self.prompts["system_prompt_step2"]
-                review_prompt = f"Original English Text:\n{text}\n\nTranslated Text:\n{initial_translation}"
-                review_feedback = self._get_completion(system_prompt_2, review_prompt)
-                
-                # Check if the review found any issues
-                if not review_feedback.strip():
-                    # If no issues were found, return the initial translation directly
-                    logger.info("Review found no issues with the translation. Skipping correction step.")
+                        # If already tried with emphasis, log warning and continue anyway
+                        logger.warning(f"Language verification failed even with emphasis. Continuing with the process.")
+                break
+            
+            if tier != "full":
+                logger.info(f"Segment routed to the '{tier}' tier. Skipping review and correction.")
+                return initial_translation
+            
+            # Step 2: Review Translation
+            system_prompt_2 = self.prompts["system_prompt_step2"]
+            review_feedback = self._get_completion(system_prompt_2, self._review_prompt(text, initial_translation))
+            
+            # Check if the review found any issues
+            if not review_feedback.strip():
+                # If no issues were found, return the initial translation directly
+                logger.info("Review found no issues with the translation. Skipping correction step.")
+                return initial_translation
+            
+            # If there are issues, attempt to correct
+            system_prompt_3 = self._step_system_prompt("system_prompt_step3", target_language, lang_emphasis_added,
+                                                       format_language=False)
+            correction_prompt = self._correction_prompt(text, initial_translation, review_feedback)
+            final_translation = self._get_completion(system_prompt_3, correction_prompt)
+            
+            # Verify the language of the final translation
+            if self.dataset_type != 'math':
+                if not self._verify_language(final_translation, target_language):
+                    # If language verification failed, use the initial translation as fallback
+                    logger.warning(f"Language verification failed for the final translation. Using initial translation as fallback.")
                     return initial_translation
+            
+            return final_translation
+            
+        except CompletionError as e:
+            return self._pipeline_fallback(text, initial_translation, e)
+    
+    async def _athree_step_translation(self, text: str, target_language: str, context: Optional[str] = None) -> str:
+        """
+        Async version of the 3-step translation QA and correction pipeline.
+        
+        Args:
+            text: Text to translate
+            target_language: Target language name
+            context: Neighbouring document text shown to the translation step as read-only context
+            
+        Returns:
+            str: Final translated text
+        """
+        lang_emphasis_added = False
+        initial_translation = None
+        
+        # Segments below the 'full' tier are not reviewed
+        tier = self.difficulty_scorer.tier(text) if self.difficulty_scorer is not None else "full"
+        
+        try:
+            # Step 1: Initial Translation (retried once with emphasis if the language is wrong)
+            while True:
+                system_prompt_1 = self._step_system_prompt("system_prompt_step1", target_language, lang_emphasis_added)
+                initial_translation = await self._aget_completion(system_prompt_1, self._with_context(text, context))
                 
-                # If there are issues, attempt to correct
-                system_prompt_3 = self.prompts["system_prompt_step3"]
-                
-                # Add language emphasis if needed
-                if lang_emphasis_added:
-                    emphasis = f"IMPORTANT: You MUST respond ONLY in {target_language}. Do not use any other language in your response."
-                    system_prompt_3 = f"{emphasis}\n\n{system_prompt_3}"
-                
-                correction_prompt = f"Original English Text:\n{text}\n\nPrevious Translation:\n{initial_translation}\n\nReviewer Feedback:\n{review_feedback}"
-                final_translation = self._get_completion(system_prompt_3, correction_prompt)
-                
-                # Verify the language of the final translation
-                if self.dataset_type != 'math' and LANG_DETECT_AVAILABLE:
-                    if not self._verify_language(final_translation, target_language):
-                        # If language verification failed, use the initial translation as fallback
-                        logger.warning(f"Language verification failed for the final translation. Using initial translation as fallback.")
-                        return initial_translation
-                
-                return final_translation
-                
-            except Exception as e:
-                logger.warning(f"Translation QA pipeline error (attempt {attempt+1}/{max_retries}): {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(2 + attempt)  # Exponential backoff
-                else:
-                    logger.error(f"Translation QA pipeline failed after {max_retries} attempts: {e}")
-                    return text  # Return original text if all attempts fail
+                if self.dataset_type != 'math':
+                    if not self._verify_language(initial_translation, target_language):
+                        if not lang_emphasis_added:
+                            lang_emphasis_added = True
+                            logger.info(f"Language verification failed. Retrying with emphasis on {target_language}")
+                            continue
+                        logger.warning(f"Language verification failed even with emphasis. Continuing with the process.")
+                break
+            
+            if tier != "full":
+                logger.info(f"Segment routed to the '{tier}' tier. Skipping review and correction.")
+                return initial_translation
+            
+            # Step 2: Review Translation
+            system_prompt_2 = self.prompts["system_prompt_step2"]
+            review_feedback = await self._aget_completion(system_prompt_2, self._review_prompt(text, initial_translation))
+            
+            if not review_feedback.strip():
+                logger.info("Review found no issues with the translation. Skipping correction step.")
+                return initial_translation
+            
+            # Step 3: Correct the translation based on the review
+            system_prompt_3 = self._step_system_prompt("system_prompt_step3", target_language, lang_emphasis_added,
+                                                       format_language=False)
+            correction_prompt = self._correction_prompt(text, initial_translation, review_feedback)
+            final_translation = await self._aget_completion(system_prompt_3, correction_prompt)
+            
+            # Verify the language of the final translation
+            if self.dataset_type != 'math':
+                if not self._verify_language(final_translation, target_language):
+                    logger.warning(f"Language verification failed for the final translation. Using initial translation as fallback.")
+                    return initial_translation
+            
+            return final_translation
+            
+        except CompletionError as e:
+            return self._pipeline_fallback(text, initial_translation, e)
+    
+    @staticmethod
+    def _parse_fused_response(response: str) -> Optional[str]:
+        """
+        Extract the final translation from the JSON answer of the fused pipeline.
         
-        return text  # Fallback to original text
+        Args:
+            response: LLM response expected to hold 'translation', 'review' and 'corrected_translation'
+            
+        Returns:
+            Optional[str]: The corrected translation if the review found issues, otherwise the
+                translation; None if the response is not valid fused output
+        """
+        # Tolerate the JSON object being wrapped in a markdown code block
+        match = re.search(r"\{.*\}", response, re.DOTALL)
+        if not match:
+            return None
+        
+        try:
+            result = json.loads(match.group(0))
+        except ValueError:
+            return None
+        
+        if not isinstance(result, dict):
+            return None
+        translation = result.get("translation")
+        if not isinstance(translation, str) or not translation.strip():
+            return None
+        
+        review = result.get("review")
+        corrected = result.get("corrected_translation")
+        if isinstance(review, str) and review.strip() and isinstance(corrected, str) and corrected.strip():
+            logger.info("Fused review found issues with the translation. Using the corrected translation.")
+            return corrected
+        return translation
+    
+    def _check_fused_translation(self, response: str, target_language: str) -> Optional[str]:
+        """
+        Validate the answer of the fused pipeline.
+        
+        Args:
+            response: LLM response of the fused call
+            target_language: Target language name
+            
+        Returns:
+            Optional[str]: The final translation, or None if the 3-step pipeline should be used instead
+        """
+        self.pipeline_stats["fused_calls"] += 1
+        translation = self._parse_fused_response(response)
+        
+        if translation is None:
+            logger.warning("Fused translation response could not be parsed. Falling back to the 3-step pipeline.")
+        elif self.dataset_type != 'math' and not self._verify_language(translation, target_language):
+            logger.warning("Language verification failed for the fused translation. Falling back to the 3-step pipeline.")
+            translation = None
+        
+        if translation is None:
+            self.pipeline_stats["fused_fallbacks"] += 1
+        return translation
+    
+    def _fused_translation(self, text: str, target_language: str, context: Optional[str] = None) -> str:
+        """
+        Translate, self-review and correct in a single LLM call returning JSON.
+        Output that cannot be used falls back to the 3-step pipeline.
+        
+        Args:
+            text: Text to translate
+            target_language: Target language name
+            context: Neighbouring document text shown to the translation step as read-only context
+            
+        Returns:
+            str: Final translated text
+        """
+        system_prompt = self._step_system_prompt("system_prompt_fused", target_language, False)
+        try:
+            response = self._get_completion(system_prompt, self._with_context(text, context))
+        except CompletionError as e:
+            logger.warning(f"Fused translation call failed ({e}). Falling back to the 3-step pipeline.")
+            return self._three_step_translation(text, target_language, context)
+        
+        translation = self._check_fused_translation(response, target_language)
+        if translation is None:
+            return self._three_step_translation(text, target_language, context)
+        return translation
+    
+    async def _afused_translation(self, text: str, target_language: str, context: Optional[str] = None) -> str:
+        """
+        Async version of the fused single-call pipeline.
+        
+        Args:
+            text: Text to translate
+            target_language: Target language name
+            context: Neighbouring document text shown to the translation step as read-only context
+            
+        Returns:
+            str: Final translated text
+        """
+        system_prompt = self._step_system_prompt("system_prompt_fused", target_language, False)
+        try:
+            response = await self._aget_completion(system_prompt, self._with_context(text, context))
+        except CompletionError as e:
+            logger.warning(f"Fused translation call failed ({e}). Falling back to the 3-step pipeline.")
+            return await self._athree_step_translation(text, target_language, context)
+        
+        translation = self._check_fused_translation(response, target_language)
+        if translation is None:
+            return await self._athree_step_translation(text, target_language, context)
+        return translation
+    
+    def _run_pipeline(self, text: str, target_language: str, context: Optional[str] = None) -> str:
+        """Translate text with the configured pipeline."""
+        if self.pipeline == "fused":
+            return self._fused_translation(text, target_language, context)
+        return self._three_step_translation(text, target_language, context)
+    
+    async def _arun_pipeline(self, text: str, target_language: str, context: Optional[str] = None) -> str:
+        """Async version of _run_pipeline()."""
+        if self.pipeline == "fused":
+            return await self._afused_translation(text, target_language, context)
+        return await self._athree_step_translation(text, target_language, context)
+    
+    @staticmethod
+    def _pipeline_fallback(text: str, initial_translation: Optional[str], error: CompletionError) -> str:
+        """
+        Choose the result of a pipeline whose LLM call failed.
+        
+        Args:
+            text: Source text
+            initial_translation: Step-1 translation, if it was obtained
+            error: The completion failure
+            
+        Returns:
+            str: The initial translation if available, otherwise the source text as a FallbackText
+        """
+        if initial_translation is not None:
+            logger.warning(f"Translation QA pipeline failed after the initial translation ({error}). Using initial translation.")
+            return initial_translation
+        
+        logger.error(f"Translation QA pipeline failed: {error}")
+        return FallbackText(text)  # Return original text if no translation was obtained
     
-    def translate(self, text: str, target_language: str) -> str:
+    def translate(self, text: str, target_language: str, context: Optional[str] = None) -> str:
         """
-        Translate text using the LLM with a 3-step QA pipeline.
+        Translate text using the LLM with the configured QA pipeline.
         
         Args:
             text: Text to translate
             target_language: Target language name (e.g., 'Japanese', 'Hindi')
+            context: Neighbouring document text passed as read-only context
             
         Returns:
             str: Translated text
         """
-        if not text:
+        if not text or self._skip(text):
             return text
         
         try:
             # If math preservation is enabled, extract and protect math expressions
             if self.use_math_preservation:
                 modified_text, replacements = self.math_preserver.extract_math(text)
-                translated_text = self._three_step_translation(modified_text, target_language)
+                translated_text = self._run_pipeline(modified_text, target_language, context)
                 # Restore math expressions in the translated text
-                return self.math_preserver.restore_math(translated_text, replacements)
+                return self._restore_math(translated_text, text, replacements)
             else:
                 # Translate without math preservation
-                return self._three_step_translation(text, target_language)
+                return self._run_pipeline(text, target_language, context)
+                        
+        except Exception as e:
+            logger.error(f"Error during translation process: {e}")
+            return FallbackText(text)  # Return original text if any error occurs
+    
+    async def atranslate(self, text: str, target_language: str, context: Optional[str] = None) -> str:
+        """
+        Translate text using the LLM with the configured QA pipeline without blocking the event loop.
+        
+        Args:
+            text: Text to translate
+            target_language: Target language name (e.g., 'Japanese', 'Hindi')
+            context: Neighbouring document text passed as read-only context
+            
+        Returns:
+            str: Translated text
+        """
+        if not text or self._skip(text):
+            return text
+        
+        try:
+            if self.use_math_preservation:
+                modified_text, replacements = self.math_preserver.extract_math(text)
+                translated_text = await self._arun_pipeline(modified_text, target_language, context)
+                return self._restore_math(translated_text, text, replacements)
+            else:
+                return await self._arun_pipeline(text, target_language, context)
                         
         except Exception as e:
             logger.error(f"Error during translation process: {e}")
-            return text  # Return original text if any error occurs
+            return FallbackText(text)
+    
+    def translate_many(self, text: str, target_languages: List[str]) -> Dict[str, str]:
+        """
+        Translate one text into several target languages.
+        Math expressions are extracted once; the per-language pipelines then run
+        concurrently, sharing the translator's rate limits and deployments.
+        
+        Args:
+            text: Text to translate
+            target_languages: Target language names
+            
+        Returns:
+            Dict[str, str]: Translated text by target language
+        """
+        if not text or self._skip(text):
+            return {language: text for language in target_languages}
+        
+        if self.use_math_preservation:
+            modified_text, replacements = self.math_preserver.extract_math(text)
+        else:
+            modified_text, replacements = text, {}
+        
+        def translate_one(language: str) -> str:
+            try:
+                translated_text = self._run_pipeline(modified_text, language)
+                if self.use_math_preservation:
+                    return self._restore_math(translated_text, text, replacements)
+                return translated_text
+            except Exception as e:
+                logger.error(f"Error during translation process ({language}): {e}")
+                return FallbackText(text)
+        
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, len(target_languages))) as executor:
+            translations = list(executor.map(translate_one, target_languages))
+        return dict(zip(target_languages, translations))
+    
+    async def atranslate_many(self, text: str, target_languages: List[str]) -> Dict[str, str]:
+        """
+        Async version of translate_many().
+        
+        Args:
+            text: Text to translate
+            target_languages: Target language names
+            
+        Returns:
+            Dict[str, str]: Translated text by target language
+        """
+        if not text or self._skip(text):
+            return {language: text for language in target_languages}
+        
+        if self.use_math_preservation:
+            modified_text, replacements = self.math_preserver.extract_math(text)
+        else:
+            modified_text, replacements = text, {}
+        
+        async def translate_one(language: str) -> str:
+            try:
+                translated_text = await self._arun_pipeline(modified_text, language)
+                if self.use_math_preservation:
+                    return self._restore_math(translated_text, text, replacements)
+                return translated_text
+            except Exception as e:
+                logger.error(f"Error during translation process ({language}): {e}")
+                return FallbackText(text)
+        
+        translations = await asyncio.gather(*(translate_one(language) for language in target_languages))
+        return dict(zip(target_languages, translations))
+    
+    def is_packable(self, text: str) -> bool:
+        """
+        Check whether a text is short enough to be packed with others into one request.
+        
+        Args:
+            text: Text to check
+            
+        Returns:
+            bool: True if the text fits within pack_max_item_tokens
+        """
+        return estimate_tokens(text) <= self.pack_max_item_tokens
+    
+    @staticmethod
+    def required_placeholders(text: str, replacements: Dict[str, str]) -> List[str]:
+        """
+        Get the math placeholders a translation of a text must keep.
+        
+        Args:
+            text: Text with placeholders, as returned by extract_math()
+            replacements: Placeholder mapping returned by extract_math()
+            
+        Returns:
+            List[str]: Placeholders present in the text
+        """
+        return [placeholder for placeholder in replacements if placeholder in text]
+    
+    def _pack_groups(self, payloads: List[Any]) -> List[List[int]]:
+        """
+        Group items into packed requests within the item count and token budget.
+        
+        Args:
+            payloads: JSON-serializable items to pack
+            
+        Returns:
+            List[List[int]]: Groups of item indices, in input order
+        """
+        groups = []
+        current = []
+        current_tokens = 0
+        
+        for index, payload in enumerate(payloads):
+            tokens = estimate_tokens(json.dumps(payload, ensure_ascii=False))
+            if current and (len(current) >= self.pack_max_items or current_tokens + tokens > self.pack_token_budget):
+                groups.append(current)
+                current = []
+                current_tokens = 0
+            current.append(index)
+            current_tokens += tokens
+        
+        if current:
+            groups.append(current)
+        return groups
+    
+    @staticmethod
+    def _parse_packed_response(response: str, count: int) -> Optional[List[str]]:
+        """
+        Extract the translations from the JSON-array answer of a packed request.
+        
+        Args:
+            response: LLM response expected to hold a JSON array of strings
+            count: Number of items that were sent
+            
+        Returns:
+            Optional[List[str]]: The translations, or None if the response is not an array of count strings
+        """
+        # Tolerate the array being wrapped in a markdown code block
+        match = re.search(r"\[.*\]", response, re.DOTALL)
+        if not match:
+            return None
+        
+        try:
+            outputs = json.loads(match.group(0))
+        except ValueError:
+            return None
+        
+        if not isinstance(outputs, list) or len(outputs) != count:
+            return None
+        if not all(isinstance(output, str) and output.strip() for output in outputs):
+            return None
+        return outputs
+    
+    def _packed_completion(
+        self,
+        system_prompt: str,
+        item_description: str,
+        payloads: List[Any],
+        required: List[List[str]],
+        retries: int = 0
+    ) -> List[Optional[str]]:
+        """
+        Translate several items in one JSON-array request.
+        If the answer has the wrong number of items the group is split in half and each half
+        is retried. Items whose output lost a placeholder are retried together, bypassing the
+        completion cache, up to PACK_MAX_RETRIES times; if every item lost one, or the retries
+        are used up, they are left to the single-text path.
+        
+        Args:
+            system_prompt: Rendered single-item system prompt
+            item_description: Description of the array elements given to the model
+            payloads: JSON-serializable items
+            required: Placeholders the output of each item must keep
+            retries: Number of placeholder retries that led to this request
+            
+        Returns:
+            List[Optional[str]]: Outputs in input order; None for items that could not be packed
+        """
+        # A lone item is better served by the regular single-text path
+        if len(payloads) < 2:
+            return [None] * len(payloads)
+        
+        prompt = system_prompt + self.PACKED_PROMPT_SUFFIX.format(count=len(payloads), item_description=item_description)
+        self.packing_stats["packed_calls"] += 1
+        try:
+            response = self._get_completion(prompt, json.dumps(payloads, ensure_ascii=False), refresh=retries > 0)
+        except CompletionError as e:
+            logger.warning(f"Packed request of {len(payloads)} items failed: {e}")
+            return [None] * len(payloads)
+        
+        outputs = self._parse_packed_response(response, len(payloads))
+        if outputs is None:
+            # Wrong item count or malformed output: split the group and retry each half
+            logger.warning(f"Packed response for {len(payloads)} items could not be matched to the inputs. Splitting the batch.")
+            self.packing_stats["splits"] += 1
+            middle = len(payloads) // 2
+            return (
+                self._packed_completion(system_prompt, item_description, payloads[:middle], required[:middle], retries) +
+                self._packed_completion(system_prompt, item_description, payloads[middle:], required[middle:], retries)
+            )
+        
+        invalid = [
+            i for i, (output, placeholders) in enumerate(zip(outputs, required))
+            if any(placeholder not in output for placeholder in placeholders)
+        ]
+        if not invalid:
+            return outputs
+        
+        # Resending the same items would get the same answer; leave them to the single-text path
+        if len(invalid) == len(payloads) or retries >= self.PACK_MAX_RETRIES:
+            logger.warning(f"{len(invalid)} of {len(payloads)} packed translations lost math placeholders. "
+                           f"Translating them individually.")
+            for i in invalid:
+                outputs[i] = None
+            return outputs
+        
+        # Retry the items whose output lost a math placeholder
+        logger.warning(f"{len(invalid)} of {len(payloads)} packed translations lost math placeholders. Retrying them.")
+        self.packing_stats["splits"] += 1
+        retried = self._packed_completion(
+            system_prompt, item_description,
+            [payloads[i] for i in invalid], [required[i] for i in invalid], retries + 1
+        )
+        for i, output in zip(invalid, retried):
+            outputs[i] = output
+        
+        return outputs
+    
+    def translate_packed(
+        self,
+        payloads: List[Any],
+        required: List[List[str]],
+        system_prompt: str,
+        item_description: str
+    ) -> List[Optional[str]]:
+        """
+        Translate short items in packed requests grouped by item count and token budget.
+        
+        Args:
+            payloads: JSON-serializable items (texts, or objects for multi-part inputs)
+            required: Placeholders the output of each item must keep
+            system_prompt: Rendered single-item system prompt
+            item_description: Description of the array elements given to the model
+            
+        Returns:
+            List[Optional[str]]: Outputs in input order; None for items the caller must translate individually
+        """
+        results = [None] * len(payloads)
+        calls_before = self.packing_stats["packed_calls"]
+        
+        for group in self._pack_groups(payloads):
+            outputs = self._packed_completion(
+                system_prompt, item_description,
+                [payloads[i] for i in group], [required[i] for i in group]
+            )
+            for i, output in zip(group, outputs):
+                results[i] = output
+        
+        packed = sum(1 for output in results if output is not None)
+        self.packing_stats["packed_items"] += packed
+        self.packing_stats["fallbacks"] += len(results) - packed
+        
+        calls = self.packing_stats["packed_calls"] - calls_before
+        if payloads:
+            logger.info(f"Packed {len(payloads)} items into {calls} LLM calls "
+                        f"({calls / len(payloads):.2f} calls per item, {len(results) - packed} translated individually)")
+        return results
+    
+    def verify_packed_language(self, outputs: List[Optional[str]], target_language: str) -> List[Optional[str]]:
+        """
+        Run the language verification of the single-text pipeline on packed outputs.
+        Outputs in the wrong language are dropped, so the caller translates them individually.
+        
+        Args:
+            outputs: Outputs of translate_packed() (None for items already left to the caller)
+            target_language: Target language name
+            
+        Returns:
+            List[Optional[str]]: The outputs, with None for items that failed verification
+        """
+        if self.dataset_type == 'math':
+            return outputs
+        
+        verified = [
+            output if output is None or self._verify_language(output, target_language) else None
+            for output in outputs
+        ]
+        rejected = sum(1 for output, checked in zip(outputs, verified) if output is not None and checked is None)
+        if rejected:
+            self.packing_stats["packed_items"] -= rejected
+            self.packing_stats["fallbacks"] += rejected
+            logger.warning(f"Language verification failed for {rejected} packed outputs. Translating them individually.")
+        return verified
+    
+    def get_packing_stats(self) -> Dict[str, Any]:
+        """
+        Get statistics of packed batch translation.
+        
+        Returns:
+            Dict[str, Any]: Packed items, packed calls, splits, fallbacks and calls per packed item
+        """
+        stats = dict(self.packing_stats)
+        stats["calls_per_item"] = stats["packed_calls"] / stats["packed_items"] if stats["packed_items"] else 0.0
+        return stats
     
     def batch_translate(self, texts: List[str], target_language: str) -> List[str]:
         """
         Translate a batch of texts.
+        With packing enabled, short texts are translated together in JSON-array requests
+        (translation step only); long texts and items whose packed output is invalid go
+        through translate().
         
         Args:
             texts: List of texts to translate
             target_language: Target language
             
         Returns:
-            List[str]: List of translated texts
+            List[str]: List of translated texts, in input order
         """
-        return [self.translate(text, target_language) for text in texts]
+        if not self.packing:
+            return [self.translate(text, target_language) for text in texts]
+        
+        results = list(texts)
+        indices = []  # Texts to pack
+        
+        for i, text in enumerate(texts):
+            if not text or not text.strip() or self._skip(text):
+                continue
+            if not self.is_packable(text):
+                results[i] = self.translate(text, target_language)
+                continue
+            indices.append(i)
+        
+        # Extract math from the texts to pack in one pass
+        if self.use_math_preservation:
+            modified_texts, tables, _ = self.math_preserver.extract_batch([texts[i] for i in indices])
+        else:
+            modified_texts, tables = [texts[i] for i in indices], [{} for _ in indices]
+        packed = list(zip(indices, modified_texts, tables))  # (index, text with placeholders, math replacements)
+        
+        if packed:
+            system_prompt = self._step_system_prompt("system_prompt_step1", target_language, False)
+            outputs = self.translate_packed(
+                [modified_text for _, modified_text, _ in packed],
+                [self.required_placeholders(modified_text, replacements) for _, modified_text, replacements in packed],
+                system_prompt,
+                "texts to translate"
+            )
+            outputs = self.verify_packed_language(outputs, target_language)
+            
+            if self.use_math_preservation:
+                outputs = self.math_preserver.restore_batch(outputs, tables)
+            
+            for (i, _, _), output in zip(packed, outputs):
+                if output is None:
+                    results[i] = self.translate(texts[i], target_language)
+                else:
+                    results[i] = output
+        
+        return results
     
     def update_prompts(self, prompts: Dict[str, str]):
         """
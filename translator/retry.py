@@ -0,0 +1,218 @@
+"""
+Failure classification and retry policy for LLM completion calls.
+"""
+
+import time
+import random
+import asyncio
+from email.utils import parsedate_to_datetime
+from typing import Optional, Callable, Any, Awaitable
+
+from utils.logger import logger
+
+
+class CompletionError(Exception):
+    """
+    Raised when an LLM completion cannot be obtained.
+    """
+    
+    def __init__(self, message: str, status_code: Optional[int] = None,
+                 retry_after: Optional[float] = None, attempts: int = 1):
+        """
+        Initialize the completion error.
+        
+        Args:
+            message: Description of the failure
+            status_code: HTTP status code returned by the provider, if any
+            retry_after: Delay requested by the provider's Retry-After header, in seconds
+            attempts: Number of attempts made before giving up
+        """
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        self.attempts = attempts
+
+
+class RetryableCompletionError(CompletionError):
+    """
+    A transient failure (rate limit, server error, timeout) that may succeed on retry.
+    """
+
+
+class FatalCompletionError(CompletionError):
+    """
+    A failure that will not succeed on retry (authentication, invalid request, content filter).
+    """
+
+
+# Status codes that indicate a transient failure
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+# Exception class names (LiteLLM/OpenAI/httpx) that indicate a transient failure
+RETRYABLE_ERROR_NAMES = {
+    "Timeout", "APITimeoutError", "TimeoutException", "ReadTimeout", "ConnectTimeout",
+    "APIConnectionError", "ConnectError", "RateLimitError", "ServiceUnavailableError",
+    "InternalServerError"
+}
+
+
+def _parse_retry_after(value: Any) -> Optional[float]:
+    """
+    Parse a Retry-After header value given either in seconds or as an HTTP date.
+    
+    Args:
+        value: Header value
+    
+    Returns:
+        Optional[float]: Delay in seconds, or None if the value cannot be parsed
+    """
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(str(value)).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def classify_error(error: Exception) -> CompletionError:
+    """
+    Classify an exception raised by a completion call as retryable or fatal.
+    
+    Args:
+        error: Exception raised by the provider client
+    
+    Returns:
+        CompletionError: RetryableCompletionError or FatalCompletionError wrapping the exception
+    """
+    if isinstance(error, CompletionError):
+        return error
+    
+    status_code = getattr(error, "status_code", None)
+    
+    # Retry-After may be exposed on the response or directly on the exception
+    headers = getattr(getattr(error, "response", None), "headers", None) or getattr(error, "headers", None) or {}
+    try:
+        retry_after = _parse_retry_after(headers.get("retry-after") or headers.get("Retry-After"))
+    except AttributeError:
+        retry_after = None
+    
+    retryable = (
+        isinstance(error, (TimeoutError, ConnectionError))
+        or type(error).__name__ in RETRYABLE_ERROR_NAMES
+        or (isinstance(status_code, int) and (status_code in RETRYABLE_STATUS_CODES or status_code >= 500))
+    )
+    
+    error_class = RetryableCompletionError if retryable else FatalCompletionError
+    return error_class(f"{type(error).__name__}: {error}", status_code=status_code, retry_after=retry_after)
+
+
+class RetryPolicy:
+    """
+    Retries a single completion call on transient failures with exponential backoff and full jitter.
+    Retry-After delays requested by the provider are honoured.
+    """
+    
+    def __init__(self, max_attempts: int = 5, base_delay: float = 1.0, max_delay: float = 60.0):
+        """
+        Initialize the retry policy.
+        
+        Args:
+            max_attempts: Maximum number of attempts per call (1 disables retries)
+            base_delay: Backoff delay before the second attempt, in seconds
+            max_delay: Upper bound on a single backoff delay, in seconds
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+    
+    def compute_delay(self, attempt: int, error: CompletionError) -> float:
+        """
+        Compute the delay before the next attempt.
+        
+        Args:
+            attempt: Number of the attempt that just failed (starting at 1)
+            error: Classified failure of that attempt
+        
+        Returns:
+            float: Delay in seconds
+        """
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+        if error.retry_after is not None:
+            return max(backoff, min(error.retry_after, self.max_delay))
+        return backoff
+    
+    def _handle_failure(self, error: Exception, attempt: int) -> float:
+        """
+        Classify a failed attempt and decide whether to retry.
+        
+        Args:
+            error: Exception raised by the attempt
+            attempt: Number of the attempt (starting at 1)
+        
+        Returns:
+            float: Delay before the next attempt
+        
+        Raises:
+            CompletionError: If the failure is fatal or the attempts are exhausted
+        """
+        classified = classify_error(error)
+        classified.attempts = attempt
+        
+        if isinstance(classified, FatalCompletionError):
+            logger.error(f"LLM completion failed with a non-retryable error: {classified}")
+            raise classified from error
+        
+        if attempt >= self.max_attempts:
+            logger.error(f"LLM completion failed after {attempt} attempts: {classified}")
+            raise classified from error
+        
+        delay = self.compute_delay(attempt, classified)
+        logger.warning(f"LLM completion failed (attempt {attempt}/{self.max_attempts}): {classified}. "
+                       f"Retrying in {delay:.1f} seconds")
+        return delay
+    
+    def call(self, fn: Callable[[], Any]) -> Any:
+        """
+        Call a function, retrying it on transient failures.
+        
+        Args:
+            fn: Function performing one completion attempt
+        
+        Returns:
+            Any: The function's return value
+        
+        Raises:
+            CompletionError: If the call fails with a fatal error or runs out of attempts
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return fn()
+            except Exception as e:
+                time.sleep(self._handle_failure(e, attempt))
+    
+    async def acall(self, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Async version of call().
+        
+        Args:
+            fn: Coroutine function performing one completion attempt
+        
+        Returns:
+            Any: The coroutine's result
+        
+        Raises:
+            CompletionError: If the call fails with a fatal error or runs out of attempts
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return await fn()
+            except Exception as e:
+                await asyncio.sleep(self._handle_failure(e, attempt))
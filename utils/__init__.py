@@ -4,6 +4,17 @@ Utility modules for the hybrid translation system.
 
 from .logger import logger, get_logger
 from .math_preserver import SimpleMathPreserver
+from .code_preserver import CodePreserver
+from .skip_classifier import SkipClassifier, get_skip_classifier
 from .prompts_manager import PromptsManager
+from .completion_cache import CompletionCache
+from .rate_limiter import RateLimiter, get_rate_limiter
+from .lang_detect import LanguageVerifier
+from .segmenter import DocumentSegmenter
+from .translation_memory import TranslationMemory
+from .run_journal import RunJournal
+from .fallback_text import FallbackText
 
-__all__ = ['logger', 'get_logger', 'SimpleMathPreserver', 'PromptsManager']
\ No newline at end of file
+__all__ = ['logger', 'get_logger', 'SimpleMathPreserver', 'CodePreserver', 'SkipClassifier', 'get_skip_classifier',
+           'PromptsManager', 'CompletionCache', 'RateLimiter', 'get_rate_limiter', 'LanguageVerifier',
+           'DocumentSegmenter', 'TranslationMemory', 'RunJournal', 'FallbackText']
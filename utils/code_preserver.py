@@ -0,0 +1,108 @@
+"""
+Utility to keep code, URLs, file paths and identifiers out of translation.
+"""
+
+from typing import Dict, Tuple, Sequence
+
+from utils.logger import logger
+from utils.math_preserver import SimpleMathPreserver
+
+# Kinds of spans protected for each dataset type; other dataset types protect none
+DATASET_CODE_PROTECTION: Dict[str, Tuple[str, ...]] = {
+    "swe-bench": ("code", "urls", "paths", "identifiers"),
+}
+
+class CodePreserver(SimpleMathPreserver):
+    """
+    Extends SimpleMathPreserver with code spans, URLs, file paths and identifiers.
+    Protected spans are replaced by the same numbered placeholders as math, so they
+    pass through every translator untouched and are restored verbatim. Code spans,
+    URLs and paths take priority over math; identifiers come after it, so that math
+    such as a_{min} is not split at the underscore.
+    """
+    
+    # Regex patterns and trigger characters of each kind of span, highest priority first
+    KINDS = {
+        "code": (
+            [
+                # Fenced code blocks - ```...``` or ~~~...~~~
+                r'(?P<fence>`{3,}|~{3,})[\s\S]*?(?P=fence)',
+                
+                # Python tracebacks, up to the exception line
+                r'Traceback \(most recent call last\):\n(?:[ \t]+.*\n)*[\w.]+(?:Error|Exception|Exit|Interrupt|Warning)\b.*',
+                
+                # Traceback frames quoted on their own - File "x.py", line 3, in f
+                r'File "[^"\n]+", line \d+(?:, in \S+)?',
+                
+                # Inline code - `...`
+                r'`[^`\n]+`'
+            ],
+            "`~\"("
+        ),
+        "urls": (
+            [
+                # URLs, without trailing punctuation
+                r'\b(?:https?|ftp)://[^\s<>"\'`]*[^\s<>"\'`.,;:!?)\]]'
+            ],
+            ":"
+        ),
+        "paths": (
+            [
+                # Paths with a directory - src/app/models.py, /usr/lib/python3, ./setup.py
+                r'(?<![\w/.])(?:\.{1,2}/|/)?(?:[\w.-]+/)+[\w-]+\.\w+\b|(?<![\w/])/(?:[\w.-]+/)+[\w.-]*',
+                
+                # File names with a source or config extension - setup.py, pyproject.toml
+                r'\b[\w-]+\.(?:py|pyi|pyx|ipynb|js|ts|jsx|tsx|json|yaml|yml|toml|cfg|ini|txt|md|rst|'
+                r'c|h|cc|cpp|hpp|java|go|rs|rb|php|sh|html|css|sql|lock)\b'
+            ],
+            "/."
+        ),
+        "identifiers": (
+            [
+                # Calls - parse_args(), np.zeros((3, 3)) with one level of nesting
+                r'\b[A-Za-z_][\w.]*\((?:[^()\n]|\([^()\n]*\))*\)',
+                
+                # Dotted names - np.array, django.db.models
+                r'\b[A-Za-z_]\w+(?:\.[A-Za-z_]\w+)+\b',
+                
+                # Names with an underscore - snake_case, __init__, MAX_SIZE
+                r'\b(?=\w*_)(?=\w*[A-Za-z])\w+\b'
+            ],
+            "(._"
+        )
+    }
+    
+    def __init__(self, kinds: Sequence[str] = ("code", "urls", "paths", "identifiers"), include_math: bool = True):
+        """
+        Initialize the preserver.
+        
+        Args:
+            kinds: Kinds of spans to protect (keys of KINDS)
+            include_math: Whether math expressions are protected as well
+        
+        Raises:
+            ValueError: If a kind is unknown
+        """
+        unknown = [kind for kind in kinds if kind not in self.KINDS]
+        if unknown:
+            raise ValueError(f"Unknown code protection kinds: {unknown}")
+        
+        super().__init__()
+        self.kinds = tuple(kinds)
+        self.include_math = include_math
+        
+        spans = [kind for kind in self.KINDS if kind in self.kinds and kind != "identifiers"]
+        identifiers = ["identifiers"] if "identifiers" in self.kinds else []
+        
+        self.patterns = (
+            [pattern for kind in spans for pattern in self.KINDS[kind][0]] +
+            (self.patterns if include_math else []) +
+            [pattern for kind in identifiers for pattern in self.KINDS[kind][0]]
+        )
+        self.trigger_characters = (
+            (self.trigger_characters if include_math else "") +
+            "".join(self.KINDS[kind][1] for kind in self.kinds)
+        )
+        self._compile_patterns()
+        
+        logger.info(f"CodePreserver initialized for {', '.join(self.kinds)}{' and math' if include_math else ''}")
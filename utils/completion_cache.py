@@ -0,0 +1,231 @@
+"""
+Persistent, content-addressed cache for LLM completions.
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Optional, Dict, Any
+
+from utils.logger import logger
+
+# Default location of the on-disk cache database
+DEFAULT_CACHE_PATH = os.path.join(".cache", "llm_completions.sqlite")
+
+class CompletionCache:
+    """
+    Disk-backed cache for LLM completions stored in SQLite.
+    Entries are keyed on a hash of the model name, the rendered prompts and the
+    sampling parameters, and evicted in least-recently-used order once the cache
+    grows past its entry or size limits.
+    """
+    
+    # Number of writes between two eviction checks
+    EVICTION_CHECK_INTERVAL = 100
+    
+    def __init__(
+        self,
+        path: str = DEFAULT_CACHE_PATH,
+        max_entries: int = 100000,
+        max_bytes: int = 512 * 1024 * 1024,
+        enabled: bool = True
+    ):
+        """
+        Initialize the completion cache.
+        
+        Args:
+            path: Path to the SQLite database file
+            max_entries: Maximum number of cached completions
+            max_bytes: Maximum total size of cached completions in bytes
+            enabled: Whether lookups and writes go through the cache
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        
+        # A single connection is shared by all threads and guarded by a lock
+        self._lock = threading.Lock()
+        self._writes_since_check = 0
+        
+        # Statistics
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0
+        }
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock:
+            # WAL lets several worker processes read while one of them writes
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS completions ("
+                "key TEXT PRIMARY KEY, "
+                "model TEXT, "
+                "response TEXT NOT NULL, "
+                "size INTEGER NOT NULL, "
+                "created REAL NOT NULL, "
+                "last_access REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_completions_last_access ON completions (last_access)"
+            )
+            self._conn.commit()
+        
+        logger.info(f"Completion cache initialized at {path} (enabled: {enabled})")
+    
+    @staticmethod
+    def make_key(
+        model_name: str,
+        system_prompt: str,
+        user_prompt: str,
+        params: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """
+        Build the content-addressed key for a completion request.
+        
+        Args:
+            model_name: Name of the model the request is sent to
+            system_prompt: Fully rendered system prompt
+            user_prompt: User prompt
+            params: Sampling parameters sent with the request
+        
+        Returns:
+            str: Hex digest identifying the request
+        """
+        payload = json.dumps(
+            {
+                "model": model_name,
+                "system": system_prompt,
+                "user": user_prompt,
+                "params": params or {}
+            },
+            sort_keys=True,
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached completion and mark it as recently used.
+        
+        Args:
+            key: Key returned by make_key()
+        
+        Returns:
+            Optional[str]: The cached completion, or None on a miss or when disabled
+        """
+        if not self.enabled:
+            return None
+        
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT response FROM completions WHERE key = ?", (key,)
+                ).fetchone()
+                
+                if row is None:
+                    self.stats["misses"] += 1
+                    return None
+                
+                self._conn.execute(
+                    "UPDATE completions SET last_access = ? WHERE key = ?", (time.time(), key)
+                )
+                self._conn.commit()
+                self.stats["hits"] += 1
+                return row[0]
+        except sqlite3.Error as e:
+            logger.warning(f"Completion cache lookup failed: {e}")
+            return None
+    
+    def set(self, key: str, response: str, model_name: Optional[str] = None) -> None:
+        """
+        Store a completion in the cache.
+        
+        Args:
+            key: Key returned by make_key()
+            response: Completion text to store
+            model_name: Model that produced the completion
+        """
+        if not self.enabled or response is None:
+            return
+        
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO completions (key, model, response, size, created, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, model_name, response, size, now, now)
+                )
+                self._conn.commit()
+                self.stats["writes"] += 1
+                
+                self._writes_since_check += 1
+                if self._writes_since_check >= self.EVICTION_CHECK_INTERVAL:
+                    self._writes_since_check = 0
+                    self._evict()
+        except sqlite3.Error as e:
+            logger.warning(f"Completion cache write failed: {e}")
+    
+    def _evict(self) -> None:
+        """Evict least recently used entries until the cache is within its bounds. Caller holds the lock."""
+        count, total_size = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM completions"
+        ).fetchone()
+        
+        if count <= self.max_entries and total_size <= self.max_bytes:
+            return
+        
+        evicted = 0
+        rows = self._conn.execute(
+            "SELECT key, size FROM completions ORDER BY last_access ASC"
+        )
+        stale_keys = []
+        for key, size in rows:
+            if count <= self.max_entries and total_size <= self.max_bytes:
+                break
+            stale_keys.append((key,))
+            count -= 1
+            total_size -= size
+            evicted += 1
+        
+        self._conn.executemany("DELETE FROM completions WHERE key = ?", stale_keys)
+        self._conn.commit()
+        self.stats["evictions"] += evicted
+        logger.info(f"Evicted {evicted} entries from completion cache")
+    
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        with self._lock:
+            self._conn.execute("DELETE FROM completions")
+            self._conn.commit()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache hit/miss statistics.
+        
+        Returns:
+            Dict[str, Any]: Counters and the hit rate of this cache instance
+        """
+        lookups = self.stats["hits"] + self.stats["misses"]
+        stats = dict(self.stats)
+        stats["hit_rate"] = self.stats["hits"] / lookups if lookups else 0.0
+        return stats
+    
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,33 @@
+"""
+Marker for text returned in place of a failed translation.
+"""
+
+from typing import Any
+
+class FallbackText(str):
+    """
+    Text returned in place of a translation that failed: the source text, or an error
+    notice where a caller reports one (see translator/cli.py). It compares, hashes and
+    serializes as the plain string, so outputs are unaffected; callers tell failures apart
+    from texts that legitimately stay the same (proper nouns, IDs, URLs, code, ...) with
+    isinstance() instead of comparing output with source.
+    """
+    
+    @classmethod
+    def contains(cls, value: Any) -> bool:
+        """
+        Check whether a JSON value holds a fallback string leaf.
+        
+        Args:
+            value: String, dictionary, list or scalar
+        
+        Returns:
+            bool: True if any string leaf is a FallbackText
+        """
+        if isinstance(value, cls):
+            return True
+        if isinstance(value, dict):
+            return any(cls.contains(v) for v in value.values())
+        if isinstance(value, list):
+            return any(cls.contains(v) for v in value)
+        return False
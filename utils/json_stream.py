@@ -0,0 +1,172 @@
+"""
+Lazy reading and incremental writing of JSON and JSON Lines datasets.
+"""
+
+import json
+from typing import Any, Iterator
+
+from utils.logger import logger
+
+# Number of characters read at a time from a JSON array file
+READ_BLOCK_SIZE = 1 << 16
+
+def iter_jsonl(path: str) -> Iterator[Any]:
+    """
+    Read the records of a JSON Lines file one at a time.
+    
+    Args:
+        path: Path to the JSON Lines file
+    
+    Yields:
+        Any: The record of each non-empty line
+    
+    Raises:
+        ValueError: If a line is not valid JSON
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"{path}:{line_number}: invalid JSON record: {e}") from e
+
+def iter_json_array(path: str) -> Iterator[Any]:
+    """
+    Read the elements of a file holding a top-level JSON array one at a time,
+    without loading the whole file.
+    
+    Args:
+        path: Path to the JSON file
+    
+    Yields:
+        Any: Each element of the array
+    
+    Raises:
+        ValueError: If the file does not hold a well-formed JSON array
+    """
+    decoder = json.JSONDecoder()
+    
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ""
+        position = 0
+        eof = False
+        
+        def fill() -> None:
+            """Drop the consumed part of the buffer and read the next block."""
+            nonlocal buffer, position, eof
+            block = f.read(READ_BLOCK_SIZE)
+            eof = not block
+            buffer = buffer[position:] + block
+            position = 0
+        
+        def next_char() -> str:
+            """Skip whitespace and return the next character ('' at the end of the file)."""
+            nonlocal position
+            while True:
+                while position < len(buffer) and buffer[position].isspace():
+                    position += 1
+                if position < len(buffer) or eof:
+                    return buffer[position] if position < len(buffer) else ""
+                fill()
+        
+        if next_char() != "[":
+            raise ValueError(f"{path}: expected a top-level JSON array")
+        position += 1
+        
+        if next_char() == "]":
+            return
+        
+        while True:
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as e:
+                if eof:
+                    raise ValueError(f"{path}: invalid JSON array element: {e}") from e
+                fill()
+                continue
+            
+            # A number cut off at the end of the buffer decodes as a shorter number,
+            # so an element only counts once the separator after it has been read
+            separator_position = end
+            while separator_position < len(buffer) and buffer[separator_position].isspace():
+                separator_position += 1
+            separator = buffer[separator_position] if separator_position < len(buffer) else ""
+            if separator not in (",", "]"):
+                if eof:
+                    raise ValueError(f"{path}: expected ',' or ']' after array element")
+                fill()
+                continue
+            
+            position = separator_position + 1
+            yield item
+            
+            if separator == "]":
+                return
+            next_char()
+
+def iter_json_items(path: str) -> Iterator[Any]:
+    """
+    Read the items of a dataset lazily: the lines of a .jsonl file or the elements of a JSON array.
+    
+    Args:
+        path: Path to the dataset file
+    
+    Yields:
+        Any: Each item of the dataset
+    """
+    if path.endswith(".jsonl"):
+        return iter_jsonl(path)
+    return iter_json_array(path)
+
+class JsonItemWriter:
+    """
+    Writes items to a dataset file as they become available, flushing after each one.
+    A .jsonl output gets one record per line and is valid after every write; any
+    other output gets an indented JSON array that is closed when the writer is closed.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Open the output file.
+        
+        Args:
+            path: Path to the output file
+        """
+        self.path = path
+        self.jsonl = path.endswith(".jsonl")
+        self.count = 0
+        self._file = open(path, 'w', encoding='utf-8')
+        if not self.jsonl:
+            self._file.write("[")
+    
+    def write(self, item: Any) -> None:
+        """
+        Append an item to the output.
+        
+        Args:
+            item: JSON-serializable item
+        """
+        if self.jsonl:
+            self._file.write(json.dumps(item, ensure_ascii=False) + "\n")
+        else:
+            element = json.dumps(item, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+            self._file.write(("," if self.count else "") + "\n  " + element)
+        self._file.flush()
+        self.count += 1
+    
+    def close(self) -> None:
+        """Finish the output file."""
+        if self._file.closed:
+            return
+        if not self.jsonl:
+            self._file.write("\n]" if self.count else "]")
+        self._file.close()
+        logger.info(f"Wrote {self.count} items to {self.path}")
+    
+    def __enter__(self) -> "JsonItemWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
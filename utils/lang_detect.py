@@ -1,24 +1,282 @@
 """
 Language detection utility for translation verification.
+Languages written in a distinctive script are verified from a Unicode-script histogram;
+langdetect is only used as a fallback for Latin-script (and other shared-script) targets.
 """
 
-from typing import Optional
-from langdetect import detect, DetectorFactory, LangDetectException
+import bisect
+import threading
+from typing import Optional, List, Dict
+
+from utils.logger import logger
+
+try:
+    from langdetect import detect, DetectorFactory, LangDetectException
+    
+    # Set seed for consistent results
+    DetectorFactory.seed = 0
+    LANGDETECT_AVAILABLE = True
+except ImportError:
+    LANGDETECT_AVAILABLE = False
+    
+    class LangDetectException(Exception):
+        pass
+
+# langdetect builds its shared detector factory lazily and is not thread safe
+_langdetect_lock = threading.Lock()
+
+# Unicode blocks of the scripts the verifier recognizes, as (first code point, last code point, script)
+SCRIPT_RANGES = sorted([
+    (0x0041, 0x005A, "Latin"), (0x0061, 0x007A, "Latin"), (0x00C0, 0x024F, "Latin"), (0x1E00, 0x1EFF, "Latin"),
+    (0x0370, 0x03FF, "Greek"), (0x1F00, 0x1FFF, "Greek"),
+    (0x0400, 0x052F, "Cyrillic"),
+    (0x0530, 0x058F, "Armenian"),
+    (0x0590, 0x05FF, "Hebrew"), (0xFB1D, 0xFB4F, "Hebrew"),
+    (0x0600, 0x06FF, "Arabic"), (0x0750, 0x077F, "Arabic"), (0xFB50, 0xFDFF, "Arabic"), (0xFE70, 0xFEFF, "Arabic"),
+    (0x0900, 0x097F, "Devanagari"),
+    (0x0980, 0x09FF, "Bengali"),
+    (0x0A80, 0x0AFF, "Gujarati"),
+    (0x0B80, 0x0BFF, "Tamil"),
+    (0x0C00, 0x0C7F, "Telugu"),
+    (0x0E00, 0x0E7F, "Thai"),
+    (0x10A0, 0x10FF, "Georgian"),
+    (0x1100, 0x11FF, "Hangul"), (0x3130, 0x318F, "Hangul"), (0xAC00, 0xD7AF, "Hangul"),
+    (0x3040, 0x309F, "Hiragana"),
+    (0x30A0, 0x30FF, "Katakana"), (0x31F0, 0x31FF, "Katakana"), (0xFF66, 0xFF9F, "Katakana"),
+    (0x3400, 0x4DBF, "Han"), (0x4E00, 0x9FFF, "Han"), (0xF900, 0xFAFF, "Han")
+])
+_RANGE_STARTS = [start for start, _, _ in SCRIPT_RANGES]
+
+# Scripts that identify a target language on their own (Japanese is handled separately)
+LANGUAGE_SCRIPTS = {
+    "ru": "Cyrillic",
+    "uk": "Cyrillic",
+    "bg": "Cyrillic",
+    "el": "Greek",
+    "hy": "Armenian",
+    "he": "Hebrew",
+    "ar": "Arabic",
+    "hi": "Devanagari",
+    "bn": "Bengali",
+    "gu": "Gujarati",
+    "ta": "Tamil",
+    "te": "Telugu",
+    "th": "Thai",
+    "ka": "Georgian",
+    "ko": "Hangul",
+    "zh": "Han",
+    "zh-cn": "Han",
+    "zh-tw": "Han"
+}
+
+# Latin-script languages: langdetect tells them apart, but a text with too few Latin letters is rejected without it
+LATIN_LANGUAGES = {
+    "en", "es", "fr", "de", "it", "pt", "ro", "nl", "pl", "cs", "sk", "sv", "da", "no",
+    "fi", "hu", "tr", "vi", "id", "ms", "ca", "hr", "sl", "et", "lv", "lt", "sq", "sw", "tl"
+}
+
+# Best-guess language of a dominant script (used by detect())
+SCRIPT_LANGUAGES = {
+    "Greek": "el", "Armenian": "hy", "Hebrew": "he", "Arabic": "ar", "Devanagari": "hi",
+    "Bengali": "bn", "Gujarati": "gu", "Tamil": "ta", "Telugu": "te", "Thai": "th",
+    "Georgian": "ka", "Hangul": "ko", "Han": "zh-cn"
+}
+
+
+def script_of(char: str) -> Optional[str]:
+    """
+    Get the script of a character.
+    
+    Args:
+        char: A single character
+    
+    Returns:
+        Optional[str]: Script name, or None for characters outside the known scripts
+    """
+    code_point = ord(char)
+    index = bisect.bisect_right(_RANGE_STARTS, code_point) - 1
+    if index >= 0:
+        start, end, script = SCRIPT_RANGES[index]
+        if code_point <= end:
+            return script
+    return None
+
+
+def script_histogram(text: str) -> Dict[str, int]:
+    """
+    Count the letters of a text by script.
+    
+    Args:
+        text: Text to analyse
+    
+    Returns:
+        Dict[str, int]: Number of letters by script name
+    """
+    histogram = {}
+    for char in text:
+        if char.isalpha():
+            script = script_of(char)
+            if script is not None:
+                histogram[script] = histogram.get(script, 0) + 1
+    return histogram
 
-# Set seed for consistent results
-DetectorFactory.seed = 0
 
 def detect_language(text: str) -> str:
     """
-    Detect the language of a text.
+    Detect the language of a text with langdetect.
     
     Args:
         text: Text to detect language from
-        
+    
     Returns:
         str: ISO 639-1 language code
-        
+    
     Raises:
-        LangDetectException: If language detection fails
+        LangDetectException: If language detection fails or langdetect is not installed
     """
-    return detect(text)
\ No newline at end of file
+    if not LANGDETECT_AVAILABLE:
+        raise LangDetectException("langdetect not installed")
+    with _langdetect_lock:
+        return detect(text)
+
+
+class LanguageVerifier:
+    """
+    Verifies that texts are written in a target language.
+    Targets with a distinctive script are settled from the script histogram of the
+    text; other targets fall back to langdetect. Instances are safe to share between threads.
+    """
+    
+    def __init__(self, min_script_share: float = 0.4, min_letters: int = 5):
+        """
+        Initialize the verifier.
+        
+        Args:
+            min_script_share: Share of the letters that must be in the target script
+                (leaves room for Latin code, formulas and names in the translation)
+            min_letters: Texts with fewer letters are not verified
+        """
+        self.min_script_share = min_script_share
+        self.min_letters = min_letters
+        
+        # Statistics
+        self._lock = threading.Lock()
+        self.stats = {
+            "script_checks": 0,
+            "langdetect_checks": 0,
+            "undecided": 0
+        }
+    
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+    
+    def _verify_by_script(self, histogram: Dict[str, int], language_code: str) -> bool:
+        """
+        Verify a script-distinctive target language from a script histogram.
+        
+        Args:
+            histogram: Letter counts by script
+            language_code: Target language code
+        
+        Returns:
+            bool: True if enough of the letters are in the target script
+        """
+        total = sum(histogram.values())
+        if language_code == "ja":
+            # Japanese mixes kana and kanji; kana is what tells it apart from Chinese
+            kana = histogram.get("Hiragana", 0) + histogram.get("Katakana", 0)
+            return kana > 0 and (kana + histogram.get("Han", 0)) / total >= self.min_script_share
+        
+        script = LANGUAGE_SCRIPTS[language_code]
+        if script == "Han" and histogram.get("Hiragana", 0) + histogram.get("Katakana", 0) > 0:
+            # Kana means Japanese, not Chinese
+            return False
+        return histogram.get(script, 0) / total >= self.min_script_share
+    
+    def verify(self, text: str, language_code: str) -> Optional[bool]:
+        """
+        Check whether a text is written in the target language.
+        
+        Args:
+            text: Text to verify
+            language_code: Target language code (e.g. 'ja', 'he', 'fr', 'zh-cn')
+        
+        Returns:
+            Optional[bool]: True or False, or None if the text is too short or the language
+                cannot be determined (langdetect missing or failing)
+        """
+        language_code = language_code.lower()
+        histogram = script_histogram(text)
+        if sum(histogram.values()) < self.min_letters:
+            self._count("undecided")
+            return None
+        
+        if language_code == "ja" or language_code in LANGUAGE_SCRIPTS:
+            self._count("script_checks")
+            return self._verify_by_script(histogram, language_code)
+        
+        if language_code.split("-")[0] in LATIN_LANGUAGES and \
+                histogram.get("Latin", 0) / sum(histogram.values()) < self.min_script_share:
+            self._count("script_checks")
+            return False
+        
+        # Latin-script and other shared-script targets need a statistical detector
+        try:
+            detected = detect_language(text)
+        except LangDetectException as e:
+            logger.debug(f"Language detection error: {e}")
+            self._count("undecided")
+            return None
+        
+        self._count("langdetect_checks")
+        return detected == language_code or detected.split("-")[0] == language_code.split("-")[0]
+    
+    def verify_batch(self, texts: List[str], language_code: str) -> List[Optional[bool]]:
+        """
+        Check whether each of several texts is written in the target language.
+        
+        Args:
+            texts: Texts to verify
+            language_code: Target language code
+        
+        Returns:
+            List[Optional[bool]]: Result of verify() for each text, in input order
+        """
+        return [self.verify(text, language_code) for text in texts]
+    
+    def detect(self, text: str) -> Optional[str]:
+        """
+        Guess the language of a text, from its dominant script when it is distinctive.
+        
+        Args:
+            text: Text to analyse
+        
+        Returns:
+            Optional[str]: Language code, or None if it cannot be determined
+        """
+        histogram = script_histogram(text)
+        if sum(histogram.values()) < self.min_letters:
+            return None
+        
+        if histogram.get("Hiragana", 0) + histogram.get("Katakana", 0) > 0:
+            return "ja"
+        
+        dominant = max(histogram, key=histogram.get)
+        if dominant in SCRIPT_LANGUAGES:
+            return SCRIPT_LANGUAGES[dominant]
+        
+        try:
+            return detect_language(text)
+        except LangDetectException:
+            return None
+    
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get the number of verifications settled by each tier.
+        
+        Returns:
+            Dict[str, int]: Script-histogram checks, langdetect checks and undecided texts
+        """
+        with self._lock:
+            return dict(self.stats)
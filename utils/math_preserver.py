@@ -3,8 +3,10 @@ Utility to preserve mathematical expressions during translation.
 """
 
 import re
-import uuid
-from typing import Dict, Tuple, List
+import bisect
+import threading
+from collections import Counter
+from typing import Dict, Tuple, List, Any, Iterable
 from utils.logger import logger
 
 class SimpleMathPreserver:
@@ -13,17 +15,60 @@ class SimpleMathPreserver:
     Uses a combination of regex patterns to identify and protect various math notation formats.
     """
     
+    # Matches the placeholders inserted by extract_math(): [[M0]], [[M1]], ...
+    # Brackets and a capital M followed by digits match none of the math patterns,
+    # tokenize into a few tokens and are left alone by MT engines and LLMs
+    PLACEHOLDER_PATTERN = re.compile(r'\[\[M\d+\]\]')
+    
+    # Matches placeholders in translated text, tolerating the spacing and case changes
+    # that machine translation sometimes introduces inside the brackets
+    RESTORE_PATTERN = re.compile(r'\[\[\s*[Mm]\s*(\d+)\s*\]\]')
+    
+    # Joins the texts of a batch. No math pattern matches it, so a match only crosses
+    # from one text into the next when an expression is left open (e.g. a lone $)
+    BATCH_SEPARATOR = "\x00"
+    
+    # Stands in for each character of a span found by an earlier pattern. Like a
+    # placeholder, no pattern starts or ends on it, but a later match may enclose it
+    MASK_CHARACTER = "\x01"
+    
+    @staticmethod
+    def placeholder(number: int) -> str:
+        """
+        Get the placeholder with a given number.
+        
+        Args:
+            number: Placeholder number
+            
+        Returns:
+            str: The placeholder, e.g. [[M3]]
+        """
+        return f"[[M{number}]]"
+    
+    @classmethod
+    def find_placeholders(cls, text: str) -> List[str]:
+        """
+        Find the placeholders in a (translated) text, in their canonical form.
+        
+        Args:
+            text: Text that may contain placeholders
+            
+        Returns:
+            List[str]: Placeholders in text order, including repeats
+        """
+        return [cls.placeholder(int(number)) for number in cls.RESTORE_PATTERN.findall(text)]
+    
     def __init__(self):
         """Initialize the math preserver with regex patterns for different math notations."""
         
-        # Define regex patterns for different types of math expressions
+        # Define regex patterns for different types of math expressions, highest priority first
         self.patterns = [
+            # LaTeX display math - $$...$$ (before inline math, which would match inside it)
+            r'\$\$[^$]+\$\$',
+            
             # LaTeX inline math - $...$
             r'\$[^$]+\$',
             
-            # LaTeX display math - $$...$$
-            r'\$\$[^$]+\$\$',
-            
             # LaTeX environments - \begin{...}...\end{...}
             r'\\begin\{[^}]+\}[\s\S]*?\\end\{[^}]+\}',
             
@@ -49,11 +94,35 @@ class SimpleMathPreserver:
             r'\([a-zA-Z0-9\+\-\*\/\^\s=]+\)'
         ]
         
+        # Every pattern above needs at least one of these characters, so a text without
+        # any of them holds no math; keep in sync with the patterns
+        self.trigger_characters = "$\\(_^+-*/=<>"
+        
+        self._compile_patterns()
+        
+        # Statistics
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            "extracted": 0,
+            "restored": 0,
+            "missing": 0,
+            "duplicated": 0
+        }
+        
         logger.info("SimpleMathPreserver initialized")
     
+    def _compile_patterns(self) -> None:
+        """Compile self.patterns and self.trigger_characters into the patterns used for scanning."""
+        self.compiled_patterns = [re.compile(pattern) for pattern in self.patterns]
+        
+        # Texts without a trigger character (or the start of a placeholder) are skipped by extract_batch()
+        self.trigger_pattern = re.compile(f"[{re.escape(self.trigger_characters + '[')}]")
+    
     def extract_math(self, text: str) -> Tuple[str, Dict[str, str]]:
         """
-        Extract mathematical expressions from text and replace them with unique placeholders.
+        Extract mathematical expressions from text and replace them with numbered placeholders.
+        Numbering starts at 0, or after the highest placeholder the text already contains,
+        so the same text always gets the same placeholders.
         
         Args:
             text: Input text that may contain mathematical expressions
@@ -66,32 +135,15 @@ class SimpleMathPreserver:
         if not text:
             return text, {}
             
-        replacements = {}
-        modified_text = text
-        
         try:
-            # Process each pattern and replace matches with placeholders
-            for pattern in self.patterns:
-                matches = re.finditer(pattern, modified_text)
-                
-                # Create a list to store matches and their positions
-                match_data = []
-                
-                # Collect all matches first
-                for match in matches:
-                    match_text = match.group(0)
-                    start_pos = match.start()
-                    end_pos = match.end()
-                    match_data.append((match_text, start_pos, end_pos))
-                
-                # Process matches in reverse order (to avoid position shifts)
-                for match_text, start_pos, end_pos in sorted(match_data, key=lambda x: x[1], reverse=True):
-                    placeholder = f"__MATH_{uuid.uuid4().hex}__"
-                    replacements[placeholder] = match_text
-                    
-                    # Replace the match with the placeholder
-                    modified_text = modified_text[:start_pos] + placeholder + modified_text[end_pos:]
+            # Count on from any placeholder-like token already in the text
+            existing = [int(number) for number in self.RESTORE_PATTERN.findall(text)]
+            start = max(existing) + 1 if existing else 0
             
+            modified_text, replacements = self._substitute(text, self._scan(text), 0, start)
+            
+            with self._stats_lock:
+                self.stats["extracted"] += len(replacements)
             logger.info(f"Extracted {len(replacements)} math expressions from text")
             
             return modified_text, replacements
@@ -101,9 +153,202 @@ class SimpleMathPreserver:
             # Return original text if extraction fails
             return text, {}
     
+    @classmethod
+    def _mask(cls, text: str, spans: List[Tuple[int, int]]) -> str:
+        """Replace every character of the given (sorted, disjoint) spans with MASK_CHARACTER."""
+        pieces = []
+        position = 0
+        for start, end in spans:
+            pieces.append(text[position:start])
+            pieces.append(cls.MASK_CHARACTER * (end - start))
+            position = end
+        pieces.append(text[position:])
+        return "".join(pieces)
+    
+    def _scan(self, text: str) -> List[Tuple[int, int]]:
+        """
+        Find the math spans of a text, one pattern at a time in priority order.
+        Each pattern runs over the text with the spans found so far masked out, as if
+        they had already been replaced by placeholders; a match that encloses earlier
+        spans takes their place. Existing placeholders are masked from the start.
+        
+        Args:
+            text: Text (or buffer of joined texts) to scan
+            
+        Returns:
+            List[Tuple[int, int]]: Start and end of each span, in text order
+        """
+        existing = [match.span() for match in self.PLACEHOLDER_PATTERN.finditer(text)]
+        masked = self._mask(text, existing) if existing else text
+        spans: List[Tuple[int, int]] = []
+        
+        for pattern in self.compiled_patterns:
+            found = [match.span() for match in pattern.finditer(masked) if match.end() > match.start()]
+            if not found:
+                continue
+            
+            # A new span either encloses earlier spans or is disjoint from them
+            merged = []
+            i = 0
+            for start, end in found:
+                while i < len(spans) and spans[i][1] <= start:
+                    merged.append(spans[i])
+                    i += 1
+                while i < len(spans) and spans[i][0] < end:
+                    i += 1
+                merged.append((start, end))
+            merged.extend(spans[i:])
+            spans = merged
+            masked = self._mask(masked, found)
+        
+        return spans
+    
+    def _substitute(self, text: str, spans: Iterable[Tuple[int, int]], offset: int, start: int) -> Tuple[str, Dict[str, str]]:
+        """
+        Replace the math spans of a text with numbered placeholders.
+        
+        Args:
+            text: The text
+            spans: Spans found by _scan() over a buffer holding the text, in order
+            offset: Position of the text in that buffer
+            start: Number of the first placeholder
+            
+        Returns:
+            Tuple[str, Dict[str, str]]: Modified text and the placeholder mapping
+        """
+        replacements = {}
+        pieces = []
+        position = 0
+        
+        # Copy the text between spans and a placeholder for each span
+        for span_start, span_end in spans:
+            placeholder = self.placeholder(start + len(replacements))
+            replacements[placeholder] = text[span_start - offset:span_end - offset]
+            pieces.append(text[position:span_start - offset])
+            pieces.append(placeholder)
+            position = span_end - offset
+        pieces.append(text[position:])
+        
+        return "".join(pieces), replacements
+    
+    @classmethod
+    def _join(cls, texts: List[str]) -> Tuple[str, List[int]]:
+        """
+        Join texts into one buffer.
+        
+        Args:
+            texts: Texts to join
+            
+        Returns:
+            Tuple[str, List[int]]: The buffer and the start offset of each text in it
+        """
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + len(cls.BATCH_SEPARATOR)
+        return cls.BATCH_SEPARATOR.join(texts), starts
+    
+    def extract_batch(self, texts: List[str]) -> Tuple[List[str], List[Dict[str, str]], List[bool]]:
+        """
+        Extract mathematical expressions from many texts at once.
+        The texts are joined into one buffer, in which a cheap scan for the characters
+        math needs finds the texts that can hold any. Those are joined again and scanned
+        with each pattern once; each span is mapped back to its text through an index
+        of the text offsets. A text that an expression left open (e.g. a lone $)
+        runs out of is extracted on its own instead. The result for each text is the
+        same as extract_math() would give.
+        
+        Args:
+            texts: Input texts that may contain mathematical expressions
+            
+        Returns:
+            Tuple containing:
+                - Modified texts with placeholders
+                - Dictionary mapping placeholders to original expressions, per text
+                - Whether each text contains math (texts without it need no restore_batch())
+        """
+        modified_texts = list(texts)
+        tables: List[Dict[str, str]] = [{} for _ in texts]
+        if not texts:
+            return modified_texts, tables, []
+        
+        try:
+            strings = [text or "" for text in texts]
+            buffer, starts = self._join(strings)
+            
+            # Texts with at least one trigger character; the search skips to the next text after each hit
+            candidates = []
+            hit = self.trigger_pattern.search(buffer)
+            while hit:
+                k = bisect.bisect_right(starts, hit.start()) - 1
+                candidates.append(k)
+                hit = self.trigger_pattern.search(buffer, starts[k] + len(strings[k]) + len(self.BATCH_SEPARATOR))
+            
+            buffer, starts = self._join([strings[k] for k in candidates])
+            
+            # Number of the first placeholder of each text that already contains placeholder-like tokens
+            first_numbers = {}
+            for match in self.RESTORE_PATTERN.finditer(buffer):
+                j = bisect.bisect_right(starts, match.start()) - 1
+                first_numbers[j] = max(first_numbers.get(j, 0), int(match.group(1)) + 1)
+            
+            # Spans of each candidate text, and candidates to extract on their own
+            spans: Dict[int, List[Tuple[int, int]]] = {}
+            rescan = set()
+            for start, end in self._scan(buffer):
+                j = bisect.bisect_right(starts, start) - 1
+                if end > starts[j] + len(strings[candidates[j]]):
+                    rescan.update(range(j, bisect.bisect_right(starts, end - 1)))
+                    continue
+                spans.setdefault(j, []).append((start, end))
+            
+            for j, text_spans in spans.items():
+                if j not in rescan:
+                    k = candidates[j]
+                    modified_texts[k], tables[k] = self._substitute(
+                        strings[k], text_spans, starts[j], first_numbers.get(j, 0)
+                    )
+            for j in rescan:
+                k = candidates[j]
+                modified_texts[k], tables[k] = self._substitute(
+                    strings[k], self._scan(strings[k]), 0, first_numbers.get(j, 0)
+                )
+            
+            extracted = sum(len(table) for table in tables)
+            with self._stats_lock:
+                self.stats["extracted"] += extracted
+            logger.info(f"Extracted {extracted} math expressions from {len(texts)} texts in one buffer")
+            
+            return modified_texts, tables, [bool(table) for table in tables]
+            
+        except Exception as e:
+            logger.error(f"Error extracting math expressions from a batch: {e}")
+            # Return the original texts if extraction fails
+            return list(texts), [{} for _ in texts], [False] * len(texts)
+    
+    def check_placeholders(self, translated_text: str, replacements: Dict[str, str]) -> Dict[str, List[str]]:
+        """
+        Compare the placeholders of a translated text with the ones extract_math() inserted.
+        
+        Args:
+            translated_text: Translated text with placeholders
+            replacements: Dictionary mapping placeholders to original expressions
+            
+        Returns:
+            Dict[str, List[str]]: Placeholders that are 'missing' and placeholders that are 'duplicated'
+        """
+        counts = Counter(p for p in self.find_placeholders(translated_text or "") if p in replacements)
+        return {
+            "missing": [p for p in replacements if not counts[p]],
+            "duplicated": [p for p, count in counts.items() if count > 1]
+        }
+    
     def restore_math(self, translated_text: str, replacements: Dict[str, str]) -> str:
         """
         Restore mathematical expressions in translated text by replacing placeholders.
+        All placeholders are replaced in one substitution pass; placeholders that are
+        missing from the translation or appear more than once are logged and counted.
         
         Args:
             translated_text: Translated text with placeholders
@@ -114,22 +359,131 @@ class SimpleMathPreserver:
         """
         if not translated_text or not replacements:
             return translated_text
-            
-        result = translated_text
         
         try:
-            # Sort replacements by placeholder length (longest first)
-            # This helps avoid partial replacement issues
-            sorted_placeholders = sorted(replacements.keys(), key=len, reverse=True)
+            counts = Counter()
+            
+            def replace(match: re.Match) -> str:
+                placeholder = self.placeholder(int(match.group(1)))
+                if placeholder not in replacements:
+                    # Not one of ours (e.g. a placeholder-like token of the source text)
+                    return match.group(0)
+                counts[placeholder] += 1
+                return replacements[placeholder]
+            
+            result = self.RESTORE_PATTERN.sub(replace, translated_text)
             
-            for placeholder in sorted_placeholders:
-                result = result.replace(placeholder, replacements[placeholder])
-                
-            logger.info(f"Restored {len(replacements)} math expressions in translated text")
+            missing = [p for p in replacements if not counts[p]]
+            duplicated = [p for p, count in counts.items() if count > 1]
+            with self._stats_lock:
+                self.stats["restored"] += len(counts)
+                self.stats["missing"] += len(missing)
+                self.stats["duplicated"] += len(duplicated)
+            if missing or duplicated:
+                logger.warning(
+                    f"Math placeholders missing from the translation: {missing or 'none'}; "
+                    f"duplicated: {duplicated or 'none'}"
+                )
+            
+            logger.info(f"Restored {len(counts)} of {len(replacements)} math expressions in translated text")
             
             return result
             
         except Exception as e:
             logger.error(f"Error restoring math expressions: {e}")
             # Return translated text if restoration fails
-            return translated_text
\ No newline at end of file
+            return translated_text
+    
+    def restore_batch(self, translated_texts: List[str], replacements: List[Dict[str, str]]) -> List[str]:
+        """
+        Restore mathematical expressions in many translated texts at once.
+        The texts with placeholders are joined into one buffer and restored in a single
+        substitution pass; texts whose mapping is empty are returned unchanged.
+        
+        Args:
+            translated_texts: Translated texts with placeholders
+            replacements: Placeholder mapping of each text, as returned by extract_batch()
+            
+        Returns:
+            List[str]: Texts with mathematical expressions restored
+        """
+        results = list(translated_texts)
+        indices = [k for k, table in enumerate(replacements) if table and translated_texts[k]]
+        if not indices:
+            return results
+        
+        parts = [translated_texts[k] for k in indices]
+        if any(self.BATCH_SEPARATOR in part for part in parts):
+            # The separator would be ambiguous; restore these texts one by one
+            for k in indices:
+                results[k] = self.restore_math(translated_texts[k], replacements[k])
+            return results
+        
+        try:
+            buffer, starts = self._join(parts)
+            ends = [start + len(part) for start, part in zip(starts, parts)]
+            counts = [Counter() for _ in parts]
+            j = 0
+            
+            def replace(match: re.Match) -> str:
+                # Matches come in buffer order, so the text index only moves forward
+                nonlocal j
+                while match.start() > ends[j]:
+                    j += 1
+                table = replacements[indices[j]]
+                placeholder = match.group(0)
+                if placeholder not in table:
+                    placeholder = self.placeholder(int(match.group(1)))
+                    if placeholder not in table:
+                        # Not one of ours (e.g. a placeholder-like token of the source text)
+                        return match.group(0)
+                counts[j][placeholder] += 1
+                return table[placeholder]
+            
+            restored = self.RESTORE_PATTERN.sub(replace, buffer).split(self.BATCH_SEPARATOR)
+            if len(restored) != len(parts):
+                # A restored expression contained the separator
+                return [
+                    self.restore_math(text, table) if table else text
+                    for text, table in zip(translated_texts, replacements)
+                ]
+            
+            missing = 0
+            duplicated = 0
+            damaged = 0
+            for j, k in enumerate(indices):
+                results[k] = restored[j]
+                text_missing = sum(1 for p in replacements[k] if not counts[j][p])
+                text_duplicated = sum(1 for count in counts[j].values() if count > 1)
+                missing += text_missing
+                duplicated += text_duplicated
+                damaged += bool(text_missing or text_duplicated)
+            
+            with self._stats_lock:
+                self.stats["restored"] += sum(len(c) for c in counts)
+                self.stats["missing"] += missing
+                self.stats["duplicated"] += duplicated
+            if damaged:
+                logger.warning(
+                    f"{damaged} of {len(parts)} translations have missing ({missing}) "
+                    f"or duplicated ({duplicated}) math placeholders"
+                )
+            logger.info(f"Restored math expressions in {len(parts)} of {len(results)} translated texts")
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"Error restoring math expressions in a batch: {e}")
+            # Return the translated texts if restoration fails
+            return list(translated_texts)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get placeholder statistics.
+        
+        Returns:
+            Dict[str, Any]: Expressions extracted and restored, and placeholders missing
+                from or duplicated in translations
+        """
+        with self._stats_lock:
+            return dict(self.stats)
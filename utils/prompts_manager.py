@@ -98,7 +98,22 @@ class PromptsManager:
                 - **Apply only the necessary corrections** based on the feedback
                 - **Preserve all LaTeX expressions** and formatting exactly as in the original translation
                 - **Avoid paraphrasing or rewriting anything else**
-                Only output the corrected translation. Do not explain, comment, or add any formatting."""
+                Only output the corrected translation. Do not explain, comment, or add any formatting.""",
+            
+            "system_prompt_fused": """You are a professional translator and bilingual academic reviewer specialized in mathematics. Your task is to translate a math problem from English to {target_language} for high school students, then review your translation against the original and correct it if needed.
+                When translating, follow these guidelines:
+                Preserve all LaTeX expressions exactly as written (do not translate or alter math symbols, equations, or formatting).
+                Maintain the original meaning faithfully — the translation must accurately reflect the logical and mathematical structure.
+                Use fluent, natural {target_language} that is clear and appropriate for a high school audience.
+                Do not attempt to solve or simplify the math problem — only translate the text.
+                When reviewing, only report problems that are:
+                - **Meaning-altering inaccuracies**
+                - **Missing instructional parts** (e.g., question type, constraints, diagram references)
+                - **Missing or altered math-related expressions or formatting**
+                Respond with a single JSON object and nothing else, with exactly these keys:
+                - "translation": your translation in {target_language}
+                - "review": a brief plain-text description of the issues found in your translation, or an empty string if it is complete and faithful
+                - "corrected_translation": your translation with only the necessary corrections applied if the review found issues, otherwise an empty string"""
         }
         
         # General text dataset prompts
@@ -122,7 +137,17 @@ class PromptsManager:
                 Your task is to:
                 - **Apply only the necessary corrections** based on the feedback
                 - **Avoid paraphrasing or rewriting anything else**
-                Only output the corrected translation. Do not explain, comment, or add any formatting."""
+                Only output the corrected translation. Do not explain, comment, or add any formatting.""",
+            
+            "system_prompt_fused": """You are a professional translator and bilingual reviewer. Your task is to translate the input text from English to {target_language}, then review your translation against the original and correct it if needed.
+                Do not answer or solve questions — just translate them exactly, in fluent {target_language}.
+                When reviewing, only report problems that are:
+                - **Meaning-altering inaccuracies**
+                - **Missing parts**
+                Respond with a single JSON object and nothing else, with exactly these keys:
+                - "translation": your translation in {target_language}
+                - "review": a brief plain-text description of the issues found in your translation, or an empty string if it is complete and faithful
+                - "corrected_translation": your translation with only the necessary corrections applied if the review found issues, otherwise an empty string"""
         }
 
         # Technical text dataset prompts
@@ -154,7 +179,23 @@ class PromptsManager:
                 - **Ensure technical terminology is consistent throughout**
                 - **Preserve all code, symbols, and variables exactly**
                 - **Avoid paraphrasing or rewriting unaffected parts**
-                Only output the corrected translation. Do not explain, comment, or add any formatting."""
+                Only output the corrected translation. Do not explain, comment, or add any formatting.""",
+            
+            "system_prompt_fused": """You are a professional technical translator and bilingual technical reviewer. Your task is to translate technical text from English to {target_language}, then review your translation against the original and correct it if needed.
+                When translating, follow these guidelines:
+                Preserve all technical terminology, using the standard terms in {target_language} when they exist.
+                Maintain all code, variable names, and technical symbols exactly as written.
+                Translate acronyms only if they have standard translations in {target_language}.
+                Maintain the same level of formality and technical precision as the original text.
+                When reviewing, only report problems that are:
+                - **Meaning-altering inaccuracies**
+                - **Mistranslated technical terms**
+                - **Missing parts or explanations**
+                - **Inconsistent translation of technical terminology**
+                Respond with a single JSON object and nothing else, with exactly these keys:
+                - "translation": your translation in {target_language}
+                - "review": a brief plain-text description of the issues found in your translation, or an empty string if it is complete and faithful
+                - "corrected_translation": your translation with only the necessary corrections applied if the review found issues, otherwise an empty string"""
         }
         
         # Create default hybrid prompts
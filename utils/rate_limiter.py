@@ -0,0 +1,301 @@
+"""
+Token-bucket rate limiter shared by all translators in a process and across processes on one host.
+"""
+
+import os
+import time
+import sqlite3
+import asyncio
+import threading
+from typing import Optional, Dict
+
+from utils.logger import logger
+
+# Default location of the bucket database shared by worker processes
+DEFAULT_RATE_LIMIT_PATH = os.path.join(".cache", "rate_limits.sqlite")
+
+try:
+    # Use the OpenAI tokenizer for token estimates when it is installed
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _ENCODING = None
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of tokens in a text before sending it.
+    
+    Args:
+        text: Text to estimate
+    
+    Returns:
+        int: Estimated token count
+    """
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    # Roughly four characters per token for English text
+    return len(text) // 4 + 1
+
+class RateLimiter:
+    """
+    Per-minute token buckets stored in SQLite.
+    Each bucket refills continuously at capacity/60 units per second up to its capacity.
+    Bucket state lives in a database file, so every process that opens the same
+    file draws from the same budget; within a process one instance is shared
+    through get_rate_limiter().
+    """
+    
+    # Upper bound on a single sleep while waiting for a bucket to refill
+    MAX_WAIT_INTERVAL = 1.0
+    
+    def __init__(self, path: str = DEFAULT_RATE_LIMIT_PATH):
+        """
+        Initialize the rate limiter.
+        
+        Args:
+            path: Path to the SQLite file holding the bucket state (":memory:" for a process-local limiter)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        
+        # Statistics
+        self.stats = {
+            "acquired": 0,
+            "throttled": 0,
+            "wait_seconds": 0.0
+        }
+        
+        directory = os.path.dirname(path)
+        if directory and path != ":memory:":
+            os.makedirs(directory, exist_ok=True)
+        
+        # Transactions are managed explicitly so BEGIN IMMEDIATE can lock the file across processes
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        with self._lock:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "name TEXT PRIMARY KEY, "
+                "capacity REAL NOT NULL, "
+                "tokens REAL NOT NULL, "
+                "updated REAL NOT NULL)"
+            )
+    
+    def configure(self, name: str, per_minute: float) -> None:
+        """
+        Create a bucket or update its capacity.
+        
+        Args:
+            name: Bucket name (e.g. 'llm:azure/gpt-4o:requests')
+            per_minute: Number of units the bucket grants per minute
+        """
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT capacity FROM buckets WHERE name = ?", (name,)).fetchone()
+                if row is None:
+                    self._conn.execute(
+                        "INSERT INTO buckets (name, capacity, tokens, updated) VALUES (?, ?, ?, ?)",
+                        (name, per_minute, per_minute, time.time())
+                    )
+                elif row[0] != per_minute:
+                    self._conn.execute("UPDATE buckets SET capacity = ? WHERE name = ?", (per_minute, name))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        logger.info(f"Rate limit bucket '{name}' configured at {per_minute:g}/min")
+    
+    def _try_acquire(self, amounts: Dict[str, float]) -> float:
+        """
+        Atomically take the requested amounts from their buckets if all of them can cover it.
+        
+        Args:
+            amounts: Mapping of bucket name to the amount to take
+        
+        Returns:
+            float: 0 if the amounts were taken, otherwise the seconds to wait before retrying
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                wait = 0.0
+                levels = {}
+                for name, amount in amounts.items():
+                    row = self._conn.execute(
+                        "SELECT capacity, tokens, updated FROM buckets WHERE name = ?", (name,)
+                    ).fetchone()
+                    if row is None:
+                        # Unconfigured buckets do not limit anything
+                        continue
+                    
+                    capacity, tokens, updated = row
+                    rate = capacity / 60.0
+                    tokens = min(capacity, tokens + (now - updated) * rate)
+                    levels[name] = tokens
+                    
+                    # Requests larger than the bucket only need a full bucket
+                    needed = min(amount, capacity)
+                    if tokens < needed:
+                        wait = max(wait, (needed - tokens) / rate)
+                
+                for name, tokens in levels.items():
+                    if not wait:
+                        tokens -= amounts[name]
+                    self._conn.execute(
+                        "UPDATE buckets SET tokens = ?, updated = ? WHERE name = ?", (tokens, now, name)
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return wait
+    
+    def acquire(self, amounts: Dict[str, float]) -> float:
+        """
+        Block until all buckets can cover the requested amounts, then take them.
+        
+        Args:
+            amounts: Mapping of bucket name to the amount to take
+        
+        Returns:
+            float: Total seconds spent waiting
+        """
+        waited = 0.0
+        while True:
+            wait = self._try_acquire(amounts)
+            if not wait:
+                break
+            wait = min(wait, self.MAX_WAIT_INTERVAL)
+            time.sleep(wait)
+            waited += wait
+        self._record(waited)
+        return waited
+    
+    async def aacquire(self, amounts: Dict[str, float]) -> float:
+        """
+        Async version of acquire() that waits without blocking the event loop.
+        The SQLite transaction (which may wait on the file lock of another process)
+        runs in the loop's default executor.
+        
+        Args:
+            amounts: Mapping of bucket name to the amount to take
+        
+        Returns:
+            float: Total seconds spent waiting
+        """
+        loop = asyncio.get_running_loop()
+        waited = 0.0
+        while True:
+            wait = await loop.run_in_executor(None, self._try_acquire, amounts)
+            if not wait:
+                break
+            wait = min(wait, self.MAX_WAIT_INTERVAL)
+            await asyncio.sleep(wait)
+            waited += wait
+        self._record(waited)
+        return waited
+    
+    def _record(self, waited: float) -> None:
+        """Update statistics after a successful acquire."""
+        with self._lock:
+            self.stats["acquired"] += 1
+            if waited:
+                self.stats["throttled"] += 1
+                self.stats["wait_seconds"] += waited
+    
+    def reconcile(self, name: str, estimated: float, actual: float) -> None:
+        """
+        Correct a bucket after the real usage of a request is known.
+        Over-estimates are given back; under-estimates are charged, possibly leaving the bucket in debt.
+        
+        Args:
+            name: Bucket name
+            estimated: Amount taken when the request was sent
+            actual: Amount actually used
+        """
+        delta = estimated - actual
+        if not delta:
+            return
+        
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "UPDATE buckets SET tokens = MIN(capacity, tokens + ?) WHERE name = ?", (delta, name)
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+    
+    def remaining_fraction(self, name: str) -> Optional[float]:
+        """
+        Get the share of a bucket's capacity that is currently available.
+        
+        Args:
+            name: Bucket name
+            
+        Returns:
+            Optional[float]: Available fraction of the capacity (negative when in debt), or None if unconfigured
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT capacity, tokens, updated FROM buckets WHERE name = ?", (name,)
+            ).fetchone()
+        if row is None:
+            return None
+        
+        capacity, tokens, updated = row
+        tokens = min(capacity, tokens + (time.time() - updated) * capacity / 60.0)
+        return tokens / capacity
+    
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Get throttling statistics of this limiter instance.
+        
+        Returns:
+            Dict[str, float]: Number of acquires, how many had to wait and the total wait time
+        """
+        return dict(self.stats)
+
+# Limiters shared by every translator in the process, keyed by database path
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(path: Optional[str] = None) -> RateLimiter:
+    """
+    Get the process-wide rate limiter for a bucket database.
+    
+    Args:
+        path: Path to the bucket database (defaults to RATE_LIMIT_PATH or DEFAULT_RATE_LIMIT_PATH)
+    
+    Returns:
+        RateLimiter: Shared limiter instance
+    """
+    path = path or os.environ.get("RATE_LIMIT_PATH", DEFAULT_RATE_LIMIT_PATH)
+    with _limiters_lock:
+        if path not in _limiters:
+            _limiters[path] = RateLimiter(path)
+        return _limiters[path]
+
+def env_limit(name: str) -> Optional[float]:
+    """
+    Read a per-minute limit from the environment.
+    
+    Args:
+        name: Environment variable name
+    
+    Returns:
+        Optional[float]: The configured limit, or None if unset or invalid
+    """
+    value = os.environ.get(name)
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning(f"Ignoring invalid rate limit {name}={value}")
+        return None
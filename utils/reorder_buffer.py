@@ -0,0 +1,53 @@
+"""
+Reordering of results that finish out of order.
+"""
+
+from typing import Any, Dict, List
+
+class ReorderBuffer:
+    """
+    Puts results that finish out of order back into input order.
+    Each result is held until all results with a lower index have arrived; then
+    the complete prefix is released at once. Callers bound its size by not starting
+    work more than a fixed window ahead of next_index.
+    """
+    
+    def __init__(self, start: int = 0):
+        """
+        Initialize the buffer.
+        
+        Args:
+            start: Index of the first result
+        """
+        self.next_index = start
+        self.peak = 0
+        self._held: Dict[int, Any] = {}
+    
+    def put(self, index: int, result: Any) -> List[Any]:
+        """
+        Add a result and release every result that is now in order.
+        
+        Args:
+            index: Input index of the result
+            result: The result
+        
+        Returns:
+            List[Any]: Results ready to be emitted, in input order (possibly empty)
+        
+        Raises:
+            ValueError: If a result with this index was already added
+        """
+        if index < self.next_index or index in self._held:
+            raise ValueError(f"Result {index} was already added")
+        
+        self._held[index] = result
+        self.peak = max(self.peak, len(self._held))
+        
+        released = []
+        while self.next_index in self._held:
+            released.append(self._held.pop(self.next_index))
+            self.next_index += 1
+        return released
+    
+    def __len__(self) -> int:
+        return len(self._held)
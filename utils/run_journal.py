@@ -0,0 +1,213 @@
+"""
+Durable journal of finished items for resuming long batch runs.
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from typing import Optional, Dict, Any, List
+
+from utils.logger import logger
+from utils.fallback_text import FallbackText
+
+class RunJournal:
+    """
+    Append-only JSON Lines record of the items a batch run has finished.
+    Each line holds an item's index, a hash of its content, its status and its output.
+    On resume, 'done' items are reused, 'fallback' items (the translation of some strings
+    failed and they kept their source text) are reused unless retry_fallbacks is set, and
+    'failed' or missing items are translated again. Later lines override earlier ones,
+    so a resumed run keeps appending to the same file.
+    """
+    
+    STATUSES = ("done", "fallback", "failed")
+    
+    def __init__(
+        self,
+        path: str,
+        resume: bool = False,
+        retry_fallbacks: bool = False,
+        flush_interval: int = 50,
+        flush_seconds: float = 10.0
+    ):
+        """
+        Open the journal.
+        
+        Args:
+            path: Path to the journal file
+            resume: Whether to load the entries of an existing journal and append to it
+                (otherwise the file is started afresh)
+            retry_fallbacks: Whether items that fell back to their source text are translated again on resume
+            flush_interval: Number of records buffered before they are written to disk
+            flush_seconds: Maximum time a record stays buffered
+        """
+        self.path = path
+        self.retry_fallbacks = retry_fallbacks
+        self.flush_interval = flush_interval
+        self.flush_seconds = flush_seconds
+        
+        self._lock = threading.Lock()
+        self._buffer: List[str] = []
+        self._last_flush = time.time()
+        
+        # Latest entry of each item index
+        self.entries: Dict[int, Dict[str, Any]] = {}
+        
+        # Statistics
+        self.stats = {
+            "loaded": 0,
+            "resumed": 0,
+            "recorded": 0,
+            "corrupt_lines": 0
+        }
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        if resume and os.path.exists(path):
+            self._load()
+        self._file = open(path, 'a' if resume else 'w', encoding='utf-8')
+    
+    def _load(self) -> None:
+        """Read the entries of an existing journal, skipping a line torn by a crash."""
+        start = time.time()
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                    self.entries[entry["index"]] = entry
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    self.stats["corrupt_lines"] += 1
+        self.stats["loaded"] = len(self.entries)
+        logger.info(f"Loaded {len(self.entries)} journal entries from {self.path} in {time.time() - start:.2f} seconds")
+    
+    @staticmethod
+    def content_hash(item: Any, *context: Any) -> str:
+        """
+        Hash an item together with the settings its output depends on (e.g. target languages).
+        
+        Args:
+            item: JSON item
+            *context: Further JSON values included in the hash
+        
+        Returns:
+            str: Hex digest identifying the item
+        """
+        payload = json.dumps([item, *context], ensure_ascii=False, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def item_status(output: Any) -> str:
+        """
+        Get the status of a translated item: 'fallback' if a translator returned the source text
+        of any string because translating it failed (see FallbackText), else 'done'.
+        Strings that legitimately stay the same (proper nouns, IDs, URLs, code, ...) are not fallbacks.
+        
+        Args:
+            output: Translated item
+        
+        Returns:
+            str: 'done' or 'fallback'
+        """
+        return "fallback" if FallbackText.contains(output) else "done"
+    
+    def completed(self, index: int, content_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the journal entry of an item that does not need to be translated again.
+        
+        Args:
+            index: Index of the item in the input
+            content_hash: Hash of the item (see content_hash())
+        
+        Returns:
+            Optional[Dict[str, Any]]: The entry, with the output under 'output', or None
+        """
+        entry = self.entries.get(index)
+        if entry is None or entry.get("hash") != content_hash:
+            return None
+        if entry["status"] == "done" or (entry["status"] == "fallback" and not self.retry_fallbacks):
+            with self._lock:
+                self.stats["resumed"] += 1
+            return entry
+        return None
+    
+    def record(self, index: int, content_hash: str, status: str, output: Any, error: Optional[str] = None) -> None:
+        """
+        Record the outcome of an item.
+        
+        Args:
+            index: Index of the item in the input
+            content_hash: Hash of the item (see content_hash())
+            status: 'done', 'fallback' or 'failed'
+            output: Output written for the item
+            error: Error message of a failed item
+        """
+        if status not in self.STATUSES:
+            raise ValueError(f"Unknown journal status: {status}")
+        
+        entry = {"index": index, "hash": content_hash, "status": status, "output": output}
+        if error:
+            entry["error"] = error
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        
+        with self._lock:
+            self.entries[index] = entry
+            self._buffer.append(line)
+            self.stats["recorded"] += 1
+            if len(self._buffer) >= self.flush_interval or time.time() - self._last_flush >= self.flush_seconds:
+                self._flush_locked()
+    
+    def _flush_locked(self) -> None:
+        """Write the buffered records to disk. Must be called with the lock held."""
+        if self._buffer:
+            self._file.write("".join(self._buffer))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._buffer = []
+        self._last_flush = time.time()
+    
+    def flush(self) -> None:
+        """Write the buffered records to disk."""
+        with self._lock:
+            self._flush_locked()
+    
+    def close(self) -> None:
+        """Flush and close the journal."""
+        with self._lock:
+            if not self._file.closed:
+                self._flush_locked()
+                self._file.close()
+    
+    def indices(self, status: str) -> List[int]:
+        """
+        Get the indices of the items whose latest entry has a status (e.g. 'fallback' to re-run them).
+        
+        Args:
+            status: 'done', 'fallback' or 'failed'
+        
+        Returns:
+            List[int]: Sorted item indices
+        """
+        return sorted(index for index, entry in self.entries.items() if entry["status"] == status)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get journal statistics.
+        
+        Returns:
+            Dict[str, Any]: Entries loaded and reused, records written and item counts by status
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            for status in self.STATUSES:
+                stats[status] = sum(1 for entry in self.entries.values() if entry["status"] == status)
+        return stats
+    
+    def __enter__(self) -> "RunJournal":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
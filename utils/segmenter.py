@@ -0,0 +1,161 @@
+"""
+Splitting of long documents into independently translatable chunks.
+"""
+
+import re
+from typing import List, Tuple
+
+from utils.logger import logger
+
+class DocumentSegmenter:
+    """
+    Splits a document into paragraphs, and long paragraphs into groups of sentences.
+    Code fences, display math and LaTeX environments are never split; code and
+    display-math blocks that form a paragraph of their own are not translated at all.
+    Concatenating the pieces returned by segment() gives back the original text,
+    including its whitespace and line breaks.
+    """
+    
+    # LaTeX environments whose content is pure math
+    MATH_ENVIRONMENTS = {
+        "equation", "equation*", "align", "align*", "gather", "gather*", "multline", "multline*",
+        "eqnarray", "eqnarray*", "math", "displaymath", "array", "matrix", "pmatrix", "bmatrix", "cases"
+    }
+    
+    # Blocks that must stay in one piece
+    BLOCK_PATTERN = re.compile(
+        r'```.*?```|~~~.*?~~~|\$\$.*?\$\$|\\\[.*?\\\]|\\begin\{([^}]+)\}.*?\\end\{\1\}',
+        re.DOTALL
+    )
+    
+    # Inline math, inside which sentences are never split
+    INLINE_PATTERN = re.compile(r'\$[^$]+\$|\\\(.*?\\\)', re.DOTALL)
+    
+    # Blank lines separating paragraphs
+    PARAGRAPH_BREAK = re.compile(r'\n[ \t]*\n\s*')
+    
+    # Whitespace after sentence-ending punctuation (Latin and CJK)
+    SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+|(?<=[。！？])\s*')
+    
+    def __init__(self, max_chunk_chars: int = 1500):
+        """
+        Initialize the segmenter.
+        
+        Args:
+            max_chunk_chars: Paragraphs longer than this are split into sentence groups of at most
+                this size (a single longer sentence or block stays whole)
+        """
+        self.max_chunk_chars = max_chunk_chars
+    
+    @staticmethod
+    def _inside(position: int, spans: List[Tuple[int, int]]) -> bool:
+        """Whether a position falls strictly inside one of the spans."""
+        return any(start < position < end for start, end in spans)
+    
+    def _is_passthrough(self, paragraph: str) -> bool:
+        """
+        Whether a paragraph is a single code or display-math block with nothing to translate.
+        
+        Args:
+            paragraph: Paragraph without surrounding whitespace
+        
+        Returns:
+            bool: True if the paragraph should be kept as is
+        """
+        match = self.BLOCK_PATTERN.fullmatch(paragraph)
+        if match is None:
+            return False
+        environment = match.group(1)
+        return environment is None or environment in self.MATH_ENVIRONMENTS
+    
+    def _split_sentences(self, paragraph: str) -> List[Tuple[str, bool]]:
+        """
+        Split a long paragraph into sentence groups of at most max_chunk_chars.
+        
+        Args:
+            paragraph: Paragraph without surrounding whitespace
+        
+        Returns:
+            List[Tuple[str, bool]]: Sentence groups (translatable) and the whitespace between them
+        """
+        protected = [m.span() for m in self.BLOCK_PATTERN.finditer(paragraph)]
+        protected += [m.span() for m in self.INLINE_PATTERN.finditer(paragraph)]
+        breaks = [
+            m for m in self.SENTENCE_BREAK.finditer(paragraph)
+            if m.end() < len(paragraph) and not self._inside(m.start(), protected)
+        ]
+        
+        # Sentences with the whitespace that follows them
+        sentences = []
+        start = 0
+        for match in breaks:
+            sentences.append((paragraph[start:match.start()], match.group(0)))
+            start = match.end()
+        sentences.append((paragraph[start:], ""))
+        
+        # Pack consecutive sentences into groups; the whitespace between groups is kept apart
+        pieces = []
+        group = ""
+        group_separator = ""
+        for sentence, separator in sentences:
+            if group and len(group) + len(group_separator) + len(sentence) > self.max_chunk_chars:
+                pieces.append((group, True))
+                if group_separator:
+                    pieces.append((group_separator, False))
+                group = sentence
+            else:
+                group += group_separator + sentence
+            group_separator = separator
+        pieces.append((group, True))
+        return pieces
+    
+    def segment(self, text: str) -> List[Tuple[str, bool]]:
+        """
+        Split a document into pieces.
+        
+        Args:
+            text: Document text
+        
+        Returns:
+            List[Tuple[str, bool]]: Pieces of the document in order, each with whether it should be
+                translated; whitespace and untranslatable blocks are returned as non-translatable pieces
+        """
+        if not text:
+            return []
+        
+        # Paragraph breaks inside code fences and math blocks do not count
+        blocks = [m.span() for m in self.BLOCK_PATTERN.finditer(text)]
+        breaks = [m for m in self.PARAGRAPH_BREAK.finditer(text) if not self._inside(m.start(), blocks)]
+        
+        paragraphs = []
+        start = 0
+        for match in breaks:
+            paragraphs.append((text[start:match.start()], match.group(0)))
+            start = match.end()
+        paragraphs.append((text[start:], ""))
+        
+        pieces = []
+        for paragraph, separator in paragraphs:
+            core = paragraph.strip()
+            if not core:
+                pieces.append((paragraph + separator, False))
+                continue
+            
+            leading = paragraph[:len(paragraph) - len(paragraph.lstrip())]
+            trailing = paragraph[len(paragraph.rstrip()):]
+            if leading:
+                pieces.append((leading, False))
+            
+            if self._is_passthrough(core):
+                pieces.append((core, False))
+            elif len(core) > self.max_chunk_chars:
+                pieces.extend(self._split_sentences(core))
+            else:
+                pieces.append((core, True))
+            
+            if trailing + separator:
+                pieces.append((trailing + separator, False))
+        
+        logger.info(f"Segmented document of {len(text)} characters into "
+                    f"{sum(1 for _, translatable in pieces if translatable)} chunks")
+        return pieces
@@ -0,0 +1,187 @@
+"""
+Classifier of segments that need no translation (numbers, identifiers, URLs, code, ...).
+"""
+
+import re
+import threading
+from typing import Optional, Dict, Any, Sequence
+
+from utils.logger import logger
+
+# Regex patterns of each category, matched against the whole stripped segment; first category wins
+SKIP_CATEGORIES = {
+    # 42, -3.5, 1,000, 50%, $50, 42 meters, = 42
+    "number": [
+        r'[-+]?\$?\d[\d,]*(?:\.\d+)?%?(?:\s*[a-zA-Z]*)',
+        r'=\s*[-+]?\d+(?:\.\d+)?'
+    ],
+    
+    # true, false, null (lowercase JSON literals; "True" or "None" may be an answer to translate)
+    "boolean": [
+        r'true|false|null'
+    ],
+    
+    # 123e4567-e89b-12d3-a456-426614174000
+    "uuid": [
+        r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}'
+    ],
+    
+    # https://example.com/a?b=c, www.example.com
+    "url": [
+        r'(?:https?|ftp)://\S+',
+        r'www\.[\w-]+(?:\.[\w-]+)+\S*'
+    ],
+    
+    # user@example.com
+    "email": [
+        r'[\w.+-]+@[\w-]+(?:\.[\w-]+)+'
+    ],
+    
+    # ~/data/, ./run.sh, ../lib, C:\Users\me, src/app/models.py, setup.py
+    # (a path without such a prefix needs a file extension, so that "input/output" is translated)
+    "path": [
+        r'(?:~|\.{1,2})/(?:[\w.-]+/)*[\w.-]*',
+        r'[A-Za-z]:\\(?:[\w .-]+\\)*[\w .-]*',
+        r'/?(?:[\w.-]+/)*[\w-]+(?:\.[\w-]+)*\.(?:py|pyi|ipynb|js|ts|jsx|tsx|json|jsonl|yaml|yml|toml|cfg|ini|txt|md|'
+        r'rst|csv|tsv|xml|html|css|c|h|cc|cpp|hpp|java|go|rs|rb|php|sh|sql|log|pdf|png|jpg|jpeg|gif|zip|gz|tar|xlsx)'
+    ],
+    
+    # $x^2$, $$\int f$$, \(x\), \[x\], \frac{1}{2}, 2 + 3 = 5, or only math placeholders
+    # (commands that wrap prose, such as \textbf{...}, \emph{...} or \section{...}, are translated)
+    "latex": [
+        r'\$\$[^$]+\$\$|\$[^$]+\$',
+        r'\\\([\s\S]+\\\)|\\\[[\s\S]+\\\]',
+        r'(?:\\(?!(?:text[a-z]*|emph|[mfh]box|intertext|part|chapter|(?:sub)*section|(?:sub)?paragraph|title|'
+        r'caption|footnote|item)\b)[a-zA-Z]+(?:\{[^{}]*\})*\s*)+',
+        # The leading class has no digit, so the first digit splits the match in one way only
+        r'[\s+\-*/^=().,<>]*\d[\d\s+\-*/^=().,<>]*',
+        r'(?:\[\[M\d+\]\][\s.,;:]*)+'
+    ],
+    
+    # IN_PROGRESS, snake_case, getUserName (names with an underscore, or camelCase with two humps)
+    "enum": [
+        r'[A-Z][A-Z0-9]*(?:_[A-Z0-9]+)+',
+        r'[a-z][a-z0-9]*(?:_[a-z0-9]+)+',
+        r'[a-z][a-z0-9]*(?:[A-Z][a-z0-9]+){2,}'
+    ],
+    
+    # ```...```, `code`, np.array, __init__, parse_args(), obj.method(x)
+    "code": [
+        r'(?P<fence>`{3,}|~{3,})[\s\S]*(?P=fence)',
+        r'`[^`]+`',
+        r'[A-Za-z_]\w+(?:\.[A-Za-z_]\w+)+',
+        r'(?=\w*_)(?=\w*[A-Za-z])\w+',
+        r'[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*\([^()]*\)'
+    ],
+    
+    # django__django-11099, ABC-1234, v1.2.3, a3f9c2e (a digit and a separator, or a hex hash)
+    "id": [
+        r'(?=[\w\-.:#]*\d)[A-Za-z0-9]\w*(?:[\-.:#]+\w+)+',
+        r'(?=[0-9a-f]*[a-f])(?=[0-9a-f]*\d)[0-9a-f]{7,40}'
+    ]
+}
+
+class SkipClassifier:
+    """
+    Recognizes segments that translation would leave unchanged: numbers, booleans,
+    UUIDs, URLs, emails, file paths, pure LaTeX, code-only strings, enum-like tokens
+    and IDs. All categories are compiled into one pattern that must match the whole
+    stripped segment, so a check is a single regex call. Skips are counted per category.
+    """
+    
+    def __init__(self, categories: Optional[Sequence[str]] = None):
+        """
+        Initialize the classifier.
+        
+        Args:
+            categories: Categories to recognize (keys of SKIP_CATEGORIES, all of them if None)
+        
+        Raises:
+            ValueError: If a category is unknown
+        """
+        self.categories = list(categories) if categories is not None else list(SKIP_CATEGORIES)
+        unknown = [category for category in self.categories if category not in SKIP_CATEGORIES]
+        if unknown:
+            raise ValueError(f"Unknown skip categories: {unknown}")
+        
+        # One named group per category; the group of a match names its category
+        self.pattern = re.compile("|".join(
+            f"(?P<{category}>{'|'.join(f'(?:{pattern})' for pattern in SKIP_CATEGORIES[category])})"
+            for category in self.categories
+        ))
+        
+        # Statistics
+        self._lock = threading.Lock()
+        self.stats = {category: 0 for category in self.categories}
+    
+    def classify(self, text: str) -> Optional[str]:
+        """
+        Get the category of a segment that needs no translation.
+        
+        Args:
+            text: Segment to check
+        
+        Returns:
+            Optional[str]: The category, or None if the segment should be translated
+        """
+        if not isinstance(text, str):
+            return None
+        stripped = text.strip()
+        if not stripped:
+            return None
+        
+        match = self.pattern.fullmatch(stripped)
+        if match:
+            return match.lastgroup
+        
+        # Very short strings made up mostly of digits (e.g. "#12", "~40")
+        if "number" in self.stats and len(stripped) < 5 and sum(c.isdigit() for c in stripped) / len(stripped) > 0.5:
+            return "number"
+        return None
+    
+    def should_skip(self, text: str) -> bool:
+        """
+        Check whether a segment can be returned unchanged, counting the skip.
+        
+        Args:
+            text: Segment to check
+        
+        Returns:
+            bool: True if the segment needs no translation
+        """
+        category = self.classify(text)
+        if category is None:
+            return False
+        with self._lock:
+            self.stats[category] += 1
+        logger.debug(f"Skipping {category} segment: {text[:80]}")
+        return True
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get skip statistics.
+        
+        Returns:
+            Dict[str, Any]: Segments skipped per category and in total
+        """
+        with self._lock:
+            stats = dict(self.stats)
+        stats["total"] = sum(stats.values())
+        return stats
+
+# Classifier shared by every translator and batch processor in the process
+_classifier: Optional[SkipClassifier] = None
+_classifier_lock = threading.Lock()
+
+def get_skip_classifier() -> SkipClassifier:
+    """
+    Get the process-wide skip classifier.
+    
+    Returns:
+        SkipClassifier: Shared classifier instance
+    """
+    global _classifier
+    with _classifier_lock:
+        if _classifier is None:
+            _classifier = SkipClassifier()
+        return _classifier
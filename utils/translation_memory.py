@@ -0,0 +1,338 @@
+"""
+Segment-level translation memory with exact and fuzzy (MinHash) lookups.
+"""
+
+import os
+import json
+import time
+import zlib
+import random
+import sqlite3
+import hashlib
+import threading
+from collections import defaultdict
+from typing import Optional, Dict, Any, List, Tuple, Iterable
+
+from utils.logger import logger
+
+# Default location of the translation memory database
+DEFAULT_MEMORY_PATH = os.path.join(".cache", "translation_memory.sqlite")
+
+# Modulus of the MinHash permutations (a Mersenne prime above 32-bit hashes)
+_MINHASH_PRIME = (1 << 61) - 1
+
+class TranslationMemory:
+    """
+    Per-language store of source segments and their final translations.
+    Exact lookups match on a hash of the whitespace-normalized source. Fuzzy
+    lookups find earlier sources whose character n-gram sets are similar, using
+    MinHash signatures in a banded locality-sensitive index; candidates are
+    confirmed with their exact Jaccard similarity before being returned.
+    """
+    
+    def __init__(
+        self,
+        path: str = DEFAULT_MEMORY_PATH,
+        fuzzy_threshold: float = 0.8,
+        ngram_size: int = 3,
+        num_perm: int = 32,
+        bands: int = 8
+    ):
+        """
+        Initialize the translation memory.
+        
+        Args:
+            path: Path to the SQLite database file (":memory:" for a memory that is not kept)
+            fuzzy_threshold: Minimum n-gram Jaccard similarity of a fuzzy match (above 1 disables fuzzy lookups)
+            ngram_size: Length of the character n-grams compared by fuzzy lookups
+            num_perm: Number of MinHash permutations per signature
+            bands: Number of LSH bands the signature is split into (must divide num_perm)
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        
+        self.path = path
+        self.fuzzy_threshold = fuzzy_threshold
+        self.ngram_size = ngram_size
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        
+        rng = random.Random(1)
+        self._permutations = [
+            (rng.randrange(1, _MINHASH_PRIME), rng.randrange(0, _MINHASH_PRIME)) for _ in range(num_perm)
+        ]
+        
+        # LSH index per language, built lazily from the database: band buckets and indexed sources
+        self._indexes: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        
+        # Statistics
+        self.stats = {
+            "exact_hits": 0,
+            "fuzzy_hits": 0,
+            "misses": 0,
+            "stored": 0
+        }
+        
+        directory = os.path.dirname(path)
+        if directory and path != ":memory:":
+            os.makedirs(directory, exist_ok=True)
+        
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS segments ("
+                "language TEXT NOT NULL, "
+                "source_hash TEXT NOT NULL, "
+                "source TEXT NOT NULL, "
+                "translation TEXT NOT NULL, "
+                "updated REAL NOT NULL, "
+                "PRIMARY KEY (language, source_hash))"
+            )
+            self._conn.commit()
+        
+        logger.info(f"Translation memory initialized at {path}")
+    
+    @staticmethod
+    def normalize(text: str) -> str:
+        """
+        Normalize a source segment for exact matching (collapse whitespace).
+        
+        Args:
+            text: Source segment
+        
+        Returns:
+            str: Normalized segment
+        """
+        return " ".join(text.split())
+    
+    @classmethod
+    def _hash(cls, text: str) -> str:
+        """Get the exact-match key of a source segment."""
+        return hashlib.sha256(cls.normalize(text).encode("utf-8")).hexdigest()
+    
+    @staticmethod
+    def _language_key(language: str) -> str:
+        """Get the key a target language is stored under."""
+        return language.strip().lower()
+    
+    def _shingles(self, text: str) -> set:
+        """Get the character n-grams of a normalized, lowercased segment."""
+        text = self.normalize(text).lower()
+        if len(text) <= self.ngram_size:
+            return {text}
+        return {text[i:i + self.ngram_size] for i in range(len(text) - self.ngram_size + 1)}
+    
+    def _band_keys(self, shingles: set) -> List[Tuple[int, int]]:
+        """Compute the MinHash signature of a shingle set and return its LSH band keys."""
+        hashes = [zlib.crc32(shingle.encode("utf-8")) for shingle in shingles]
+        signature = [min((a * h + b) % _MINHASH_PRIME for h in hashes) for a, b in self._permutations]
+        return [
+            (band, hash(tuple(signature[band * self.rows_per_band:(band + 1) * self.rows_per_band])))
+            for band in range(self.bands)
+        ]
+    
+    def _index(self, language: str) -> Dict[str, Any]:
+        """
+        Get the LSH index of a language, loading it from the database on first use.
+        Must be called with the lock held.
+        """
+        index = self._indexes.get(language)
+        if index is None:
+            index = {"buckets": defaultdict(set), "sources": {}}
+            rows = self._conn.execute(
+                "SELECT source_hash, source FROM segments WHERE language = ?", (language,)
+            ).fetchall()
+            for source_hash, source in rows:
+                self._index_source(index, source_hash, source)
+            self._indexes[language] = index
+            logger.info(f"Loaded {len(rows)} translation memory segments for {language}")
+        return index
+    
+    def _index_source(self, index: Dict[str, Any], source_hash: str, source: str) -> None:
+        """Add a source segment to an LSH index."""
+        if self.fuzzy_threshold > 1 or source_hash in index["sources"]:
+            return
+        index["sources"][source_hash] = source
+        for key in self._band_keys(self._shingles(source)):
+            index["buckets"][key].add(source_hash)
+    
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+    
+    def lookup_exact(self, source: str, language: str) -> Optional[str]:
+        """
+        Look up the stored translation of a segment.
+        
+        Args:
+            source: Source segment
+            language: Target language
+        
+        Returns:
+            Optional[str]: The stored translation, or None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT translation FROM segments WHERE language = ? AND source_hash = ?",
+                (self._language_key(language), self._hash(source))
+            ).fetchone()
+        return row[0] if row else None
+    
+    def lookup_fuzzy(self, source: str, language: str) -> Optional[Tuple[str, str, float]]:
+        """
+        Find the most similar stored segment above the fuzzy threshold.
+        
+        Args:
+            source: Source segment
+            language: Target language
+        
+        Returns:
+            Optional[Tuple[str, str, float]]: Stored source, its translation and the similarity, or None
+        """
+        if self.fuzzy_threshold > 1:
+            return None
+        
+        language = self._language_key(language)
+        shingles = self._shingles(source)
+        band_keys = self._band_keys(shingles)
+        
+        with self._lock:
+            index = self._index(language)
+            candidates = set()
+            for key in band_keys:
+                candidates.update(index["buckets"].get(key, ()))
+            candidate_sources = {h: index["sources"][h] for h in candidates}
+        
+        best = None
+        for source_hash, candidate in candidate_sources.items():
+            candidate_shingles = self._shingles(candidate)
+            similarity = len(shingles & candidate_shingles) / len(shingles | candidate_shingles)
+            if similarity >= self.fuzzy_threshold and (best is None or similarity > best[2]):
+                best = (source_hash, candidate, similarity)
+        
+        if best is None:
+            return None
+        
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT translation FROM segments WHERE language = ? AND source_hash = ?", (language, best[0])
+            ).fetchone()
+        return (best[1], row[0], best[2]) if row else None
+    
+    def lookup(self, source: str, language: str) -> Optional[Tuple[str, str, float]]:
+        """
+        Look up a segment, exactly first and then fuzzily, and count the outcome.
+        
+        Args:
+            source: Source segment
+            language: Target language
+        
+        Returns:
+            Optional[Tuple[str, str, float]]: Stored source, its translation and the similarity
+                (1.0 for an exact match), or None on a miss
+        """
+        try:
+            translation = self.lookup_exact(source, language)
+            if translation is not None:
+                self._count("exact_hits")
+                return source, translation, 1.0
+            
+            match = self.lookup_fuzzy(source, language)
+            if match is not None:
+                self._count("fuzzy_hits")
+                return match
+        except sqlite3.Error as e:
+            logger.warning(f"Translation memory lookup failed: {e}")
+        
+        self._count("misses")
+        return None
+    
+    def add(self, source: str, translation: str, language: str) -> None:
+        """
+        Store the final translation of a segment (replacing an earlier one).
+        
+        Args:
+            source: Source segment
+            translation: Its translation
+            language: Target language
+        """
+        if not source or not source.strip() or not translation:
+            return
+        
+        language = self._language_key(language)
+        source_hash = self._hash(source)
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO segments (language, source_hash, source, translation, updated) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (language, source_hash, source, translation, time.time())
+                )
+                self._conn.commit()
+                self.stats["stored"] += 1
+                if language in self._indexes:
+                    self._index_source(self._indexes[language], source_hash, source)
+        except sqlite3.Error as e:
+            logger.warning(f"Translation memory write failed: {e}")
+    
+    @classmethod
+    def _paired_strings(cls, source: Any, translated: Any) -> Iterable[Tuple[str, str]]:
+        """Walk a source value and its translated copy together and yield their string pairs."""
+        if isinstance(source, str) and isinstance(translated, str):
+            yield source, translated
+        elif isinstance(source, dict) and isinstance(translated, dict):
+            for key, value in source.items():
+                if key in translated:
+                    yield from cls._paired_strings(value, translated[key])
+        elif isinstance(source, list) and isinstance(translated, list) and len(source) == len(translated):
+            for value, translated_value in zip(source, translated):
+                yield from cls._paired_strings(value, translated_value)
+    
+    @staticmethod
+    def _load_data(path: str) -> Any:
+        """Load a JSON file, or a JSON Lines file as a list of records."""
+        with open(path, 'r', encoding='utf-8') as f:
+            if path.endswith(".jsonl"):
+                return [json.loads(line) for line in f if line.strip()]
+            return json.load(f)
+    
+    def import_files(self, source_file: str, translated_file: str, language: str) -> int:
+        """
+        Fill the memory from an earlier run: a source dataset and its translated output.
+        Strings at the same position in both files are stored as segment pairs;
+        strings left unchanged by the translation are skipped.
+        
+        Args:
+            source_file: Source JSON or JSONL file
+            translated_file: Translated output of the same file
+            language: Target language of the output
+        
+        Returns:
+            int: Number of segments imported
+        """
+        pairs = [
+            (source, translation)
+            for source, translation in self._paired_strings(self._load_data(source_file), self._load_data(translated_file))
+            if source.strip() and translation != source
+        ]
+        for source, translation in pairs:
+            self.add(source, translation, language)
+        
+        logger.info(f"Imported {len(pairs)} segments for {language} from {translated_file}")
+        return len(pairs)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get lookup statistics.
+        
+        Returns:
+            Dict[str, Any]: Exact hits, fuzzy hits, misses, stored segments and hit rates
+        """
+        with self._lock:
+            stats = dict(self.stats)
+        lookups = stats["exact_hits"] + stats["fuzzy_hits"] + stats["misses"]
+        stats["exact_hit_rate"] = stats["exact_hits"] / lookups if lookups else 0.0
+        stats["fuzzy_hit_rate"] = stats["fuzzy_hits"] / lookups if lookups else 0.0
+        return stats